@@ -14,10 +14,42 @@ TODO: Provide example usage
 :copyright: (c) 2016 by Eric Appelt
 :license: None
 """
-import turtle
+import importlib
+import sys
+import types
 
-from .aioturtle import BlockingTurtle, AsyncTurtle, TurtlePrompt, demo
+# public names and the submodules defining them, imported on first
+# use so that importing the package does not import turtle and tkinter
+_LAZY_NAMES = {
+    'BlockingTurtle': 'aioturtle',
+    'AsyncTurtle': 'aioturtle',
+    'TurtleObserver': 'aioturtle',
+    'TurtlePrompt': 'aioturtle',
+    'demo': 'aioturtle',
+    'prompt': 'aioturtle',
+    'HeadlessScreen': 'headless',
+    'FrameClock': 'frameclock',
+    'RefreshBatcher': 'refresh',
+    'CanvasMarshaller': 'threads',
+    'TurtleSwarm': 'swarm',
+    'CommandPipeline': 'pipeline',
+    'runtime_stats': 'metrics',
+    'trace_log': 'tracing',
+    'Recorder': 'recording',
+    'Replay': 'recording',
+    'SVGExporter': 'export',
+    'Rasterizer': 'raster',
+    'PromptServer': 'server',
+    'Script': 'script',
+    'ScriptError': 'script',
+    'LSystem': 'paths',
+    'PathStream': 'paths',
+    'VirtualClockEventLoop': 'virtualtime',
+    'SpatialIndex': 'spatial',
+    'DetailController': 'detail',
+}
 
+__all__ = sorted(_LAZY_NAMES)
 
 __title__ = 'aioturtle'
 __version__ = '0.0.0'
@@ -25,12 +57,27 @@ __author__ = 'Eric Appelt'
 __license__ = 'None'
 __copyright__ = 'Copyright 2016 Eric Appelt'
 
-# I mean, it could change one day, right???
-_KNOWN_TURTLES = ('turtle 1.1b- - for Python 3.1   -  4. 5. 2009',)
 
-if turtle._ver not in _KNOWN_TURTLES:
-    msg = (
-        'aioturtle may not have been tested against the version of the turtle '
-        'module packaged with this python distribution.'
-    )
-    warnings.warn(msg, UserWarning)
+class _LazyModule(types.ModuleType):
+    """
+    Module type of the package, importing the submodule defining
+    a public name the first time the name is looked up.
+    """
+    def __getattr__(self, name):
+        submodule = _LAZY_NAMES.get(name)
+        if submodule is None:
+            raise AttributeError(
+                "module '{0}' has no attribute '{1}'".format(
+                    self.__name__, name
+                )
+            )
+        module = importlib.import_module('.' + submodule, self.__name__)
+        value = getattr(module, name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_LAZY_NAMES))
+
+
+sys.modules[__name__].__class__ = _LazyModule
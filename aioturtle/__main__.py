@@ -1,3 +1,27 @@
-from . import demo, __version__
+import argparse
+import sys
 
-demo(version=__version__)
+from . import __version__
+
+if sys.argv[1:2] == ['run']:
+    from .script import main
+    main(sys.argv[2:])
+elif sys.argv[1:2] == ['prompt']:
+    parser = argparse.ArgumentParser(
+        prog='python -m aioturtle prompt',
+        description='Start an empty TurtlePrompt without the demo scene'
+    )
+    parser.add_argument(
+        '--headless', action='store_true',
+        help='draw on an in-memory screen without a display'
+    )
+    args = parser.parse_args(sys.argv[2:])
+    from .aioturtle import prompt
+    screen = None
+    if args.headless:
+        from .headless import HeadlessScreen
+        screen = HeadlessScreen()
+    prompt(version=__version__, screen=screen)
+else:
+    from .aioturtle import demo
+    demo(version=__version__)
@@ -5,11 +5,29 @@ asynchronous extension of python turtle module
 """
 import sys
 import math
+import array
 import time
 import asyncio
 import turtle
 import logging
-import concurrent
+import warnings
+
+from . import geometry
+from .metrics import runtime_stats
+from .paths import VERTEX_SIZE, PathStream
+from .registry import _GLOB_CHARS, registry_for
+from .tkloop import pump_tk_events, tk_app
+from .tracing import trace_log
+
+# I mean, it could change one day, right???
+_KNOWN_TURTLES = ('turtle 1.1b- - for Python 3.1   -  4. 5. 2009',)
+
+if turtle._ver not in _KNOWN_TURTLES:
+    warnings.warn(
+        'aioturtle may not have been tested against the version of the '
+        'turtle module packaged with this python distribution.',
+        UserWarning
+    )
 
 _TURTLE_FUNCTION_ALIASES = {
     'goto': ('setpos', 'setposition'),
@@ -20,6 +38,20 @@ _TURTLE_FUNCTION_ALIASES = {
     'forward': ('fd',)
 }
 
+# motions run by run_program, by name and alias
+_PROGRAM_MOTIONS = {
+    alias: name
+    for name in (
+        'goto', 'forward', 'back', 'left', 'right', 'setheading', 'circle'
+    )
+    for alias in (name,) + _TURTLE_FUNCTION_ALIASES.get(name, ())
+}
+
+# operations of programs given as an array of opcode, argument pairs
+PROGRAM_OPCODES = (
+    'forward', 'back', 'left', 'right', 'setheading', 'penup', 'pendown'
+)
+
 _TURTLEPROMPT_HELP = (
     """
     Valid TurtlePrompt Commands:
@@ -29,9 +61,26 @@ _TURTLEPROMPT_HELP = (
         or scheduling a coroutine. Ex: "steve fd 100", "steve circle 100 180",
         "steve color red yellow".
 
+    -   > @[GROUP] [COMMAND] [ARG1] [ARG2] ...
+        Sends a command to every turtle tagged with GROUP, or to every
+        turtle whose name matches a glob pattern given in place of the
+        name. Ex: "steve tag flock", "@flock fd 10", "bot* lt 90".
+
     -   > list
         Lists all currently scheduled coroutines.
 
+    -   > stats
+        Print runtime statistics for all turtles and the event loop.
+
+    -   > trace start [CAPACITY] [profile]
+        Record a timeline of turtle commands, lock waits and canvas
+        updates, keeping the last CAPACITY events, and profile with
+        cProfile if profile is given.
+
+    -   > trace stop [FILE]
+        Stop recording and write the timeline to FILE as Chrome
+        Trace Event JSON, and any profile to FILE.prof.
+
     -   > new [TURTLENAME]
         Create a new AsyncTurtle with specified name.
 
@@ -44,6 +93,14 @@ _TURTLEPROMPT_HELP = (
 )
 
 
+def _vec2d(x, y):
+    """
+    Construct a turtle.Vec2D without going through its
+    python level __new__, for use in animation hot loops.
+    """
+    return tuple.__new__(turtle.Vec2D, (x, y))
+
+
 def add_turtle_fcn_aliases(cls):
     """
     Add turtle movement function aliases to
@@ -54,6 +111,71 @@ def add_turtle_fcn_aliases(cls):
             setattr(cls, alias, getattr(cls, fcn))
 
 
+class TurtleObserver:
+    """
+    _TurtleObserver_
+
+    Base class for objects notified of what an AioBaseTurtle
+    draws, added to a turtle with add_observer. Each method is
+    called with the turtle after its state has been updated, so
+    that the observer may read the new position, orientation or
+    pen from it. The methods do nothing by default.
+    """
+    def attach(self, turt):
+        """
+        Start observing turt. Subclasses keeping state per turtle
+        set it up here before calling this method.
+        """
+        turt.add_observer(self)
+
+    def attach_screen(self, screen):
+        """
+        Attach every turtle currently on screen that is not yet
+        observed, skipping turtles that cannot be observed.
+        """
+        for turt in screen.turtles():
+            if hasattr(turt, 'add_observer') and self not in turt.observers:
+                self.attach(turt)
+
+    def on_step(self, turt):
+        """
+        One animation step of a move was drawn, the turtle being
+        at an intermediate position.
+        """
+
+    def on_move(self, turt, points):
+        """
+        A move completed, the turtle passing through each of
+        points in turn and ending at the last.
+        """
+
+    def on_rotate(self, turt):
+        """
+        A rotation completed.
+        """
+
+    def on_pen(self, turt):
+        """
+        The pen was changed, whether up or down, size or colors.
+        """
+
+    def on_fill(self, turt, begin):
+        """
+        A fill was begun if begin is True, or ended.
+        """
+
+    def on_stamp(self, turt):
+        """
+        The turtle shape was stamped onto the canvas.
+        """
+
+    def on_write(self, turt, text, align, font):
+        """
+        The text is about to be written at the turtle position
+        with the given alignment and font.
+        """
+
+
 class AioBaseTurtle(turtle.Turtle):
     """
     _AioBaseTurtle_
@@ -72,12 +194,65 @@ class AioBaseTurtle(turtle.Turtle):
     so that a turtle will move a number of units equal to its
     speed in each step, unless speed is zero in which case the
     turtle moves instantaneously.
+
+    By default turtles are placed on the shared turtle.Screen
+    singleton. A different screen, such as a HeadlessScreen, may
+    be given with the screen argument.
+
+    Objects derived from TurtleObserver may be added with
+    add_observer to be told of every move, rotation and pen
+    change, for example to record the turtle.
+
+    Named turtles are indexed by name and by group tags in the
+    TurtleRegistry of their screen, and names must be unique
+    within a screen. If the screen has a SpatialIndex, turtles
+    are also indexed by position as they are created.
     """
 
-    def __init__(self, name=None, **kwargs):
+    def __init__(self, name=None, screen=None, **kwargs):
         self.name = name
         self.messages = []
-        super().__init__(**kwargs)
+        self.steps = 0
+        self.skipped_frames = 0
+        self.observers = []
+        known = screen if screen is not None else turtle.Turtle._screen
+        if known is not None:
+            registry_for(known).check(name)
+        if screen is None:
+            super().__init__(**kwargs)
+        else:
+            turtle.RawTurtle.__init__(self, screen, **kwargs)
+        registry_for(self.screen).add(self)
+        index = getattr(self.screen, 'spatial_index', None)
+        if index is not None:
+            index.attach(self)
+
+    def tag(self, *groups):
+        """
+        Add the turtle to each of the named groups, which may be
+        addressed as @group in the TurtlePrompt.
+        """
+        registry = registry_for(self.screen)
+        for group in groups:
+            registry.tag(self, group)
+
+    def untag(self, *groups):
+        registry = registry_for(self.screen)
+        for group in groups:
+            registry.untag(self, group)
+
+    def remove(self):
+        """
+        Take the turtle off its screen, leaving its drawings, and
+        remove it from the registry.
+        """
+        self.hideturtle()
+        if self in self.screen._turtles:
+            self.screen._turtles.remove(self)
+        registry_for(self.screen).remove(self)
+        index = getattr(self.screen, 'spatial_index', None)
+        if index is not None:
+            index.detach(self)
 
     @property
     def animated(self):
@@ -95,29 +270,83 @@ class AioBaseTurtle(turtle.Turtle):
         """
         return self.screen._delayvalue * 0.001
 
+    def add_observer(self, observer):
+        """
+        Notify observer, a TurtleObserver, of everything this
+        turtle does from now on.
+        """
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
+    def pen(self, pen=None, **pendict):
+        __doc__ = turtle.Turtle.pen.__doc__
+
+        result = super().pen(pen, **pendict)
+        if pen or pendict:
+            for observer in self.observers:
+                observer.on_pen(self)
+        return result
+
+    def begin_fill(self):
+        __doc__ = turtle.Turtle.begin_fill.__doc__
+
+        super().begin_fill()
+        for observer in self.observers:
+            observer.on_fill(self, True)
+
+    def end_fill(self):
+        __doc__ = turtle.Turtle.end_fill.__doc__
+
+        super().end_fill()
+        for observer in self.observers:
+            observer.on_fill(self, False)
+
+    def stamp(self):
+        __doc__ = turtle.Turtle.stamp.__doc__
+
+        stamp_id = super().stamp()
+        for observer in self.observers:
+            observer.on_stamp(self)
+        return stamp_id
+
+    def write(self, arg, move=False, align='left',
+              font=('Arial', 8, 'normal')):
+        __doc__ = turtle.Turtle.write.__doc__
+
+        for observer in self.observers:
+            observer.on_write(self, str(arg), align.lower(), font)
+        return super().write(arg, move, align, font)
+
     def _calc_move(self, endpoint):
         """
         Given an endpoint, calculate the number of steps and the
         vector delta to travel each step for moving an animated turtle
         to endpoint
         """
-        speed = self._speed if self._speed else 1e9
         screen = self.screen
-        diff = (endpoint-self._position)
-        diffsq = (diff[0]*screen.xscale)**2 + (diff[1]*screen.yscale)**2
-        steps = max(1, int(diffsq**0.5 / speed))
-        delta = diff * (1.0/steps)
-        return steps, delta
+        steps, delta = geometry.calc_move(
+            endpoint[0] - self._position[0], endpoint[1] - self._position[1],
+            self._speed * self._detail_scale(), screen.xscale, screen.yscale
+        )
+        return steps, _vec2d(*delta)
 
-    def _move_step(self, start, step_num, delta):
+    def _move_step(self, start, step_num, delta, top=None):
         """
         Instantaneously move the turtle one step of vector delta
         and draw line as appropriate, from a move beginning at
         position start. The step_num is the current step in the
-        animated move indexed from 1.
+        animated move indexed from 1, and the line being drawn is
+        raised to the top on the first step unless top is given.
         """
-        self._position = start + delta * step_num
-        top = True if step_num == 1 else False
+        self._position = _vec2d(
+            start[0] + delta[0] * step_num,
+            start[1] + delta[1] * step_num
+        )
+        self.steps += 1
+        if top is None:
+            top = True if step_num == 1 else False
         if self._drawing:
             self.screen._drawline(
                 self.drawingLineItem,
@@ -126,6 +355,8 @@ class AioBaseTurtle(turtle.Turtle):
                 self._pensize,
                 top
             )
+        for observer in self.observers:
+            observer.on_step(self)
         self._update_graphics()
 
     def _finalize_move(self, end):
@@ -149,25 +380,131 @@ class AioBaseTurtle(turtle.Turtle):
             self._poly.append(end)
         if len(self.currentLine) > 42:
             self._newLine()
+        for observer in self.observers:
+            observer.on_move(self, (end,))
+        self._update_graphics()
+
+    def _finalize_rotation(self, orient):
+        """
+        Complete a turtle rotation, animated or not, at the
+        final orientation orient.
+        """
+        self._orient = orient
+        for observer in self.observers:
+            observer.on_rotate(self)
         self._update_graphics()
 
+    def _skip_frames(self, count):
+        """
+        Record that count animation steps were skipped.
+        """
+        self.skipped_frames += count
+        runtime_stats.skip(count)
+
+    def _move_frames(self, end):
+        """
+        Generator performing an animated move to point end, one
+        step for each iteration after the first. The caller is
+        expected to wait for one step time at each yield, and to
+        finalize the move once the generator is exhausted.
+
+        A caller which has fallen behind may instead send the
+        number of steps due, in which case the steps in between
+        are skipped and only the last of them is drawn.
+        """
+        start = self._position
+        steps, delta = self._calc_move(end)
+        # the steps of _move_step, with the start and delta kept in
+        # plain floats and each position built without a call
+        x, y = start
+        dx, dy = delta
+        new, vec2d = tuple.__new__, turtle.Vec2D
+        screen = self.screen
+        n = 1
+        while n < steps:
+            advance = yield
+            top = n == 1
+            if advance is not None and advance > 1:
+                skip = min(advance - 1, steps - 1 - n)
+                if skip > 0:
+                    self._skip_frames(skip)
+                    n += skip
+            position = self._position = new(vec2d, (x + dx * n, y + dy * n))
+            self.steps += 1
+            if self._drawing:
+                screen._drawline(
+                    self.drawingLineItem, (start, position),
+                    self._pencolor, self._pensize, top
+                )
+            for observer in self.observers:
+                observer.on_step(self)
+            self._update_graphics()
+            n += 1
+
+    def _rotate_frames(self, steps, delta):
+        """
+        Generator performing an animated rotation of steps
+        increments of delta, waiting at each yield and skipping
+        steps sent to it as for _move_frames.
+        """
+        # precompute the rotation matrix once and keep the
+        # orientation in plain floats between steps
+        angle = delta * math.pi / 180.0
+        cos, sin = math.cos(angle), math.sin(angle)
+        x, y = self._orient
+        done = 0
+        while done < steps:
+            x, y = x * cos - y * sin, y * cos + x * sin
+            self._orient = _vec2d(x, y)
+            self.steps += 1
+            done += 1
+            advance = yield
+            if advance is not None and advance > 1:
+                skip = min(advance - 1, steps - done)
+                if skip > 0:
+                    self._skip_frames(skip)
+                    for _ in range(skip):
+                        x, y = x * cos - y * sin, y * cos + x * sin
+                    self._orient = _vec2d(x, y)
+                    done += skip
+            self._update_graphics()
+
     def _update_graphics(self):
         """
-        Update the turtle rendering in tk
+        Update the turtle rendering in tk, deferring the redraw
+        to the next flush if the screen has a RefreshBatcher
         """
         screen = self.screen
         if screen._tracing == 0:
             return
-        elif screen._tracing == 1:
+        begin = time.perf_counter()
+        batcher = getattr(screen, 'refresh_batcher', None)
+        if screen._tracing == 1:
             self._update_data()
-            self._drawturtle()
-            screen._update()
+            if batcher is not None:
+                batcher.mark(self)
+            else:
+                self._drawturtle()
+                screen._update()
         else:
             self._update_data()
             if screen._updatecounter == 0:
-                for t in screen.turtles():
-                    t._drawturtle()
-                screen._update()
+                if batcher is not None:
+                    batcher.mark_all()
+                else:
+                    for t in screen.turtles():
+                        t._drawturtle()
+                    screen._update()
+        controller = getattr(screen, 'detail_controller', None)
+        if controller is not None:
+            controller.refreshed(time.perf_counter() - begin)
+        if runtime_stats.enabled:
+            runtime_stats.update_graphics.add(time.perf_counter() - begin)
+        if trace_log.enabled:
+            trace_log.complete(
+                'update', 'canvas', begin, time.perf_counter(),
+                trace_log.track(self)
+            )
 
     def _calc_rotation(self, angle):
         """
@@ -177,9 +514,9 @@ class AioBaseTurtle(turtle.Turtle):
         """
         angle *= self._degreesPerAU
         new_orient = self._orient.rotate(angle)
-        speed = self._speed if self._speed else 1e9
-        steps = 1 + int(abs(angle) / (3.0*speed))
-        delta = 1.0 * angle / steps
+        steps, delta = geometry.calc_rotation(
+            angle, self._speed * self._detail_scale()
+        )
         return new_orient, steps, delta
 
     def _calc_circle(self, radius, extent=None, steps=None):
@@ -187,19 +524,193 @@ class AioBaseTurtle(turtle.Turtle):
         Return a tuple consisting of the number of steps (steps),
         step length (step_len), and step rotation (rot_step) given
         circle parameters radius and (optionally) extent and steps.
+        Animated circles without explicit steps have fewer steps
+        when the screen lowers its level of detail.
+        """
+        detail = 1.0
+        if steps is None and self.animated:
+            detail = self._detail_scale()
+        return geometry.calc_circle(
+            radius, extent, steps, self._fullcircle, self._degreesPerAU,
+            detail
+        )
+
+    def _detail_scale(self):
+        """
+        The level of detail scale set by the DetailController of
+        the screen, or 1 for full detail.
+        """
+        controller = getattr(self.screen, 'detail_controller', None)
+        if controller is None:
+            return 1.0
+        return controller.scale
+
+    def _heading_delta(self, to_angle):
+        """
+        Return the angle to rotate by to reach the heading
+        to_angle by the shortest way round.
+        """
+        return geometry.heading_delta(
+            self.heading(), to_angle, self._fullcircle, self._angleOrient
+        )
+
+    def _circle_path(self, steps, step_len, rot_step):
         """
-        if extent is None:
-            extent = self._fullcircle
-        if steps is None:
-            frac = abs(extent)/self._fullcircle
-            steps = 1+int(min(11+abs(radius)/6.0, 59.0)*frac)
-        rot_step = 1.0 * extent / steps
-        step_len = 2.0 * radius * math.sin(
-            rot_step*math.pi/360.0*self._degreesPerAU
+        Compute the vertices and final orientation of a circle
+        drawn with the given steps, step length and step rotation,
+        exactly as the stepwise circle methods would reach them,
+        but in a single pass over plain floats.
+        """
+        x, y = self._position
+        ox, oy = self._orient
+        points, _, orient = geometry.circle_path(
+            x, y, ox, oy, steps, step_len, rot_step, self._degreesPerAU
         )
-        if radius < 0:
-            step_len, rot_step, = -step_len, -rot_step
-        return steps, step_len, rot_step
+        return [_vec2d(x, y) for x, y in points], _vec2d(*orient)
+
+    def _polyline(self, points):
+        """
+        Instantaneously move the turtle through a sequence of
+        points, as a series of non-animated moves would, but
+        appending them to the current line all at once and
+        updating the graphics only at the end. The current line
+        is closed as one canvas item if it grew too long.
+        """
+        if not points:
+            return
+        if self._drawing:
+            self.currentLine.extend(points)
+        if isinstance(self._fillpath, list):
+            self._fillpath.extend(points)
+        self._position = points[-1]
+        if self._creatingPoly:
+            self._poly.extend(points)
+        if len(self.currentLine) > 42:
+            self._newLine()
+        for observer in self.observers:
+            observer.on_move(self, points)
+        self._update_graphics()
+
+    def _compile_program(self, ops):
+        """
+        Resolve the operations of a program to a list of tuples of
+        the motion name, or None, the turtle function to call if
+        not a motion, and the arguments. Operations are tuples of a
+        method name or alias and its arguments, such as ('fd', 10)
+        or ('color', 'red'), or ops may be an array of pairs of an
+        index into PROGRAM_OPCODES and an argument.
+        """
+        if isinstance(ops, array.array):
+            decoded = []
+            for idx in range(0, len(ops), 2):
+                verb = PROGRAM_OPCODES[int(ops[idx])]
+                if verb in ('penup', 'pendown'):
+                    decoded.append((verb,))
+                else:
+                    decoded.append((verb, ops[idx + 1]))
+            ops = decoded
+        program = []
+        cls = type(self)
+        for op in ops:
+            verb, args = op[0], tuple(op[1:])
+            motion = _PROGRAM_MOTIONS.get(verb)
+            if motion is not None:
+                if motion == 'goto' and len(args) == 1:
+                    args = tuple(args[0])
+                program.append((motion, None, args))
+                continue
+            function = getattr(cls, verb, None)
+            if (verb.startswith('_') or not callable(function) or
+                    asyncio.iscoroutinefunction(function)):
+                raise ValueError('Unknown program operation {0}'.format(verb))
+            program.append((None, function, args))
+        return program
+
+    def _program_steps(self, program, yield_every=None):
+        """
+        Generator running a compiled program. Functions are called
+        and, while the turtle is not animated, motions are run in
+        plain floats, the moves between other operations being drawn
+        as a single polyline. Animated motions are yielded as a
+        motion of 'goto' with an end point, 'rotate' with an angle
+        or 'circle' with its arguments, for the caller to animate.
+        None is yielded after every yield_every operations.
+        """
+        points = []
+        turned = False
+        x, y = self._position
+        for count, (motion, function, args) in enumerate(program, 1):
+            if motion is None or self.animated or motion == 'circle':
+                if turned:
+                    self._finalize_rotation(self._orient)
+                    turned = False
+                self._polyline(points)
+                points = []
+                if motion is None:
+                    function(self, *args)
+                elif motion == 'circle' and not self.animated:
+                    self._jump_circle(*self._calc_circle(*args))
+                else:
+                    yield self._program_motion(motion, args)
+                x, y = self._position
+            elif motion in ('forward', 'back', 'goto'):
+                ox, oy = self._orient
+                if motion == 'forward':
+                    x, y = x + ox * args[0], y + oy * args[0]
+                elif motion == 'back':
+                    x, y = x - ox * args[0], y - oy * args[0]
+                else:
+                    x, y = args
+                points.append(_vec2d(x, y))
+            else:
+                if motion == 'left':
+                    angle = args[0]
+                elif motion == 'right':
+                    angle = -args[0]
+                else:
+                    angle = self._heading_delta(args[0])
+                self._orient = self._orient.rotate(
+                    angle * self._degreesPerAU
+                )
+                turned = True
+            if yield_every and count % yield_every == 0:
+                if turned:
+                    self._finalize_rotation(self._orient)
+                    turned = False
+                self._polyline(points)
+                points = []
+                yield None
+        if turned:
+            self._finalize_rotation(self._orient)
+        self._polyline(points)
+
+    def _program_motion(self, motion, args):
+        """
+        Translate a program motion to the one to animate.
+        """
+        if motion == 'circle':
+            return 'circle', args
+        if motion == 'goto':
+            return 'goto', _vec2d(*args)
+        if motion == 'forward':
+            return 'goto', self._position + self._orient * args[0]
+        if motion == 'back':
+            return 'goto', self._position - self._orient * args[0]
+        if motion == 'left':
+            return 'rotate', args[0]
+        if motion == 'right':
+            return 'rotate', -args[0]
+        return 'rotate', self._heading_delta(args[0])
+
+    def _jump_circle(self, steps, step_len, rot_step):
+        """
+        Draw a circle instantaneously as a single polyline.
+        """
+        points, orient = self._circle_path(steps, step_len, rot_step)
+        self._orient = orient
+        for observer in self.observers:
+            observer.on_rotate(self)
+        self._polyline(points)
 
     def undo(self):
         raise NotImplementedError(
@@ -234,17 +745,27 @@ class BlockingTurtle(AioBaseTurtle):
     _BlockingTurtle_
 
     """
+    def _sleep_step(self):
+        """
+        Sleep for one step time, recording how late the
+        step wakes up.
+        """
+        step_time = self.step_time
+        begin = time.perf_counter()
+        time.sleep(step_time)
+        if runtime_stats.enabled:
+            runtime_stats.timer_lateness.add(
+                time.perf_counter() - begin - step_time
+            )
+
     def _goto(self, end):
         """
         Move the turtle to point end in small steps (if animated)
         depending on turtle speed, drawing a line if the pen is down.
         """
         if self.animated:
-            start = self._position
-            steps, delta = self._calc_move(end)
-            for n in range(1, steps):
-                time.sleep(self.step_time)
-                self._move_step(start, n, delta)
+            for _ in self._move_frames(end):
+                self._sleep_step()
 
         self._finalize_move(end)
 
@@ -255,12 +776,23 @@ class BlockingTurtle(AioBaseTurtle):
         """
         new_orient, steps, delta = self._calc_rotation(angle)
         if self.animated:
-            for _ in range(steps):
-                self._orient = self._orient.rotate(delta)
-                time.sleep(self.step_time)
-                self._update_graphics()
-        self._orient = new_orient
-        self._update_graphics()
+            for _ in self._rotate_frames(steps, delta):
+                self._sleep_step()
+        self._finalize_rotation(new_orient)
+
+    def run_program(self, ops):
+        """
+        Run a program of operations, given as for
+        AsyncTurtle.run_program, in a single call.
+        """
+        for step in self._program_steps(self._compile_program(ops)):
+            motion, arg = step
+            if motion == 'goto':
+                self._goto(arg)
+            elif motion == 'rotate':
+                self._rotate(arg)
+            else:
+                self.circle(*arg)
 
     def goto(self, x, y=None):
         __doc__ = turtle.Turtle.goto.__doc__
@@ -295,15 +827,15 @@ class BlockingTurtle(AioBaseTurtle):
     def setheading(self, to_angle):
         __doc__ = turtle.Turtle.setheading.__doc__
 
-        angle = (to_angle - self.heading())*self._angleOrient
-        full = self._fullcircle
-        angle = (angle + full/2.) % full - full/2.
-        self._rotate(angle)
+        self._rotate(self._heading_delta(to_angle))
 
     def circle(self, radius, extent=None, steps=None):
         __doc__ = turtle.Turtle.circle.__doc__
 
         steps, step_len, rot_step = self._calc_circle(radius, extent, steps)
+        if not self.animated:
+            self._jump_circle(steps, step_len, rot_step)
+            return
 
         self._rotate(rot_step * 0.5)
         for idx in range(steps):
@@ -319,24 +851,104 @@ class AsyncTurtle(AioBaseTurtle):
     _AsyncTurtle_
 
     """
-    def __init__(self, loop=None, **kwargs):
+    def __init__(self, loop=None, deadlines=False, **kwargs):
         if loop is None:
             loop = asyncio.get_event_loop()
         self.loop = loop
+        self.deadlines = deadlines
         self.lock = asyncio.Lock(loop=self.loop)
+        self.lock_wait = 0.0
         super().__init__(**kwargs)
 
+    async def _acquire(self, command=None):
+        """
+        Acquire the turtle lock, recording the time spent waiting
+        for it, and return its context manager. While tracing, the
+        wait and the command run while holding the lock are added
+        to the trace log.
+        """
+        begin = self.loop.time()
+        traced = time.perf_counter() if trace_log.enabled else None
+        manager = await self.lock
+        if runtime_stats.enabled:
+            wait = self.loop.time() - begin
+            self.lock_wait += wait
+            runtime_stats.lock_wait.add(wait)
+        if traced is not None and trace_log.enabled:
+            now = time.perf_counter()
+            track = trace_log.track(self)
+            trace_log.complete('lock wait', 'lock', traced, now, track)
+            return trace_log.hold(manager, command or 'command', track, now)
+        return manager
+
+    async def _animate(self, frames):
+        """
+        Run the animation frames generator to completion. If a
+        FrameClock is attached to the screen the frames are
+        stepped by the clock along with those of every other
+        animated turtle, otherwise this coroutine sleeps for
+        one step time between each frame, or until each frame
+        deadline if the turtle keeps deadlines. A DetailController
+        on the screen samples frames while the animation runs.
+        """
+        controller = getattr(self.screen, 'detail_controller', None)
+        if controller is not None:
+            controller.start()
+        try:
+            clock = getattr(self.screen, 'frame_clock', None)
+            if clock is not None:
+                await clock.animate(frames)
+            elif self.deadlines:
+                await self._animate_deadlines(frames)
+            else:
+                for _ in frames:
+                    step_time = self.step_time
+                    begin = self.loop.time()
+                    await asyncio.sleep(step_time, loop=self.loop)
+                    if runtime_stats.enabled:
+                        runtime_stats.timer_lateness.add(
+                            self.loop.time() - begin - step_time
+                        )
+        finally:
+            if controller is not None:
+                controller.stop()
+
+    async def _animate_deadlines(self, frames):
+        """
+        Run the animation frames generator against absolute
+        deadlines one step time apart, counted from the start of
+        the animation. Whenever the loop wakes this coroutine a
+        whole step time or more late, the steps missed are skipped
+        by sending the frames generator the number of steps due, so
+        that the animation finishes on time however busy the loop.
+        """
+        loop = self.loop
+        step_time = self.step_time
+        deadline = loop.time()
+        try:
+            next(frames)
+            while True:
+                deadline += step_time
+                await asyncio.sleep(max(deadline - loop.time(), 0.0),
+                                    loop=loop)
+                late = loop.time() - deadline
+                if runtime_stats.enabled:
+                    runtime_stats.timer_lateness.add(late)
+                advance = 1
+                if step_time > 0 and late >= step_time:
+                    advance += int(late / step_time)
+                    deadline += (advance - 1) * step_time
+                frames.send(advance)
+        except StopIteration:
+            pass
+
     async def _goto(self, end):
         """
         Move the turtle to point end in small steps (if animated)
         depending on turtle speed, drawing a line if the pen is down.
         """
         if self.animated:
-            start = self._position
-            steps, delta = self._calc_move(end)
-            for n in range(1, steps):
-                await asyncio.sleep(self.step_time, loop=self.loop)
-                self._move_step(start, n, delta)
+            await self._animate(self._move_frames(end))
 
         self._finalize_move(end)
 
@@ -347,17 +959,113 @@ class AsyncTurtle(AioBaseTurtle):
         """
         new_orient, steps, delta = self._calc_rotation(angle)
         if self.animated:
-            for _ in range(steps):
-                self._orient = self._orient.rotate(delta)
-                await asyncio.sleep(self.step_time, loop=self.loop)
-                self._update_graphics()
-        self._orient = new_orient
-        self._update_graphics()
+            await self._animate(self._rotate_frames(steps, delta))
+        self._finalize_rotation(new_orient)
+
+    async def _circle(self, radius, extent=None, steps=None):
+        """
+        Draw a circle as a series of animated moves and
+        rotations, or all at once if not animated.
+        """
+        steps, dist, rot_step = self._calc_circle(radius, extent, steps)
+        if not self.animated:
+            self._jump_circle(steps, dist, rot_step)
+            return
+
+        await self._rotate(rot_step * 0.5)
+        for idx in range(steps):
+            await self._goto(self._position + self._orient*dist)
+            await self._rotate(rot_step)
+        await self._rotate(-rot_step * 0.5)
+
+    async def _follow_chunk(self, chunk):
+        """
+        Follow an array of path vertices, as compiled by a
+        PathStream, setting the pen, moving and turning to match
+        each vertex in turn. Unless animated, the moves between pen
+        changes are drawn as a single polyline.
+        """
+        if not self.animated:
+            points = []
+            x0, y0 = self._position
+            for idx in range(0, len(chunk), VERTEX_SIZE):
+                x, y, ox, oy, down = chunk[idx:idx + VERTEX_SIZE]
+                if bool(down) != self._drawing:
+                    self._polyline(points)
+                    points = []
+                    self.pen(pendown=bool(down))
+                if x != x0 or y != y0:
+                    points.append(_vec2d(x, y))
+                    x0, y0 = x, y
+            self._polyline(points)
+            if chunk and (ox, oy) != tuple(self._orient):
+                self._finalize_rotation(_vec2d(ox, oy))
+            return
+
+        for idx in range(0, len(chunk), VERTEX_SIZE):
+            x, y, ox, oy, down = chunk[idx:idx + VERTEX_SIZE]
+            if bool(down) != self._drawing:
+                self.pen(pendown=bool(down))
+            if (x, y) != tuple(self._position):
+                await self._goto(_vec2d(x, y))
+            x0, y0 = self._orient
+            if (ox, oy) != (x0, y0):
+                if self.animated:
+                    angle = math.degrees(
+                        math.atan2(x0 * oy - y0 * ox, x0 * ox + y0 * oy)
+                    )
+                    _, steps, delta = self._calc_rotation(
+                        angle / self._degreesPerAU
+                    )
+                    await self._animate(self._rotate_frames(steps, delta))
+                self._finalize_rotation(_vec2d(ox, oy))
+
+    async def follow_path(self, path, **kwargs):
+        """
+        Follow a turtle program or LSystem compiled into vertex
+        arrays in worker processes by a PathStream, created with
+        kwargs and starting from where the turtle is once it is
+        free to move. The turtle ends where running the program
+        step by step would have left it.
+        """
+        with (await self._acquire('follow_path')):
+            stream = PathStream(path, self, loop=self.loop, **kwargs)
+            async for chunk in stream:
+                await self._follow_chunk(chunk)
+
+    async def run_program(self, ops, yield_every=None):
+        """
+        Run a program of operations while holding the turtle lock
+        once. Operations are tuples of the name or alias of a turtle
+        method and its arguments, such as ('fd', 100), ('lt', 90) or
+        ('pencolor', 'red'), or ops may be an array of pairs of an
+        index into PROGRAM_OPCODES and an argument. The whole program
+        is resolved before anything runs.
+
+        Unless the turtle is animated, consecutive moves and turns
+        are computed in plain floats and drawn as a single polyline,
+        giving the same result as calling each method in turn. If
+        yield_every is given, the drawing is brought up to date and
+        other tasks may run after every yield_every operations.
+        """
+        program = self._compile_program(ops)
+        with (await self._acquire('run_program')):
+            for step in self._program_steps(program, yield_every):
+                if step is None:
+                    await asyncio.sleep(0, loop=self.loop)
+                    continue
+                motion, arg = step
+                if motion == 'goto':
+                    await self._goto(arg)
+                elif motion == 'rotate':
+                    await self._rotate(arg)
+                else:
+                    await self._circle(*arg)
 
     async def goto(self, x, y=None):
         __doc__ = turtle.Turtle.goto.__doc__
 
-        with (await self.lock):
+        with (await self._acquire('goto')):
             if y is None:
                 await self._goto(turtle.Vec2D(*x))
             else:
@@ -366,88 +1074,249 @@ class AsyncTurtle(AioBaseTurtle):
     async def forward(self, distance):
         __doc__ = turtle.Turtle.forward.__doc__
 
-        with (await self.lock):
+        with (await self._acquire('forward')):
             ende = self._position + self._orient * distance
             await self._goto(ende)
 
     async def back(self, distance):
         __doc__ = turtle.Turtle.back.__doc__
 
-        with (await self.lock):
+        with (await self._acquire('back')):
             ende = self._position - self._orient * distance
             await self._goto(ende)
 
     async def left(self, angle):
         __doc__ = turtle.Turtle.left.__doc__
 
-        with (await self.lock):
+        with (await self._acquire('left')):
             await self._rotate(angle)
 
     async def right(self, angle):
         __doc__ = turtle.Turtle.right.__doc__
 
-        with (await self.lock):
+        with (await self._acquire('right')):
             await self._rotate(-angle)
 
     async def setheading(self, to_angle):
         __doc__ = turtle.Turtle.setheading.__doc__
 
-        with (await self.lock):
-            angle = (to_angle - self.heading())*self._angleOrient
-            full = self._fullcircle
-            angle = (angle + full/2.) % full - full/2.
-            await self._rotate(angle)
+        with (await self._acquire('setheading')):
+            await self._rotate(self._heading_delta(to_angle))
 
     async def circle(self, radius, extent=None, steps=None):
         __doc__ = turtle.Turtle.circle.__doc__
 
-        with (await self.lock):
-            steps, dist, rot_step = self._calc_circle(radius, extent, steps)
-
-            await self._rotate(rot_step * 0.5)
-            for idx in range(steps):
-                await self._goto(self._position + self._orient*dist)
-                await self._rotate(rot_step)
-            await self._rotate(-rot_step * 0.5)
+        with (await self._acquire('circle')):
+            await self._circle(radius, extent, steps)
 
 add_turtle_fcn_aliases(AsyncTurtle)
 
 
-async def keep_refreshed(screen, delay=0.5):
+async def keep_refreshed(screen, delay=0.5, loop=None):
     """
     Coroutine to keep tkinter canvas refreshed periodically,
     defaults to 0.5 seconds between refreshes. This prevents
     annoyances like the spinning beachball cursor in OSX when
     no turtle is moving and updating the screen.
     """
+    if loop is None:
+        loop = asyncio.get_event_loop()
     try:
         while True:
-            await asyncio.sleep(delay)
-            screen._update()
-    except concurrent.futures.CancelledError:
+            begin = loop.time()
+            await asyncio.sleep(delay, loop=loop)
+            if runtime_stats.enabled:
+                runtime_stats.loop_lag.add(loop.time() - begin - delay)
+            batcher = getattr(screen, 'refresh_batcher', None)
+            if batcher is not None:
+                batcher.flush()
+            else:
+                screen._update()
+    except asyncio.CancelledError:
         return
 
 
-class TurtlePrompt:
+async def keep_responsive(screen, loop=None):
+    """
+    Coroutine keeping screen responsive for as long as it runs,
+    by servicing its Tk events with pump_tk_events, or by
+    refreshing it with keep_refreshed if it is not drawn by Tk.
+    """
+    if tk_app(screen) is None:
+        await keep_refreshed(screen, loop=loop)
+    else:
+        await pump_tk_events(screen, loop=loop)
+
+
+class TurtleCommands:
+    """
+    Interpreter of the TurtlePrompt command grammar, executing
+    command strings on the AsyncTurtles of a screen. Shared by
+    TurtlePrompt and the network PromptServer.
+    """
+    def __init__(self, screen, loop=None):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self.loop = loop
+        self.screen = screen
+
+    def execute(self, command):
+        """
+        Execute a command string other than quit, returning its
+        output as a string, or None if there is none.
+        """
+        command = command.split()
+        if not command:
+            return None
+        elif command[0] == 'new':
+            AsyncTurtle(name=command[1], screen=self.screen, loop=self.loop)
+        elif command[0] == 'list':
+            return '\n'.join(
+                str(task) for task in asyncio.Task.all_tasks(loop=self.loop)
+            )
+        elif command[0] == 'stats':
+            return runtime_stats.report(self.screen.turtles())
+        elif command[0] == 'trace':
+            return self.trace(command[1:])
+        elif command[0] == 'help':
+            return _TURTLEPROMPT_HELP
+        else:
+            result = self.command_turtle(command)
+            if result is not None:
+                return str(result)
+        return None
+
+    def trace(self, args):
+        """
+        Start recording the trace log, optionally with a capacity
+        and profiling, or stop it and export it to a file.
+        """
+        if args[:1] == ['start']:
+            capacity = None
+            for arg in args[1:]:
+                if arg != 'profile':
+                    capacity = int(arg)
+            trace_log.start(capacity=capacity, profile='profile' in args)
+            return 'Tracing started.'
+        if args[:1] == ['stop'] and len(args) == 2:
+            trace_log.stop()
+            count = trace_log.export(args[1])
+            return 'Wrote {0} trace events to {1}.'.format(count, args[1])
+        raise Exception('Usage: trace start [CAPACITY] [profile] | '
+                        'trace stop FILE')
+
+    def command_turtle(self, command_list):
+        """
+        Interpret a command string as a function or coroutine to
+        run on the given turtle. Return the return value of the
+        function or the Task if a couroutine.
+
+        If the turtle name is @group or a glob pattern, the command
+        is run on every turtle addressed, returning the list of
+        function results if any is not None, or a single future
+        gathering the coroutines.
+        """
+        turtle_name = command_list[0]
+        args = [self._convert_arg(x) for x in command_list[2:]]
+        if turtle_name.startswith('@') or _GLOB_CHARS.search(turtle_name):
+            return self._command_turtles(
+                self.get_turtles(turtle_name), command_list[1], args
+            )
+        turtle = self.get_turtle(turtle_name)
+
+        command = self._command_function(turtle, command_list[1])
+
+        logging.debug(
+            'Running command {0} on turtle {1}'
+            .format(command, turtle)
+        )
+        if asyncio.iscoroutinefunction(command):
+            return asyncio.ensure_future(command(*args), loop=self.loop)
+        return command(*args)
+
+    def _command_turtles(self, turtles, name, args):
+        """
+        Run the method name with args on every turtle in turtles,
+        looking the method up once for each turtle class.
+        """
+        functions = {}
+        for turt in turtles:
+            if type(turt) not in functions:
+                functions[type(turt)] = self._command_function(
+                    type(turt), name
+                )
+        logging.debug(
+            'Running command {0} on {1} turtles'.format(name, len(turtles))
+        )
+        if all(map(asyncio.iscoroutinefunction, functions.values())):
+            return asyncio.gather(
+                *[functions[type(turt)](turt, *args) for turt in turtles],
+                loop=self.loop
+            )
+        results = [functions[type(turt)](turt, *args) for turt in turtles]
+        if any(result is not None for result in results):
+            return results
+        return None
+
+    def _command_function(self, target, name):
+        """
+        Return the attribute name of a turtle or turtle class target
+        as a command. Private attributes are not commands.
+        """
+        if name.startswith('_'):
+            raise Exception('Unknown command {0}.'.format(name))
+        return getattr(target, name)
+
+    def get_turtle(self, name):
+        try:
+            return registry_for(self.screen).get(name)
+        except KeyError:
+            raise Exception('Turtle {0} not found.'.format(name))
+
+    def get_turtles(self, pattern):
+        """
+        Return the turtles addressed by an @group, glob pattern
+        or name.
+        """
+        try:
+            return registry_for(self.screen).select(pattern)
+        except KeyError:
+            raise Exception('No turtles match {0}.'.format(pattern))
+
+    def _convert_arg(self, arg):
+        try:
+            return int(arg)
+        except ValueError:
+            pass
+        try:
+            return float(arg)
+        except ValueError:
+            pass
+        return arg
+
+
+class TurtlePrompt(TurtleCommands):
     """
     Interactive prompt for issuing commands to AsyncTurtles
     """
-    def __init__(self, version=None):
+    def __init__(self, version=None, screen=None):
         """
         Read from STDIN, either get the Screen singleton or
-        create it, and prepare Queue. Create a keep_refreshed
-        task to keep the screen updated.
+        create it unless a screen is given, and prepare Queue.
+        Create a keep_responsive task to keep the screen updated.
         """
         self.version = version
-        self.loop = asyncio.get_event_loop()
-        self.queue = asyncio.Queue(loop=self.loop)
-        self.loop.add_reader(sys.stdin, self.entry)
-
-        if turtle.Turtle._screen is None:
-            turtle.Turtle._screen = turtle.Screen()
-        self.screen = turtle.Turtle._screen
+        loop = asyncio.get_event_loop()
+        self.queue = asyncio.Queue(loop=loop)
+        loop.add_reader(sys.stdin, self.entry)
+
+        if screen is None:
+            if turtle.Turtle._screen is None:
+                turtle.Turtle._screen = turtle.Screen()
+            screen = turtle.Turtle._screen
+        super().__init__(screen, loop=loop)
         self.refresher = asyncio.ensure_future(
-            keep_refreshed(self.screen),
+            keep_responsive(self.screen, loop=self.loop),
             loop=self.loop
         )
 
@@ -462,7 +1331,7 @@ class TurtlePrompt:
 
     async def run(self):
         """
-        Retrieve command strings from the Queue and parse them
+        Retrieve command strings from the Queue and execute them
         """
         if self.version:
             welcome = (
@@ -477,64 +1346,15 @@ class TurtlePrompt:
             print('aioturtle> ', end='', flush=True)
             command = await self.queue.get()
             try:
-                command = command.split()
-                if not command:
-                    continue
-                elif command[0] == 'quit':
+                if command.split()[:1] == ['quit']:
                     self.refresher.cancel()
                     return
-                elif command[0] == 'new':
-                    AsyncTurtle(name=command[1])
-                elif command[0] == 'list':
-                    for task in asyncio.Task.all_tasks(loop=self.loop):
-                        print(task)
-                elif command[0] == 'help':
-                    print(_TURTLEPROMPT_HELP)
-                else:
-                    self.command_turtle(command)
+                output = self.execute(command)
+                if output is not None:
+                    print(output)
             except Exception as e:
                 logging.exception(e)
 
-    def command_turtle(self, command_list):
-        """
-        Interpret a command string as a function or coroutine to
-        run on the given turtle. Print the return value of the
-        function if not none or the Task if a couroutine.
-        """
-        turtle_name = command_list[0]
-        turtle = self.get_turtle(turtle_name)
-
-        command = getattr(turtle, command_list[1])
-        args = [self._convert_arg(x) for x in command_list[2:]]
-
-        logging.debug(
-            'Running command {0} on turtle {1}'
-            .format(command, turtle)
-        )
-        if asyncio.iscoroutinefunction(command):
-            result = asyncio.ensure_future(command(*args), loop=self.loop)
-        else:
-            result = command(*args)
-        if result is not None:
-            print(result)
-
-    def get_turtle(self, name):
-        for turt in self.screen._turtles:
-            if turt.name == name:
-                return turt
-        raise Exception('Turtle {0} not found.'.format(name))
-
-    def _convert_arg(self, arg):
-        try:
-            return int(arg)
-        except ValueError:
-            pass
-        try:
-            return float(arg)
-        except ValueError:
-            pass
-        return arg
-
 
 def demo(version=None):
     """
@@ -567,5 +1387,14 @@ def demo(version=None):
     for pet in pets:
         pet.speed(speed=1)
 
-    prompt = TurtlePrompt(version=version)
-    loop.run_until_complete(prompt.run())
+    prompt(version=version)
+
+
+def prompt(version=None, screen=None):
+    """
+    Run a TurtlePrompt on screen, or on the Screen singleton,
+    until it is quit.
+    """
+    loop = asyncio.get_event_loop()
+    turtle_prompt = TurtlePrompt(version=version, screen=screen)
+    loop.run_until_complete(turtle_prompt.run())
@@ -0,0 +1,99 @@
+"""
+_detail_
+
+adaptive level of detail for the animation of many turtles
+"""
+import asyncio
+
+
+class DetailController:
+    """
+    _DetailController_
+
+    Adaptive level of detail for the animations of a screen, aiming
+    for a target frame rate. Creating a DetailController attaches it
+    to the screen. While turtles on the screen are animating, a
+    timer due once per frame samples the time spent refreshing the
+    screen since the last frame, measured around _update_graphics
+    and RefreshBatcher flushes and smoothed over a few frames. This
+    is the cost of a frame: when the event loop is busy drawing,
+    the timer wakes late and more refreshes fall within one frame.
+    Sampling stops one frame after the last animation ends, so an
+    idle screen costs nothing.
+
+    When frames take longer than 1/fps, the scale is raised, by at
+    most a quarter per frame and up to max_scale. When they fit,
+    the scale decays back towards 1. Animated turtles on the screen
+    move scale times their speed in units per step and turn scale
+    times as far per step. Circles drawn without explicit steps get
+    scale times fewer segments. So the number of steps drawn falls
+    as the load rises. Moves and turns still end exactly where they
+    would have at full detail, and circles end on the same point of
+    the circle.
+    """
+    def __init__(self, screen, fps=30.0, max_scale=16.0, loop=None):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self.loop = loop
+        self.screen = screen
+        self.fps = fps
+        self.max_scale = max_scale
+        self.scale = 1.0
+        self.frame_time = 0.0
+        self.frames = 0
+        self.animating = 0
+        self._drawn = 0.0
+        self._handle = None
+        screen.detail_controller = self
+
+    def start(self):
+        """
+        Count an animation starting, sampling frames until after
+        the last one ends.
+        """
+        self.animating += 1
+        if self._handle is None:
+            self._drawn = 0.0
+            self._handle = self.loop.call_later(1.0 / self.fps, self._sample)
+
+    def stop(self):
+        """
+        Count an animation ending.
+        """
+        self.animating = max(self.animating - 1, 0)
+
+    def refreshed(self, seconds):
+        """
+        Count seconds spent refreshing the screen.
+        """
+        self._drawn += seconds
+
+    def _sample(self):
+        """
+        Take the refresh time since the last frame as the cost of a
+        frame and adjust the scale.
+        """
+        budget = 1.0 / self.fps
+        self.frame_time += 0.25 * (self._drawn - self.frame_time)
+        self._drawn = 0.0
+        self.frames += 1
+        load = self.frame_time / budget
+        if load > 1.1:
+            self.scale = min(self.scale * min(load, 1.25), self.max_scale)
+        elif load < 1.05:
+            self.scale = max(1.0, self.scale * 0.95)
+        if self.animating:
+            self._handle = self.loop.call_later(budget, self._sample)
+        else:
+            self._handle = None
+
+    def close(self):
+        """
+        Stop adapting and detach from the screen, restoring full
+        detail.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if getattr(self.screen, 'detail_controller', None) is self:
+            del self.screen.detail_controller
@@ -0,0 +1,214 @@
+"""
+_export_
+
+streaming vector export of what turtles draw
+"""
+from xml.sax.saxutils import escape, quoteattr
+
+from .aioturtle import TurtleObserver
+
+_SVG_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+    'height="{height}" viewBox="{left} {top} {width} {height}">\n'
+    '<g fill="none" stroke-linecap="round" stroke-linejoin="round">\n'
+)
+_SVG_FOOTER = '</g>\n</svg>\n'
+
+_TEXT_ANCHORS = {'left': 'start', 'center': 'middle', 'right': 'end'}
+
+
+class _Path:
+    """
+    Points of a line being drawn by one turtle with one pen.
+    """
+    __slots__ = ('points', 'color', 'width')
+
+    def __init__(self, start, color, width):
+        self.points = [start]
+        self.color = color
+        self.width = width
+
+
+class SVGExporter(TurtleObserver):
+    """
+    _SVGExporter_
+
+    Writes what the attached turtles draw to an SVG file as they
+    draw it, without reading back the canvas. Consecutive moves
+    drawn with the same pen are merged into a single polyline,
+    written out whenever the pen changes or the line reaches
+    max_points points, so that memory use does not grow with the
+    size of the drawing. Only the elements drawn while a turtle is
+    filling are held back, to be written after the fill polygon
+    they lie on top of.
+
+    Lines, fills, stamps of polygon shaped turtles and written
+    text are exported. The drawing is scaled as on the canvas of
+    the turtles' screen, of the given width and height.
+    """
+    def __init__(self, path, width=400, height=300, max_points=1000):
+        self.path = path
+        self.max_points = max_points
+        self.elements = 0
+        self._file = open(path, 'w')
+        self._file.write(_SVG_HEADER.format(
+            width=width, height=height, left=-width / 2, top=-height / 2
+        ))
+        self._positions = {}
+        self._paths = {}
+        self._fills = {}
+
+    def attach(self, turt):
+        """
+        Start exporting what turt draws from now on.
+        """
+        self._positions[turt] = turt._position
+        super().attach(turt)
+
+    def close(self):
+        """
+        Stop exporting, detaching from all turtles, and complete
+        the SVG file. Unfinished fills are left unfilled.
+        """
+        for turt in self._positions:
+            if self in turt.observers:
+                turt.remove_observer(self)
+            self._end_path(turt)
+            fill = self._fills.pop(turt, None)
+            if fill is not None:
+                self._file.writelines(fill[1])
+        self._file.write(_SVG_FOOTER)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _points(self, turt, points):
+        """
+        Format points as the canvas of turt would place them,
+        to a thousandth of a pixel.
+        """
+        xscale, yscale = turt.screen.xscale, turt.screen.yscale
+        # adding zero turns rounded negative zeros into plain zeros
+        return ' '.join(
+            '{0:.10g},{1:.10g}'.format(
+                round(x * xscale, 3) + 0.0, round(-y * yscale, 3) + 0.0
+            )
+            for x, y in points
+        )
+
+    def _emit(self, turt, element):
+        """
+        Write element, or hold it back if turt is filling.
+        """
+        self.elements += 1
+        fill = self._fills.get(turt)
+        if fill is None:
+            self._file.write(element)
+        else:
+            fill[1].append(element)
+
+    def _end_path(self, turt):
+        path = self._paths.pop(turt, None)
+        if path is not None and len(path.points) > 1:
+            self._emit(turt, (
+                '<polyline points="{0}" stroke={1} '
+                'stroke-width="{2}"/>\n'.format(
+                    self._points(turt, path.points),
+                    quoteattr(path.color), path.width
+                )
+            ))
+
+    def on_move(self, turt, points):
+        start = self._positions[turt]
+        self._positions[turt] = points[-1]
+        fill = self._fills.get(turt)
+        if fill is not None:
+            fill[0].extend(points)
+        if not turt._drawing:
+            self._end_path(turt)
+            return
+        path = self._paths.get(turt)
+        if path is None or path.points[-1] != start:
+            self._end_path(turt)
+            path = self._paths[turt] = _Path(
+                start, turt._pencolor, turt._pensize
+            )
+        path.points.extend(points)
+        if len(path.points) >= self.max_points:
+            self._end_path(turt)
+            self._paths[turt] = _Path(
+                points[-1], turt._pencolor, turt._pensize
+            )
+
+    def on_pen(self, turt):
+        self._end_path(turt)
+
+    def on_fill(self, turt, begin):
+        self._end_path(turt)
+        fill = self._fills.pop(turt, None)
+        if begin:
+            self._fills[turt] = ([turt._position], [])
+            if fill is not None:
+                self._file.writelines(fill[1])
+            return
+        if fill is None:
+            return
+        points, elements = fill
+        if len(points) > 2:
+            self._emit(turt, '<polygon points="{0}" fill={1}/>\n'.format(
+                self._points(turt, points), quoteattr(turt._fillcolor)
+            ))
+        self._file.writelines(elements)
+
+    def on_stamp(self, turt):
+        shape = turt.screen._shapes[turt.turtle.shapeIndex]
+        if shape._type == 'polygon':
+            if turt._resizemode == 'noresize':
+                width = 1
+            elif turt._resizemode == 'auto':
+                width = turt._pensize
+            else:
+                width = turt._outlinewidth
+            polygons = [(
+                turt._getshapepoly(shape._data),
+                turt._fillcolor, turt._pencolor, width
+            )]
+        elif shape._type == 'compound':
+            polygons = [
+                (turt._getshapepoly(poly, True), turt._cc(fill),
+                 turt._cc(outline), turt._outlinewidth)
+                for poly, fill, outline in shape._data
+            ]
+        else:
+            return
+        for poly, fill, outline, width in polygons:
+            self._emit(turt, (
+                '<polygon points="{0}" fill={1} stroke={2} '
+                'stroke-width="{3}"/>\n'.format(
+                    self._points(turt, turt._polytrafo(poly)),
+                    quoteattr(fill), quoteattr(outline), width
+                )
+            ))
+
+    def on_write(self, turt, text, align, font):
+        x, y = turt._position
+        family, size = font[0], font[1]
+        style = font[2] if len(font) > 2 else ''
+        attrs = ''
+        if 'bold' in style:
+            attrs += ' font-weight="bold"'
+        if 'italic' in style:
+            attrs += ' font-style="italic"'
+        self._emit(turt, (
+            '<text x="{0:.6g}" y="{1:.6g}" fill={2} font-family={3} '
+            'font-size="{4}" text-anchor="{5}"{6}>{7}</text>\n'.format(
+                x * turt.screen.xscale - 1, -y * turt.screen.yscale,
+                quoteattr(turt._pencolor), quoteattr(str(family)), size,
+                _TEXT_ANCHORS[align], attrs, escape(text)
+            )
+        ))
@@ -0,0 +1,160 @@
+"""
+_frameclock_
+
+shared animation clock stepping every animated turtle on a screen
+"""
+import asyncio
+import time
+
+from .metrics import runtime_stats
+from .tracing import trace_log
+
+
+class FrameClock:
+    """
+    _FrameClock_
+
+    Central frame scheduler for the animated moves of AsyncTurtles
+    on a screen. Creating a FrameClock attaches it to the screen,
+    after which each animated move or rotation registers its frames
+    generator here instead of sleeping once per step. A single
+    timer advances every registered animation by one step per tick,
+    and the coroutine waiting on an animation is only woken once it
+    is complete, so the event loop does work in proportion to the
+    frame rate rather than to the number of moving turtles.
+
+    The time between ticks follows the screen delay, exactly as the
+    step time of an unclocked turtle does. If the screen also has a
+    RefreshBatcher, it is flushed once at the end of every tick.
+
+    With deadlines, ticks are scheduled at absolute times one
+    interval apart, and a tick running one or more whole intervals
+    late advances every animation by all the steps due, skipping
+    those in between, so that moves finish on time however many
+    turtles are moving.
+    """
+    def __init__(self, screen, loop=None, deadlines=False):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self.loop = loop
+        self.screen = screen
+        self.deadlines = deadlines
+        self.ticks = 0
+        self._animations = []
+        self._handle = None
+        self._due = None
+        screen.frame_clock = self
+
+    @property
+    def interval(self):
+        """
+        The time in seconds between ticks.
+        """
+        return self.screen._delayvalue * 0.001
+
+    @property
+    def active(self):
+        """
+        The number of animations currently being stepped.
+        """
+        return len(self._animations)
+
+    def animate(self, frames):
+        """
+        Register the frames generator of an animated move and
+        return a future which is resolved when it is exhausted.
+        The generator is advanced to its first yield immediately
+        and then once per tick.
+        """
+        future = self.loop.create_future()
+        try:
+            next(frames)
+        except StopIteration:
+            future.set_result(None)
+            return future
+        self._animations.append((frames, future))
+        future.add_done_callback(self._discard)
+        if self._handle is None:
+            self._schedule()
+        return future
+
+    def _schedule(self, due=None):
+        if due is None:
+            due = self.loop.time() + self.interval
+        self._due = due
+        self._handle = self.loop.call_at(due, self._tick)
+
+    def _discard(self, future):
+        """
+        Drop the animation of a future cancelled by its waiting
+        coroutine, stopping the timer if nothing is left to step.
+        """
+        if not future.cancelled():
+            return
+        for idx, (frames, other) in enumerate(self._animations):
+            if other is future:
+                frames.close()
+                del self._animations[idx]
+                break
+        if not self._animations and self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _tick(self):
+        """
+        Advance every registered animation by one step, or by
+        every step due if keeping deadlines, resolving the futures
+        of those which have finished.
+        """
+        self._handle = None
+        self.ticks += 1
+        begin = time.perf_counter()
+        late = self.loop.time() - self._due
+        if runtime_stats.enabled:
+            runtime_stats.timer_lateness.add(late)
+        interval = self.interval
+        advance = 1
+        if self.deadlines and interval > 0 and late >= interval:
+            advance += int(late / interval)
+        animations = self._animations
+        self._animations = []
+        for frames, future in animations:
+            if future.cancelled():
+                frames.close()
+                continue
+            try:
+                frames.send(advance)
+            except StopIteration:
+                future.set_result(None)
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                self._animations.append((frames, future))
+        batcher = getattr(self.screen, 'refresh_batcher', None)
+        if batcher is not None:
+            batcher.flush()
+        if trace_log.enabled:
+            trace_log.complete(
+                'tick', 'clock', begin, time.perf_counter(), 'frame clock'
+            )
+        if self._animations:
+            if self.deadlines:
+                self._schedule(self._due + advance * interval)
+            else:
+                self._schedule()
+
+    def close(self):
+        """
+        Detach the clock from its screen, cancelling any animations
+        still in progress.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        animations = self._animations
+        self._animations = []
+        for frames, future in animations:
+            frames.close()
+            future.cancel()
+        if getattr(self.screen, 'frame_clock', None) is self:
+            del self.screen.frame_clock
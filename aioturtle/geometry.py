@@ -0,0 +1,99 @@
+"""
+_geometry_
+
+turtle step geometry on plain floats, free of tkinter
+"""
+import math
+
+
+def rotate(x, y, angle):
+    """
+    Rotate the vector x, y counterclockwise by angle degrees,
+    exactly as turtle.Vec2D.rotate does.
+    """
+    angle = angle * math.pi / 180.0
+    c, s = math.cos(angle), math.sin(angle)
+    return x * c - y * s, y * c + x * s
+
+
+def calc_move(dx, dy, speed, xscale=1.0, yscale=1.0):
+    """
+    Return the number of steps and the x, y step of an animated
+    move by dx, dy at speed, as AioBaseTurtle._calc_move. A speed
+    of zero moves in a single step.
+    """
+    if not speed:
+        speed = 1e9
+    diffsq = (dx*xscale)**2 + (dy*yscale)**2
+    steps = max(1, int(diffsq**0.5 / speed))
+    scale = 1.0/steps
+    return steps, (dx*scale, dy*scale)
+
+
+def calc_rotation(angle, speed):
+    """
+    Return the number of steps and the step angle of an animated
+    rotation by angle degrees at speed, as
+    AioBaseTurtle._calc_rotation.
+    """
+    if not speed:
+        speed = 1e9
+    steps = 1 + int(abs(angle) / (3.0*speed))
+    return steps, 1.0 * angle / steps
+
+
+def heading_delta(heading, to_angle, fullcircle, orient=1):
+    """
+    Return the angle to rotate by from heading to reach to_angle
+    by the shortest way round, in a circle of fullcircle units.
+    """
+    angle = (to_angle - heading)*orient
+    return (angle + fullcircle/2.) % fullcircle - fullcircle/2.
+
+
+def calc_circle(radius, extent, steps, fullcircle, degrees_per_au,
+                detail=1.0):
+    """
+    Return the number of steps, step length and step rotation of
+    a circle, as AioBaseTurtle._calc_circle. Unless given, the
+    number of steps is divided by the level of detail scale.
+    """
+    if extent is None:
+        extent = fullcircle
+    if steps is None:
+        frac = abs(extent)/fullcircle
+        steps = 1+int(min(11+abs(radius)/6.0, 59.0)*frac/detail)
+    rot_step = 1.0 * extent / steps
+    step_len = 2.0 * radius * math.sin(
+        rot_step*math.pi/360.0*degrees_per_au
+    )
+    if radius < 0:
+        step_len, rot_step, = -step_len, -rot_step
+    return steps, step_len, rot_step
+
+
+def circle_path(x, y, ox, oy, steps, step_len, rot_step, degrees_per_au):
+    """
+    Compute the vertices of a circle drawn from position x, y with
+    orientation ox, oy, exactly as the stepwise circle methods would
+    reach them. Return the list of vertices, the list of the
+    orientations in which each step is taken and the final
+    orientation, all as float pairs.
+    """
+    def rotation(angle):
+        angle = angle * degrees_per_au * math.pi / 180.0
+        return math.cos(angle), math.sin(angle)
+
+    cos, sin = rotation(rot_step * 0.5)
+    ox, oy = ox * cos - oy * sin, oy * cos + ox * sin
+    cos, sin = rotation(rot_step)
+    points = []
+    orients = []
+    for _ in range(steps):
+        orients.append((ox, oy))
+        x, y = x + ox * step_len, y + oy * step_len
+        points.append((x, y))
+        ox, oy = ox * cos - oy * sin, oy * cos + ox * sin
+    cos, sin = rotation(-rot_step * 0.5)
+    ox, oy = ox * cos - oy * sin, oy * cos + ox * sin
+    return points, orients, (ox, oy)
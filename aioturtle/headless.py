@@ -0,0 +1,254 @@
+"""
+_headless_
+
+in-memory screen backend for running turtles without tkinter
+"""
+import asyncio
+import collections
+import turtle
+
+
+class CanvasItem:
+    """
+    A single drawing item recorded by a NullCanvas. The
+    coords are stored flat in canvas coordinates exactly as
+    a tkinter canvas would report them.
+    """
+    __slots__ = ('id', 'type', 'coords', 'options')
+
+    def __init__(self, item_id, item_type, coords, options):
+        self.id = item_id
+        self.type = item_type
+        self.coords = coords
+        self.options = options
+
+    def __repr__(self):
+        return '<CanvasItem {0} {1}>'.format(self.id, self.type)
+
+
+class NullCanvas:
+    """
+    _NullCanvas_
+
+    Stand-in for the subset of the tkinter Canvas API used by
+    turtle.TurtleScreenBase. Items are kept in an ordered dict
+    which doubles as the display list, so raising or lowering
+    an item is constant time. Every call is tallied in the ops
+    counter so that the rendering work done by a program can
+    be measured without ever touching tk.
+    """
+    def __init__(self, width=400, height=300, bg='white'):
+        self.width = width
+        self.height = height
+        self.bg = bg
+        self.scrollregion = None
+        self.items = collections.OrderedDict()
+        self.ops = collections.Counter()
+        self._next_id = 1
+
+    def _create(self, item_type, coords, options):
+        item_id = self._next_id
+        self._next_id += 1
+        self.items[item_id] = CanvasItem(
+            item_id, item_type, _flatten(coords), options
+        )
+        self.ops['create'] += 1
+        return item_id
+
+    def _ids(self, item):
+        if item == 'all':
+            return list(self.items)
+        if isinstance(item, (tuple, list)):
+            return list(item)
+        return [item]
+
+    def create_polygon(self, *coords, **options):
+        return self._create('polygon', coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._create('line', coords, options)
+
+    def create_text(self, x, y, **options):
+        return self._create('text', (x, y), options)
+
+    def create_image(self, x, y, **options):
+        return self._create('image', (x, y), options)
+
+    def coords(self, item, *coords):
+        self.ops['coords'] += 1
+        if not coords:
+            return list(self.items[item].coords)
+        self.items[item].coords = _flatten(coords)
+
+    def itemconfigure(self, item, **options):
+        self.ops['itemconfigure'] += 1
+        for item_id in self._ids(item):
+            self.items[item_id].options.update(options)
+
+    itemconfig = itemconfigure
+
+    def itemcget(self, item, option):
+        return self.items[item].options.get(option)
+
+    def type(self, item):
+        item = self.items.get(item)
+        return None if item is None else item.type
+
+    def find_all(self):
+        return tuple(self.items)
+
+    def tag_raise(self, item):
+        self.ops['tag_raise'] += 1
+        for item_id in self._ids(item):
+            self.items.move_to_end(item_id)
+
+    def tag_lower(self, item):
+        self.ops['tag_lower'] += 1
+        for item_id in self._ids(item):
+            self.items.move_to_end(item_id, last=False)
+
+    def delete(self, item):
+        self.ops['delete'] += 1
+        for item_id in self._ids(item):
+            self.items.pop(item_id, None)
+
+    def bbox(self, item):
+        """
+        Approximate bounding box of an item. Text is assumed to
+        be set in a font whose glyphs are 0.6 times as wide as
+        the font size, which is close enough for the turtle
+        write() cursor arithmetic.
+        """
+        item = self.items[item]
+        coords = item.coords
+        if item.type == 'text':
+            size = abs(int(item.options.get('font', ('', 8))[1]))
+            width = int(0.6 * size * len(str(item.options.get('text', ''))))
+            x, y = coords
+            return int(x), int(y) - size, int(x) + width, int(y)
+        xs, ys = coords[::2], coords[1::2]
+        return int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys))
+
+    def update(self):
+        self.ops['update'] += 1
+
+    def after(self, ms, func=None, *args):
+        if func is None:
+            return
+        loop = asyncio.get_event_loop()
+        loop.call_later(ms * 0.001, func, *args)
+
+    def after_idle(self, func, *args):
+        asyncio.get_event_loop().call_soon(func, *args)
+
+    def cget(self, option):
+        if option == 'bg':
+            return self.bg
+        return getattr(self, option)
+
+    def config(self, bg=None, scrollregion=None, **kwargs):
+        if bg is not None:
+            self.bg = bg
+        if scrollregion is not None:
+            self.scrollregion = scrollregion
+
+    def __getitem__(self, option):
+        return self.cget(option)
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def winfo_toplevel(self):
+        return self
+
+    def call(self, *args):
+        pass
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def unbind(self, *args, **kwargs):
+        pass
+
+    def tag_bind(self, *args, **kwargs):
+        pass
+
+    def tag_unbind(self, *args, **kwargs):
+        pass
+
+    def focus_force(self):
+        pass
+
+
+def _flatten(coords):
+    """
+    Flatten coordinates given as numbers, pairs, or a single
+    sequence of either into a list of floats.
+    """
+    flat = []
+    for coord in coords:
+        if isinstance(coord, (tuple, list)):
+            flat.extend(_flatten(coord))
+        else:
+            flat.append(float(coord))
+    return flat
+
+
+class HeadlessScreen(turtle.TurtleScreen):
+    """
+    _HeadlessScreen_
+
+    TurtleScreen drawing onto a NullCanvas rather than a tk
+    canvas. Turtles keep their complete state and geometry, and
+    every line, polygon, stamp and text item they produce is
+    recorded in memory on screen.cv where it can be inspected
+    with the usual canvas calls such as find_all() and coords().
+
+    Pass an instance as the screen argument of AsyncTurtle,
+    BlockingTurtle or TurtlePrompt to run without a display.
+    """
+    def __init__(self, width=turtle._CFG['canvwidth'],
+                 height=turtle._CFG['canvheight'], mode=turtle._CFG['mode'],
+                 colormode=turtle._CFG['colormode'],
+                 delay=turtle._CFG['delay']):
+        cv = NullCanvas(width=width, height=height)
+        super().__init__(cv, mode=mode, colormode=colormode, delay=delay)
+
+    @staticmethod
+    def _blankimage():
+        return ''
+
+    @staticmethod
+    def _image(filename):
+        return filename
+
+    def _iscolorstring(self, color):
+        return isinstance(color, str) and bool(color)
+
+    def _delay(self, delay):
+        pass
+
+    @property
+    def items(self):
+        """
+        The recorded canvas items in display order.
+        """
+        return list(self.cv.items.values())
+
+    def mainloop(self):
+        raise NotImplementedError(
+            'GUI functions are intentionally not implemented in aioturtle'
+        )
+
+    def textinput(self, title, prompt):
+        raise NotImplementedError(
+            'GUI functions are intentionally not implemented in aioturtle'
+        )
+
+    def numinput(self, title, prompt, default=None, minval=None, maxval=None):
+        raise NotImplementedError(
+            'GUI functions are intentionally not implemented in aioturtle'
+        )
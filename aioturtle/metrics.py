@@ -0,0 +1,173 @@
+"""
+_metrics_
+
+lightweight runtime instrumentation for turtles and the event loop
+"""
+import bisect
+import threading
+
+
+class Histogram:
+    """
+    _Histogram_
+
+    Fixed bucket histogram of durations in seconds. Buckets double
+    in width from one microsecond up to about eight seconds, so
+    adding a sample is a bisection of a short tuple and a few
+    additions, cheap enough to do on every animation step. Samples
+    may be added from several threads.
+    """
+    BOUNDS = tuple(1e-6 * 2**idx for idx in range(24))
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, value):
+        if value < 0.0:
+            value = 0.0
+        idx = bisect.bisect_left(self.BOUNDS, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct):
+        """
+        Upper bound of the bucket containing the given percentile,
+        or the largest sample if it falls in the overflow bucket.
+        """
+        if not self.count:
+            return 0.0
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if idx < len(self.BOUNDS):
+                    return min(self.BOUNDS[idx], self.max)
+                break
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+    def __str__(self):
+        if not self.count:
+            return 'n=0'
+        return (
+            'n={count} mean={mean:.3f}ms p50={p50:.3f}ms '
+            'p99={p99:.3f}ms max={max:.3f}ms'.format(
+                count=self.count,
+                mean=self.mean * 1e3,
+                p50=self.percentile(50) * 1e3,
+                p99=self.percentile(99) * 1e3,
+                max=self.max * 1e3
+            )
+        )
+
+
+class RuntimeStats:
+    """
+    _RuntimeStats_
+
+    Process wide runtime statistics, collected by the turtle
+    classes, FrameClock and keep_refreshed while enabled:
+
+    -   lock_wait: time AsyncTurtle coroutines wait for the lock
+    -   timer_lateness: how late animation steps wake compared to
+        the requested step time
+    -   update_graphics: time spent in _update_graphics
+    -   loop_lag: event loop lag seen by keep_refreshed and
+        pump_tk_events
+    -   skipped_frames: the number of animation steps skipped to
+        keep deadlines
+
+    Per-turtle step counts, skipped frames and lock wait totals
+    are kept on the turtles themselves as the steps,
+    skipped_frames and lock_wait attributes.
+    """
+    def __init__(self):
+        self.enabled = True
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.lock_wait = Histogram()
+        self.timer_lateness = Histogram()
+        self.update_graphics = Histogram()
+        self.loop_lag = Histogram()
+        self.skipped_frames = 0
+
+    def skip(self, count):
+        """
+        Count count skipped animation steps, from any thread.
+        """
+        with self._lock:
+            self.skipped_frames += count
+
+    def as_dict(self, turtles=()):
+        """
+        Return all statistics as a dictionary, including the step
+        counts and lock waits of the given turtles.
+        """
+        return {
+            'lock_wait': self.lock_wait.summary(),
+            'timer_lateness': self.timer_lateness.summary(),
+            'update_graphics': self.update_graphics.summary(),
+            'loop_lag': self.loop_lag.summary(),
+            'skipped_frames': self.skipped_frames,
+            'turtles': [
+                {
+                    'name': getattr(turt, 'name', None),
+                    'steps': getattr(turt, 'steps', 0),
+                    'skipped_frames': getattr(turt, 'skipped_frames', 0),
+                    'lock_wait': getattr(turt, 'lock_wait', 0.0),
+                }
+                for turt in turtles
+            ],
+        }
+
+    def report(self, turtles=()):
+        """
+        Return a human readable report of the statistics and of
+        the given turtles.
+        """
+        lines = [
+            'lock wait:       {0}'.format(self.lock_wait),
+            'timer lateness:  {0}'.format(self.timer_lateness),
+            'update graphics: {0}'.format(self.update_graphics),
+            'loop lag:        {0}'.format(self.loop_lag),
+            'skipped frames:  {0}'.format(self.skipped_frames),
+        ]
+        turtles = list(turtles)
+        if turtles:
+            lines.append('{0:<16} {1:>10} {2:>10} {3:>14}'.format(
+                'turtle', 'steps', 'skipped', 'lock wait ms'
+            ))
+        for turt in turtles:
+            lines.append('{0:<16} {1:>10} {2:>10} {3:>14.3f}'.format(
+                str(getattr(turt, 'name', None)),
+                getattr(turt, 'steps', 0),
+                getattr(turt, 'skipped_frames', 0),
+                getattr(turt, 'lock_wait', 0.0) * 1e3
+            ))
+        return '\n'.join(lines)
+
+
+runtime_stats = RuntimeStats()
@@ -0,0 +1,233 @@
+"""
+_paths_
+
+compilation of turtle programs and L-systems into vertex arrays
+in worker processes
+"""
+import array
+import asyncio
+import concurrent.futures
+
+from . import geometry
+
+# floats per vertex: x, y, orientation x, orientation y, pen down
+VERTEX_SIZE = 5
+
+_default_executor = None
+
+
+def default_executor():
+    """
+    Return the ProcessPoolExecutor shared by path streams given
+    no executor, creating it on first use.
+    """
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = concurrent.futures.ProcessPoolExecutor()
+    return _default_executor
+
+
+class LSystem:
+    """
+    _LSystem_
+
+    A Lindenmayer system drawn by a turtle. The axiom is rewritten
+    iterations times by replacing every symbol that has a rule with
+    its replacement. The symbols of the result are drawn as:
+
+    -   F, G: forward by step with the pen as it is
+    -   f: forward by step with the pen up
+    -   +, -: turn left, right by angle
+    -   |: turn around
+    -   [, ]: push, pop the position, orientation and pen
+
+    and any other symbol is ignored.
+    """
+    def __init__(self, axiom, rules, angle, step=10, iterations=1):
+        self.axiom = axiom
+        self.rules = rules
+        self.angle = angle
+        self.step = step
+        self.iterations = iterations
+
+    def expand(self):
+        return expand_lsystem(self.axiom, self.rules, self.iterations)
+
+    def table(self):
+        """
+        Map of symbols to the program operations drawing them.
+        """
+        return {
+            'F': ('fd', self.step),
+            'G': ('fd', self.step),
+            'f': ('move', self.step),
+            '+': ('lt', self.angle),
+            '-': ('rt', self.angle),
+            '|': ('lt', 180),
+            '[': ('push',),
+            ']': ('pop',),
+        }
+
+
+def expand_lsystem(axiom, rules, iterations):
+    """
+    Rewrite axiom iterations times by the dictionary of rules.
+    """
+    table = str.maketrans(rules) if rules else {}
+    result = axiom
+    for _ in range(iterations):
+        result = result.translate(table)
+    return result
+
+
+def compile_chunk(ops, state, fullcircle=360.0, table=None):
+    """
+    Run the turtle program ops from state, a tuple of position x, y,
+    orientation x, y, pen down flag and stack of pushed states, and
+    return an array of the vertices visited along with the final
+    state. If table is given, ops is a string of L-system symbols
+    looked up in table.
+
+    Program operations are tuples of a verb and its arguments:
+    ('fd', distance), ('bk', distance), ('move', distance),
+    ('lt', angle), ('rt', angle), ('circle', radius[, extent[, steps]]),
+    ('pu',), ('pd',), ('push',) and ('pop',).
+
+    Every operation adds one vertex of VERTEX_SIZE floats holding
+    the state it leaves the turtle in, except circles, which add
+    one vertex for the turn before the first step and one for each
+    step. Positions and orientations are computed with the same
+    floating point operations as the turtle methods, so a turtle
+    following the vertices ends where running the program would
+    have left it.
+    """
+    x, y, ox, oy, down, stack = state
+    stack = list(stack)
+    degrees_per_au = 360.0 / fullcircle
+    out = array.array('d')
+    emit = out.extend
+    for op in ops:
+        if table is not None:
+            op = table.get(op)
+            if op is None:
+                continue
+        verb = op[0]
+        if verb == 'fd':
+            x, y = x + ox * op[1], y + oy * op[1]
+        elif verb == 'bk':
+            x, y = x - ox * op[1], y - oy * op[1]
+        elif verb == 'lt':
+            ox, oy = geometry.rotate(ox, oy, op[1] * degrees_per_au)
+        elif verb == 'rt':
+            ox, oy = geometry.rotate(ox, oy, -op[1] * degrees_per_au)
+        elif verb == 'move':
+            emit((x, y, ox, oy, 0.0))
+            x, y = x + ox * op[1], y + oy * op[1]
+            emit((x, y, ox, oy, 0.0))
+        elif verb == 'pu':
+            down = 0.0
+        elif verb == 'pd':
+            down = 1.0
+        elif verb == 'push':
+            stack.append((x, y, ox, oy, down))
+        elif verb == 'pop':
+            emit((x, y, ox, oy, 0.0))
+            x, y, ox, oy, pen = stack.pop()
+            emit((x, y, ox, oy, 0.0))
+            down = pen
+        elif verb == 'circle':
+            steps, step_len, rot_step = geometry.calc_circle(
+                op[1], op[2] if len(op) > 2 else None,
+                op[3] if len(op) > 3 else None,
+                fullcircle, degrees_per_au
+            )
+            points, orients, orient = geometry.circle_path(
+                x, y, ox, oy, steps, step_len, rot_step, degrees_per_au
+            )
+            emit((x, y) + orients[0] + (down,))
+            for idx in range(steps - 1):
+                emit(points[idx] + orients[idx + 1] + (down,))
+            (x, y), (ox, oy) = points[-1], orient
+        else:
+            raise ValueError('Unknown path operation {0}'.format(verb))
+        emit((x, y, ox, oy, down))
+    return out, (x, y, ox, oy, down, stack)
+
+
+class PathStream:
+    """
+    _PathStream_
+
+    Asynchronous iterator over the vertex arrays of a turtle program
+    or LSystem, compiled chunk_size operations at a time in an
+    executor, a shared ProcessPoolExecutor by default, so that the
+    event loop is never blocked by the geometry. The next chunk is
+    compiled while the current one is being followed.
+
+    The program starts from the position, orientation and pen of
+    turtle start.
+    """
+    def __init__(self, source, start, executor=None, loop=None,
+                 chunk_size=10000):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self.loop = loop
+        self.source = source
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.fullcircle = start._fullcircle
+        self.vertices = 0
+        x, y = start._position
+        ox, oy = start._orient
+        self._state = (x, y, ox, oy, 1.0 if start._drawing else 0.0, [])
+        self._ops = None
+        self._offset = 0
+        self._pending = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._ops is None:
+            await self._prepare()
+        if self._pending is None:
+            raise StopAsyncIteration
+        chunk, self._state = await self._pending
+        self._pending = self._compile_next()
+        self.vertices += len(chunk) // VERTEX_SIZE
+        return chunk
+
+    async def _prepare(self):
+        """
+        Expand an LSystem in the executor and start compiling the
+        first chunk.
+        """
+        if isinstance(self.source, LSystem):
+            self._table = self.source.table()
+            self._ops = await self.loop.run_in_executor(
+                self._executor(), expand_lsystem, self.source.axiom,
+                self.source.rules, self.source.iterations
+            )
+        else:
+            self._table = None
+            self._ops = list(self.source)
+        self._pending = self._compile_next()
+
+    def _executor(self):
+        if self.executor is None:
+            return default_executor()
+        return self.executor
+
+    def _compile_next(self):
+        """
+        Start compiling the next chunk from the current state,
+        returning its future, or None if the program is done.
+        """
+        if self._offset >= len(self._ops):
+            return None
+        ops = self._ops[self._offset:self._offset + self.chunk_size]
+        self._offset += self.chunk_size
+        return self.loop.run_in_executor(
+            self._executor(), compile_chunk, ops, self._state,
+            self.fullcircle, self._table
+        )
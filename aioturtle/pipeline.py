@@ -0,0 +1,210 @@
+"""
+_pipeline_
+
+per-turtle command queue which merges adjacent moves
+"""
+import asyncio
+import collections
+import turtle
+
+from .aioturtle import _TURTLE_FUNCTION_ALIASES, add_turtle_fcn_aliases
+
+_CANONICAL_NAMES = {
+    alias: fcn
+    for fcn, aliases in _TURTLE_FUNCTION_ALIASES.items()
+    for alias in aliases
+}
+
+_PIPELINE_COROUTINES = ('forward', 'left', 'goto', 'setheading', 'circle')
+
+
+class _Command:
+    """
+    A queued turtle command and the futures of every submitted
+    command merged into it.
+    """
+    __slots__ = ('name', 'args', 'futures')
+
+    def __init__(self, name, args, future):
+        self.name = name
+        self.args = args
+        self.futures = [future]
+
+
+def _mergeable(first, second):
+    """
+    True if command second may be folded into command first
+    without changing what is drawn. Rotations always combine,
+    forward moves only if they go the same way so that no
+    part of a line drawn back over itself is lost.
+    """
+    if first.name != second.name:
+        return False
+    if first.name == 'left':
+        return True
+    if first.name == 'forward':
+        return first.args[0] * second.args[0] >= 0
+    return False
+
+
+def merge_commands(commands):
+    """
+    Coalesce runs of adjacent compatible commands into single
+    commands, returning the new list.
+    """
+    merged = []
+    for cmd in commands:
+        if merged and _mergeable(merged[-1], cmd):
+            prev = merged[-1]
+            prev.args = (prev.args[0] + cmd.args[0],)
+            prev.futures.extend(cmd.futures)
+        else:
+            merged.append(cmd)
+    return merged
+
+
+class CommandPipeline:
+    """
+    _CommandPipeline_
+
+    Opt-in command queue for a single AsyncTurtle. Commands are
+    submitted without awaiting and each returns a future for its
+    completion. A single worker task drains the queue, folding
+    adjacent forward moves and adjacent rotations together, and
+    runs the whole batch while holding the turtle lock just once.
+
+    back and right are queued as forward and left with negated
+    arguments so that they merge with their counterparts.
+    Synchronous turtle methods such as penup or color may be
+    queued with submit to keep them in order with the moves.
+    """
+    def __init__(self, aioturtle):
+        self.turtle = aioturtle
+        self.loop = aioturtle.loop
+        self.submitted = 0
+        self.executed = 0
+        self._queue = collections.deque()
+        self._worker = None
+
+    def submit(self, name, *args):
+        """
+        Queue the turtle method name with args, returning a future
+        for its result.
+        """
+        name = _CANONICAL_NAMES.get(name, name)
+        if name == 'back':
+            name, args = 'forward', (-args[0],)
+        elif name == 'right':
+            name, args = 'left', (-args[0],)
+        if name not in _PIPELINE_COROUTINES:
+            method = getattr(self.turtle, name)
+            if asyncio.iscoroutinefunction(method):
+                raise ValueError(
+                    'Coroutine {0} cannot be pipelined'.format(name)
+                )
+        future = self.loop.create_future()
+        self._queue.append(_Command(name, args, future))
+        self.submitted += 1
+        if self._worker is None:
+            self._worker = asyncio.ensure_future(self._run(), loop=self.loop)
+        return future
+
+    def forward(self, distance):
+        return self.submit('forward', distance)
+
+    def back(self, distance):
+        return self.submit('back', distance)
+
+    def left(self, angle):
+        return self.submit('left', angle)
+
+    def right(self, angle):
+        return self.submit('right', angle)
+
+    def goto(self, x, y=None):
+        return self.submit('goto', x, y)
+
+    def setheading(self, to_angle):
+        return self.submit('setheading', to_angle)
+
+    def circle(self, radius, extent=None, steps=None):
+        return self.submit('circle', radius, extent, steps)
+
+    async def drain(self):
+        """
+        Wait until every command submitted so far is complete.
+        """
+        while self._worker is not None:
+            await asyncio.shield(self._worker, loop=self.loop)
+
+    async def _execute(self, cmd):
+        """
+        Run a single command on the turtle, which must already
+        be locked.
+        """
+        aioturtle = self.turtle
+        name, args = cmd.name, cmd.args
+        if name == 'forward':
+            end = aioturtle._position + aioturtle._orient * args[0]
+            await aioturtle._goto(end)
+        elif name == 'left':
+            await aioturtle._rotate(args[0])
+        elif name == 'goto':
+            x, y = args
+            end = turtle.Vec2D(*x) if y is None else turtle.Vec2D(x, y)
+            await aioturtle._goto(end)
+        elif name == 'setheading':
+            await aioturtle._rotate(aioturtle._heading_delta(args[0]))
+        elif name == 'circle':
+            await aioturtle._circle(*args)
+        else:
+            return getattr(aioturtle, name)(*args)
+
+    async def _run(self):
+        """
+        Worker draining the queue one merged batch at a time. Any
+        commands left when the worker is cancelled are cancelled.
+        """
+        commands = collections.deque()
+        try:
+            while self._queue:
+                batch = [
+                    cmd for cmd in self._queue if not cmd.futures[0].done()
+                ]
+                self._queue.clear()
+                commands.extend(merge_commands(batch))
+                with (await self.turtle._acquire('pipeline')):
+                    while commands:
+                        cmd = commands[0]
+                        self.executed += 1
+                        try:
+                            result = await self._execute(cmd)
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception as exc:
+                            _resolve(cmd.futures, exception=exc)
+                        else:
+                            _resolve(cmd.futures, result=result)
+                        commands.popleft()
+        finally:
+            for cmd in list(commands) + list(self._queue):
+                for future in cmd.futures:
+                    future.cancel()
+            self._queue.clear()
+            self._worker = None
+
+
+def _resolve(futures, result=None, exception=None):
+    """
+    Set the outcome of each future not already cancelled.
+    """
+    for future in futures:
+        if future.done():
+            continue
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+
+add_turtle_fcn_aliases(CommandPipeline)
@@ -0,0 +1,296 @@
+"""
+_raster_
+
+offscreen rasterization of turtle drawings into numpy arrays
+"""
+import array
+import collections
+import struct
+import zlib
+
+from .aioturtle import TurtleObserver
+from .colors import COLOR_NAMES
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# color of lines whose pen color is not known
+_FALLBACK_RGB = (0, 0, 0)
+
+# long segments are cut into pieces no longer than this many
+# pixels so that their bounding boxes stay small
+_PIECE = 8.0
+
+
+def color_rgb(color, screen=None):
+    """
+    Return the (red, green, blue) tuple of 0-255 integers for a
+    turtle color, which may be a #rgb to #rrrrggggbbbb hex string,
+    a tuple of three 0-255 values, or a color name. Names are looked
+    up in the X11 table Tk uses, or else by the Tk canvas of screen
+    if there is one. Unknown colors raise ValueError.
+    """
+    if isinstance(color, tuple):
+        return tuple(int(value) for value in color[:3])
+    name = color.replace(' ', '').lower()
+    digits = (len(name) - 1) // 3
+    if name.startswith('#') and 1 <= digits <= 4 and len(name) % 3 == 1:
+        try:
+            values = [
+                int(name[idx:idx + digits], 16)
+                for idx in range(1, len(name), digits)
+            ]
+        except ValueError:
+            raise ValueError('Unknown color {0!r}'.format(color))
+        top = 16 ** digits - 1
+        return tuple(value * 255 // top for value in values)
+    if name in COLOR_NAMES:
+        return COLOR_NAMES[name]
+    winfo_rgb = getattr(getattr(screen, 'cv', None), 'winfo_rgb', None)
+    if winfo_rgb is not None:
+        # only a Tk canvas has winfo_rgb, so tkinter is loaded
+        import tkinter
+        try:
+            return tuple(value // 256 for value in winfo_rgb(color))
+        except tkinter.TclError:
+            pass
+    raise ValueError('Unknown color {0!r}'.format(color))
+
+
+def _ranks(counts):
+    """
+    Given the sizes of consecutive groups, return the index of each
+    element within its group, as in [0, 1, 2, 0, 1] for [3, 2].
+    """
+    starts = np.cumsum(counts) - counts
+    return np.arange(counts.sum()) - np.repeat(starts, counts)
+
+
+def _png_chunk(tag, data):
+    return b''.join([
+        struct.pack('>I', len(data)), tag, data,
+        struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff),
+    ])
+
+
+def png_bytes(pixels, level=6):
+    """
+    Return an RGBA PNG file of the (height, width, 4) uint8 array
+    pixels, compressed at the given zlib level.
+    """
+    height, width = pixels.shape[:2]
+    rows = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(height, -1)
+    # 8 bit RGBA, no interlacing
+    header = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        _png_chunk(b'IHDR', header),
+        _png_chunk(b'IDAT', zlib.compress(rows.tobytes(), level)),
+        _png_chunk(b'IEND', b''),
+    ])
+
+
+class Rasterizer(TurtleObserver):
+    """
+    _Rasterizer_
+
+    Draws the lines of the attached turtles into the preallocated
+    numpy RGBA image pixels, of shape (height, width, 4), with
+    antialiasing and the turtles' pen sizes, and without any Tk
+    canvas. The image is placed as the canvas of a screen of the
+    same size would be.
+
+    Completed moves are queued as segments per pen color and
+    rasterized together once batch segments are pending or the
+    image is read, all segments of a batch being drawn by a few
+    vectorized array operations. Segments of one color in a batch
+    are drawn in one pass, so where lines of different colors
+    cross within a batch, the color queued first lies below.
+    Arbitrary segments, such as those of a TurtleSwarm, may be
+    queued with draw_segments.
+
+    Pen colors are resolved when the pen changes, and lines in a
+    color that is not known are drawn black, so that drawing never
+    fails in the middle of a move.
+    """
+    def __init__(self, width=400, height=300, bg='white', batch=1 << 14):
+        if np is None:
+            raise ImportError('Rasterizer requires numpy')
+        self.width = width
+        self.height = height
+        self.batch = batch
+        self.segments = 0
+        self.pixels = np.empty((height, width, 4), dtype=np.uint8)
+        self.pixels[:, :, :3] = color_rgb(bg)
+        self.pixels[:, :, 3] = 255
+        self._positions = {}
+        self._colors = {}
+        self._pending = collections.OrderedDict()
+        self._queued = 0
+
+    def attach(self, turt):
+        """
+        Start drawing the lines turt draws from now on.
+        """
+        self._positions[turt] = turt._position
+        self.pen_rgb(turt._pencolor, turt.screen)
+        super().attach(turt)
+
+    def detach(self):
+        """
+        Stop drawing the lines of all attached turtles.
+        """
+        for turt in self._positions:
+            if self in turt.observers:
+                turt.remove_observer(self)
+        self._positions.clear()
+
+    @property
+    def buffer(self):
+        """
+        A memoryview of the image, with all pending segments drawn.
+        """
+        self.flush()
+        return memoryview(self.pixels)
+
+    def pen_rgb(self, color, screen=None):
+        """
+        Return the (red, green, blue) tuple of the pen color color,
+        resolving each color once, as black if it is not known.
+        """
+        rgb = self._colors.get(color)
+        if rgb is None:
+            try:
+                rgb = color_rgb(color, screen)
+            except ValueError:
+                rgb = _FALLBACK_RGB
+            self._colors[color] = rgb
+        return rgb
+
+    def on_pen(self, turt):
+        self.pen_rgb(turt._pencolor, turt.screen)
+
+    def on_move(self, turt, points):
+        start = self._positions[turt]
+        self._positions[turt] = points[-1]
+        if not turt._drawing:
+            return
+        xscale, yscale = turt.screen.xscale, turt.screen.yscale
+        xmid, ymid = self.width * 0.5, self.height * 0.5
+        pending = self._pending.get(turt._pencolor)
+        if pending is None:
+            pending = self._pending[turt._pencolor] = (
+                array.array('d'), self.pen_rgb(turt._pencolor, turt.screen)
+            )
+        segments = pending[0]
+        x0, y0 = start[0] * xscale + xmid, ymid - start[1] * yscale
+        for x, y in points:
+            x1, y1 = x * xscale + xmid, ymid - y * yscale
+            segments.extend((x0, y0, x1, y1, turt._pensize))
+            x0, y0 = x1, y1
+        self._queued += len(points)
+        if self._queued >= self.batch:
+            self.flush()
+
+    def draw_segments(self, segments, color='black', width=1):
+        """
+        Draw an (n, 4) array of x0, y0, x1, y1 segments in turtle
+        coordinates, with pen size width, in a single batch. The
+        width may also be an array of one pen size per segment.
+        """
+        segments = np.asarray(segments, dtype=float).reshape(-1, 4)
+        pixel = np.empty((len(segments), 5))
+        pixel[:, 0:4:2] = segments[:, 0::2] + self.width * 0.5
+        pixel[:, 1:4:2] = self.height * 0.5 - segments[:, 1::2]
+        pixel[:, 4] = width
+        self.flush()
+        self._rasterize(pixel, self.pen_rgb(color))
+
+    def flush(self):
+        """
+        Rasterize every pending segment.
+        """
+        pending, self._pending = self._pending, collections.OrderedDict()
+        self._queued = 0
+        for segments, rgb in pending.values():
+            self._rasterize(
+                np.frombuffer(segments, dtype=float).reshape(-1, 5), rgb
+            )
+
+    def _rasterize(self, segments, rgb):
+        """
+        Draw the (n, 5) array of x0, y0, x1, y1, pensize segments in
+        pixel coordinates with the color rgb. Segments are cut into
+        short pieces, and the coverage of every pixel in the bounding
+        box of each piece is found from its distance to the piece.
+        Where pieces overlap, the largest coverage is used.
+        """
+        if not len(segments):
+            return
+        self.segments += len(segments)
+        x0, y0, x1, y1, pensize = segments.T
+        length = np.hypot(x1 - x0, y1 - y0)
+        pieces = np.maximum(np.ceil(length / _PIECE), 1).astype(np.intp)
+        seg = np.repeat(np.arange(len(segments)), pieces)
+        step = _ranks(pieces)
+        t0, t1 = step / pieces[seg], (step + 1) / pieces[seg]
+        dx, dy = (x1 - x0)[seg], (y1 - y0)[seg]
+        ax, ay = x0[seg] + dx * t0, y0[seg] + dy * t0
+        ex, ey = dx * (t1 - t0), dy * (t1 - t0)
+        radius = np.maximum(pensize[seg], 1.0) * 0.5
+
+        # pixel bounding boxes of the pieces, clipped to the image
+        reach = radius + 0.5
+        bx, by = ax + ex, ay + ey
+        left = np.clip(np.floor(np.minimum(ax, bx) - reach), 0, self.width)
+        right = np.clip(np.ceil(np.maximum(ax, bx) + reach), 0, self.width)
+        top = np.clip(np.floor(np.minimum(ay, by) - reach), 0, self.height)
+        bottom = np.clip(np.ceil(np.maximum(ay, by) + reach), 0, self.height)
+        box_width = (right - left).astype(np.intp)
+        area = box_width * (bottom - top).astype(np.intp)
+        piece = np.repeat(np.arange(len(area)), area)
+        if not len(piece):
+            return
+        local = _ranks(area)
+        box_width = box_width[piece]
+        px = left.astype(np.intp)[piece] + local % box_width
+        py = top.astype(np.intp)[piece] + local // box_width
+
+        # distance from each pixel center to its piece
+        cx, cy = px + 0.5 - ax[piece], py + 0.5 - ay[piece]
+        ex, ey = ex[piece], ey[piece]
+        lensq = ex * ex + ey * ey
+        t = np.clip(
+            (cx * ex + cy * ey) / np.where(lensq > 0, lensq, 1.0), 0.0, 1.0
+        )
+        dist = np.hypot(cx - t * ex, cy - t * ey)
+        coverage = np.clip(reach[piece] - dist, 0.0, 1.0)
+
+        # keep the largest coverage of each pixel, sorting pixel
+        # index and coverage quantized to 8 bits as a single key
+        level = np.rint(coverage * 255.0).astype(np.intp)
+        covered = level > 0
+        key = np.sort((py * self.width + px)[covered] * 256 + level[covered])
+        index = key >> 8
+        last = np.ones(len(key), dtype=bool)
+        last[:-1] = index[1:] != index[:-1]
+        index = index[last]
+        coverage = (key[last] & 255)[:, np.newaxis] / 255.0
+
+        flat = self.pixels.reshape(-1, 4)
+        blend = flat[index].astype(float)
+        blend[:, :3] += (np.array(rgb, dtype=float) - blend[:, :3]) * coverage
+        blend[:, 3:] += (255.0 - blend[:, 3:]) * coverage
+        flat[index] = np.rint(blend).astype(np.uint8)
+
+    def write_png(self, path, level=6):
+        """
+        Write the image to path as an RGBA PNG file, compressed at
+        the given zlib level.
+        """
+        self.flush()
+        with open(path, 'wb') as fh:
+            fh.write(png_bytes(self.pixels, level))
@@ -0,0 +1,283 @@
+"""
+_recording_
+
+compact binary recording and replay of turtle sessions
+"""
+import asyncio
+import mmap
+import struct
+import time
+
+from .aioturtle import BlockingTurtle, TurtleObserver, _vec2d
+from .registry import registry_for
+
+MAGIC = b'AIOTREC1'
+
+# type, flags, turtle, arg, time, x, y in 32 bytes
+_RECORD = struct.Struct('<BBHIddd')
+_HEADER = MAGIC.ljust(_RECORD.size, b'\0')
+
+NEW, STEP, MOVE, ROTATE, PEN, COLOR, FILL, STRING = range(1, 9)
+
+_NO_STRING = 0xffffffff
+_FLUSH_SIZE = 1 << 16
+
+
+class Recorder(TurtleObserver):
+    """
+    _Recorder_
+
+    Records everything drawn by the attached turtles to a log file
+    as fixed width binary records, 32 bytes each, buffered in
+    memory and written out in large blocks. Each record holds the
+    record type, the index of the turtle, an integer argument, the
+    time since recording began and two floats:
+
+    -   NEW: a turtle was attached, arg is the index of its name
+    -   STEP: an animation step reached position x, y
+    -   MOVE: a move completed at position x, y
+    -   ROTATE: a rotation completed at orientation x, y
+    -   PEN: arg is 1 if the pen is down and 2 if the turtle is
+        shown, or both, x is the pen size
+    -   COLOR: arg is the index of the pen color and x that of
+        the fill color
+    -   FILL: arg is 1 if a fill was begun, 0 if ended
+
+    Strings such as names and colors are written only once, as a
+    STRING record followed by the string itself padded to a whole
+    number of records, and are referred to by index afterwards.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.records = 0
+        self._file = open(path, 'wb')
+        self._buffer = bytearray(_HEADER)
+        self._turtles = {}
+        self._strings = {}
+        self._start = time.perf_counter()
+
+    def attach(self, turt):
+        """
+        Start recording turt, along with its current state.
+        """
+        index = len(self._turtles)
+        self._turtles[turt] = index
+        name = _NO_STRING if turt.name is None else self._string(turt.name)
+        self._write(NEW, index, name, 0.0, 0.0)
+        # move pen up to the start, then restore the actual pen
+        self._write(PEN, index, 0, turt._pensize, 0.0)
+        self.on_move(turt, (turt._position,))
+        self.on_rotate(turt)
+        self.on_pen(turt)
+        super().attach(turt)
+
+    def close(self):
+        """
+        Stop recording, detaching from all turtles, and write out
+        the rest of the log.
+        """
+        for turt in self._turtles:
+            if self in turt.observers:
+                turt.remove_observer(self)
+        self.flush()
+        self._file.close()
+
+    def flush(self):
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, kind, index, arg, x, y):
+        self._buffer += _RECORD.pack(
+            kind, 0, index, arg, time.perf_counter() - self._start, x, y
+        )
+        self.records += 1
+        if len(self._buffer) >= _FLUSH_SIZE:
+            self.flush()
+
+    def _string(self, value):
+        """
+        Return the index of string value, writing it to the log
+        the first time it is seen.
+        """
+        index = self._strings.get(value)
+        if index is None:
+            index = self._strings[value] = len(self._strings)
+            data = value.encode('utf-8')
+            self._write(STRING, 0, index, len(data), 0.0)
+            padding = -len(data) % _RECORD.size
+            self._buffer += data + b'\0' * padding
+        return index
+
+    def on_step(self, turt):
+        x, y = turt._position
+        self._write(STEP, self._turtles[turt], 0, x, y)
+
+    def on_move(self, turt, points):
+        index = self._turtles[turt]
+        for x, y in points:
+            self._write(MOVE, index, 0, x, y)
+
+    def on_rotate(self, turt):
+        x, y = turt._orient
+        self._write(ROTATE, self._turtles[turt], 0, x, y)
+
+    def on_pen(self, turt):
+        index = self._turtles[turt]
+        flags = (1 if turt._drawing else 0) | (2 if turt._shown else 0)
+        self._write(PEN, index, flags, turt._pensize, 0.0)
+        self._write(
+            COLOR, index, self._string(turt._pencolor),
+            self._string(turt._fillcolor), 0.0
+        )
+
+    def on_fill(self, turt, begin):
+        self._write(FILL, self._turtles[turt], 1 if begin else 0, 0.0, 0.0)
+
+
+class Replay:
+    """
+    _Replay_
+
+    Reads a log written by Recorder through a memory map and draws
+    it again onto a screen, either all at once with render or
+    animated in time with play. Replayed turtles are BlockingTurtles
+    created on the screen by each render or play, found in the
+    turtles attribute by their index in the log. They take their
+    recorded names, except where a turtle of that name is already
+    on the screen, as when a log is replayed onto the screen it was
+    recorded from; those are replayed unnamed.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.strings = []
+        self.turtles = []
+        with open(path, 'rb') as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError('{0} is not a turtle recording'.format(path))
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def records(self):
+        """
+        Iterate over the (type, turtle, arg, time, x, y) tuples of
+        every record in the log, except strings, which are collected
+        in the strings attribute as they are passed.
+        """
+        self.strings = []
+        buf = self._map
+        size = _RECORD.size
+        unpack_from = _RECORD.unpack_from
+        offset, end = size, len(buf) - len(buf) % size
+        while offset < end:
+            kind, _, index, arg, when, x, y = unpack_from(buf, offset)
+            offset += size
+            if kind == STRING:
+                length = int(x)
+                self.strings.append(
+                    buf[offset:offset + length].decode('utf-8')
+                )
+                offset += length + -length % size
+                continue
+            yield kind, index, arg, when, x, y
+
+    def render(self, screen):
+        """
+        Draw the whole log onto screen instantaneously. Moves are
+        collected into one polyline per turtle between pen changes,
+        and animation steps are skipped, so that a log is redrawn
+        at the speed of the canvas rather than that of the session.
+        """
+        self.turtles = []
+        tracing, delay = screen.tracer(), screen.delay()
+        screen.tracer(0)
+        pending = {}
+        try:
+            for kind, index, arg, _, x, y in self.records():
+                if kind == MOVE:
+                    pending.setdefault(index, []).append(_vec2d(x, y))
+                elif kind == ROTATE:
+                    self.turtles[index]._orient = _vec2d(x, y)
+                elif kind != STEP:
+                    points = pending.pop(index, None)
+                    if points:
+                        self.turtles[index]._polyline(points)
+                    self._apply(screen, kind, index, arg, x, y)
+            for index, points in pending.items():
+                self.turtles[index]._polyline(points)
+        finally:
+            screen.tracer(tracing, delay)
+        return self.turtles
+
+    async def play(self, screen, time_scale=1.0, loop=None):
+        """
+        Coroutine redrawing the log onto screen with the timing of
+        the recorded session, sped up by the factor time_scale.
+        Records due within a millisecond of each other are drawn
+        without waiting in between.
+        """
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self.turtles = []
+        begin = loop.time()
+        starts = {}
+        for kind, index, arg, when, x, y in self.records():
+            wait = begin + when / time_scale - loop.time()
+            if wait > 0.001:
+                await asyncio.sleep(wait, loop=loop)
+            if kind == STEP:
+                pet = self.turtles[index]
+                start = starts.setdefault(index, pet._position)
+                pet._position = _vec2d(x, y)
+                if pet._drawing:
+                    screen._drawline(
+                        pet.drawingLineItem, (start, pet._position),
+                        pet._pencolor, pet._pensize, True
+                    )
+                pet._update_graphics()
+            elif kind == MOVE:
+                starts.pop(index, None)
+                self.turtles[index]._finalize_move(_vec2d(x, y))
+            elif kind == ROTATE:
+                self.turtles[index]._finalize_rotation(_vec2d(x, y))
+            else:
+                self._apply(screen, kind, index, arg, x, y)
+        return self.turtles
+
+    def _apply(self, screen, kind, index, arg, x, y):
+        """
+        Replay a record other than a move or rotation.
+        """
+        if kind == NEW:
+            name = None if arg == _NO_STRING else self.strings[arg]
+            if name in registry_for(screen):
+                name = None
+            self.turtles.append(BlockingTurtle(name=name, screen=screen))
+        elif kind == PEN:
+            self.turtles[index].pen(
+                pendown=bool(arg & 1), shown=bool(arg & 2), pensize=x
+            )
+        elif kind == COLOR:
+            self.turtles[index].pen(
+                pencolor=self.strings[arg], fillcolor=self.strings[int(x)]
+            )
+        elif kind == FILL:
+            if arg:
+                self.turtles[index].begin_fill()
+            else:
+                self.turtles[index].end_fill()
@@ -0,0 +1,104 @@
+"""
+_refresh_
+
+coalesced screen refreshes for many animated turtles
+"""
+import asyncio
+import collections
+import threading
+import time
+
+from .tracing import trace_log
+
+
+class RefreshBatcher:
+    """
+    _RefreshBatcher_
+
+    Batched refresh mode for a screen. Creating a RefreshBatcher
+    attaches it to the screen, after which turtles that would
+    otherwise redraw themselves and refresh the canvas on every
+    step only mark themselves dirty. A single flush per frame then
+    redraws the dirty turtles and refreshes the canvas once.
+
+    Flushes are scheduled with call_soon as soon as a turtle is
+    marked, so all turtles stepped in the same pass of the event
+    loop share one refresh. A FrameClock on the same screen
+    flushes at the end of every tick, and keep_refreshed flushes
+    whenever it runs.
+
+    Turtles marked from a thread other than the one which creates
+    the batcher and runs the event loop, such as BlockingTurtles
+    driven through a CanvasMarshaller, are appended to a deque and
+    the loop is woken with call_soon_threadsafe, so that they are
+    only ever redrawn on the loop thread.
+    """
+    def __init__(self, screen, loop=None):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self.loop = loop
+        self.screen = screen
+        self.thread = threading.get_ident()
+        self.frames = 0
+        self._dirty = collections.OrderedDict()
+        self._handle = None
+        self._marked = collections.deque()
+        self._woken = False
+        screen.refresh_batcher = self
+
+    def mark(self, turtle):
+        """
+        Mark a turtle as needing to be redrawn in the next flush.
+        """
+        if threading.get_ident() != self.thread:
+            self._marked.append(turtle)
+            if not self._woken:
+                self._woken = True
+                self.loop.call_soon_threadsafe(self.flush)
+            return
+        self._dirty[turtle] = None
+        if self._handle is None:
+            self._handle = self.loop.call_soon(self.flush)
+
+    def mark_all(self):
+        """
+        Mark every turtle on the screen as needing to be redrawn,
+        as in a tracer update.
+        """
+        for turt in self.screen.turtles():
+            self.mark(turt)
+
+    def flush(self):
+        """
+        Redraw all dirty turtles and refresh the canvas once.
+        """
+        begin = time.perf_counter()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._woken = False
+        marked = self._marked
+        while marked:
+            self._dirty[marked.popleft()] = None
+        dirty = self._dirty
+        self._dirty = collections.OrderedDict()
+        if self.screen._tracing != 0:
+            for turt in dirty:
+                turt._drawturtle()
+        self.screen._update()
+        self.frames += 1
+        controller = getattr(self.screen, 'detail_controller', None)
+        if controller is not None:
+            controller.refreshed(time.perf_counter() - begin)
+        if trace_log.enabled:
+            trace_log.complete(
+                'flush', 'canvas', begin, time.perf_counter(), 'refresh'
+            )
+
+    def close(self):
+        """
+        Flush any pending redraws and detach from the screen.
+        """
+        self.flush()
+        if getattr(self.screen, 'refresh_batcher', None) is self:
+            del self.screen.refresh_batcher
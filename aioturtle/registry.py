@@ -0,0 +1,145 @@
+"""
+_registry_
+
+index of the named turtles on a screen
+"""
+import collections
+import fnmatch
+import re
+
+_GLOB_CHARS = re.compile(r'[*?[]')
+
+
+class TurtleRegistry:
+    """
+    _TurtleRegistry_
+
+    Index of the named turtles of one screen by name and by group
+    tags, kept up to date by AioBaseTurtle as turtles are created,
+    tagged and removed. Lookups by name and group are dictionary
+    lookups rather than scans of every turtle on the screen.
+
+    Names are unique within a screen and should not be changed once
+    a turtle is created. Unnamed turtles are not indexed. Turtles
+    the screen drops when it is cleared are dropped from the index
+    the next time the registry of the screen is looked up.
+    """
+    def __init__(self):
+        self._names = {}
+        self._groups = {}
+        self._tags = {}
+        self._turtles = None
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __iter__(self):
+        return iter(self._names.values())
+
+    def check(self, name):
+        """
+        Raise ValueError if a turtle named name is already indexed.
+        """
+        if name is not None and name in self._names:
+            raise ValueError('Turtle {0} already exists.'.format(name))
+
+    def add(self, turt):
+        self.check(turt.name)
+        if turt.name is not None:
+            self._names[turt.name] = turt
+
+    def remove(self, turt):
+        """
+        Remove turt and all its tags from the index.
+        """
+        if self._names.get(turt.name) is turt:
+            del self._names[turt.name]
+        for group in self._tags.pop(turt, ()):
+            self._untag(turt, group)
+
+    def sync(self, turtles):
+        """
+        Follow turtles, the list of turtles of the screen, removing
+        the indexed turtles that are not in it if it is a different
+        list than last time, as after the screen was cleared.
+        """
+        if turtles is self._turtles:
+            return
+        self._turtles = turtles
+        live = set(turtles)
+        for turt in set(self._names.values()) | set(self._tags):
+            if turt not in live:
+                self.remove(turt)
+
+    def get(self, name):
+        """
+        Return the turtle named name, raising KeyError if there is
+        none.
+        """
+        return self._names[name]
+
+    def tag(self, turt, group):
+        """
+        Add turt to the group named group.
+        """
+        self._groups.setdefault(group, collections.OrderedDict())[turt] = None
+        self._tags.setdefault(turt, set()).add(group)
+
+    def untag(self, turt, group):
+        """
+        Remove turt from the group named group.
+        """
+        tags = self._tags.get(turt)
+        if tags is not None and group in tags:
+            tags.discard(group)
+            self._untag(turt, group)
+
+    def _untag(self, turt, group):
+        members = self._groups[group]
+        del members[turt]
+        if not members:
+            del self._groups[group]
+
+    def tags(self, turt):
+        return set(self._tags.get(turt, ()))
+
+    def group(self, group):
+        """
+        Return the turtles tagged with group, in tagging order.
+        """
+        return list(self._groups.get(group, ()))
+
+    def select(self, pattern):
+        """
+        Return the turtles addressed by pattern: the members of a
+        group if pattern is @group, the turtles whose names match
+        pattern if it is a glob pattern, or else the turtle named
+        pattern. Raises KeyError if no turtle is addressed.
+        """
+        if pattern.startswith('@'):
+            turtles = self.group(pattern[1:])
+        elif _GLOB_CHARS.search(pattern):
+            turtles = [
+                self._names[name]
+                for name in fnmatch.filter(self._names, pattern)
+            ]
+        else:
+            turtles = [self._names[pattern]]
+        if not turtles:
+            raise KeyError(pattern)
+        return turtles
+
+
+def registry_for(screen):
+    """
+    Return the TurtleRegistry of screen, creating it if needed,
+    in step with the turtles on the screen.
+    """
+    registry = getattr(screen, 'turtle_registry', None)
+    if registry is None:
+        registry = screen.turtle_registry = TurtleRegistry()
+    registry.sync(screen._turtles)
+    return registry
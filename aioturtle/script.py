@@ -0,0 +1,267 @@
+"""
+_script_
+
+non-interactive runner for files of TurtlePrompt commands
+"""
+import argparse
+import asyncio
+import collections
+import re
+import sys
+import turtle
+
+from .aioturtle import AsyncTurtle, TurtleCommands
+from .headless import HeadlessScreen
+from .virtualtime import VirtualClockEventLoop
+
+_INT = re.compile(r'[-+]?\d+$')
+_FLOAT = re.compile(r'[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$')
+
+# commands which apply to the whole screen rather than one turtle
+_SCREEN_COMMANDS = ('help', 'list', 'stats', 'trace')
+
+
+def parse_arg(token):
+    """
+    Convert a command argument to an int or a float if it looks
+    like one, leaving any other string unchanged.
+    """
+    if _INT.match(token):
+        return int(token)
+    if _FLOAT.match(token):
+        return float(token)
+    return token
+
+
+def _statements(source):
+    """
+    Yield the line number and words of every command in source,
+    up to the first quit.
+    """
+    for lineno, line in enumerate(source.splitlines(), 1):
+        for text in line.split('#', 1)[0].split(';'):
+            words = text.split()
+            if words == ['quit']:
+                return
+            if words:
+                yield lineno, words
+
+
+class ScriptError(ValueError):
+    """
+    A script command could not be compiled or failed to run.
+    """
+    def __init__(self, lineno, message):
+        super().__init__('line {0}: {1}'.format(lineno, message))
+        self.lineno = lineno
+
+
+class Command:
+    """
+    A compiled turtle command: the turtle slot it applies to, the
+    AsyncTurtle function to call and its already converted args.
+    The function of a new command is None.
+    """
+    __slots__ = ('lineno', 'slot', 'function', 'args', 'coroutine')
+
+    def __init__(self, lineno, slot, function, args):
+        self.lineno = lineno
+        self.slot = slot
+        self.function = function
+        self.args = args
+        self.coroutine = asyncio.iscoroutinefunction(function)
+
+
+class Script:
+    """
+    _Script_
+
+    A file of TurtlePrompt commands compiled up front. Turtle names
+    are resolved to slots in a table of turtles, methods to
+    AsyncTurtle functions and arguments to numbers, so that any
+    error is reported before anything runs and nothing is parsed
+    while running. A name must be created by a new command before
+    its first use, or name a turtle already on the screen when the
+    script is run.
+
+    The commands are split into phases at each screen command such
+    as stats. Within a phase the commands of each turtle form a
+    program run in order, and the programs of different turtles
+    run concurrently. Lines may hold several commands separated by
+    semicolons, and anything after a # is a comment.
+    """
+    def __init__(self, source):
+        self.names = []
+        self.lines = []
+        self.phases = []
+        self._created = set()
+        slots = {}
+        programs = collections.OrderedDict()
+        for lineno, words in _statements(source):
+            if words[0] in _SCREEN_COMMANDS:
+                self.phases.append((programs, ' '.join(words)))
+                programs = collections.OrderedDict()
+                continue
+            if words[0] == 'new':
+                if len(words) != 2 or words[1] in self._created:
+                    raise ScriptError(lineno, 'invalid new command')
+                name, function = words[1], None
+                if name in slots:
+                    raise ScriptError(
+                        self.lines[slots[name]],
+                        'turtle {0} used before new on line {1}'
+                        .format(name, lineno)
+                    )
+                self._created.add(name)
+            elif len(words) < 2:
+                raise ScriptError(lineno, 'missing command')
+            else:
+                name = words[0]
+                function = getattr(AsyncTurtle, words[1], None)
+                if not callable(function) or words[1].startswith('_'):
+                    raise ScriptError(
+                        lineno, 'unknown command {0}'.format(words[1])
+                    )
+            slot = slots.get(name)
+            if slot is None:
+                slot = slots[name] = len(self.names)
+                self.names.append(name)
+                self.lines.append(lineno)
+            args = tuple(parse_arg(word) for word in words[2:])
+            programs.setdefault(slot, []).append(
+                Command(lineno, slot, function, args)
+            )
+        self.phases.append((programs, None))
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as fh:
+            return cls(fh.read())
+
+    def __len__(self):
+        return sum(
+            len(program)
+            for programs, _ in self.phases
+            for program in programs.values()
+        )
+
+    async def run(self, screen, loop=None, concurrency=None, output=print):
+        """
+        Run the script on screen, with at most concurrency turtle
+        programs running at once if given. Turtles not created by
+        the script must already be on the screen. Results of turtle
+        functions and screen commands are passed to output.
+        """
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        commands = TurtleCommands(screen, loop=loop)
+        turtles = []
+        for name, lineno in zip(self.names, self.lines):
+            if name in self._created:
+                turtles.append(None)
+                continue
+            try:
+                turtles.append(commands.get_turtle(name))
+            except Exception:
+                raise ScriptError(
+                    lineno, 'unknown turtle {0}'.format(name)
+                )
+        limit = None
+        if concurrency:
+            limit = asyncio.Semaphore(concurrency, loop=loop)
+
+        async def run_program(program):
+            if limit is None:
+                await self._run_program(program, turtles, screen, loop, output)
+                return
+            with (await limit):
+                await self._run_program(program, turtles, screen, loop, output)
+
+        for programs, screen_command in self.phases:
+            if programs:
+                tasks = [
+                    asyncio.ensure_future(run_program(program), loop=loop)
+                    for program in programs.values()
+                ]
+                try:
+                    await asyncio.gather(*tasks, loop=loop)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+            if screen_command is not None:
+                result = commands.execute(screen_command)
+                if result is not None:
+                    output(result)
+
+    async def _run_program(self, program, turtles, screen, loop, output):
+        """
+        Run the commands of one turtle in order.
+        """
+        for cmd in program:
+            try:
+                if cmd.function is None:
+                    turtles[cmd.slot] = AsyncTurtle(
+                        name=self.names[cmd.slot], screen=screen, loop=loop
+                    )
+                elif cmd.coroutine:
+                    await cmd.function(turtles[cmd.slot], *cmd.args)
+                else:
+                    result = cmd.function(turtles[cmd.slot], *cmd.args)
+                    if result is not None:
+                        output(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                raise ScriptError(cmd.lineno, e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m aioturtle run',
+        description='Run a file of TurtlePrompt commands'
+    )
+    parser.add_argument('script', help='file of commands')
+    parser.add_argument(
+        '--concurrency', type=int, default=None,
+        help='run at most this many turtle programs at once'
+    )
+    parser.add_argument(
+        '--no-animate', action='store_true',
+        help='draw every move instantly and refresh only at the end'
+    )
+    parser.add_argument(
+        '--headless', action='store_true',
+        help='draw on an in-memory screen without a display'
+    )
+    parser.add_argument(
+        '--fast-forward', action='store_true',
+        help='animate on a simulated clock, without waiting between steps'
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        script = Script.from_file(args.script)
+    except (OSError, ScriptError) as e:
+        parser.exit(2, '{0}\n'.format(e))
+
+    if args.fast_forward:
+        loop = VirtualClockEventLoop()
+        asyncio.set_event_loop(loop)
+    else:
+        loop = asyncio.get_event_loop()
+    screen = HeadlessScreen() if args.headless else turtle.Screen()
+    if args.no_animate:
+        screen.tracer(0)
+    try:
+        loop.run_until_complete(
+            script.run(screen, loop=loop, concurrency=args.concurrency)
+        )
+    except ScriptError as e:
+        parser.exit(1, '{0}\n'.format(e))
+    screen.update()
+    if not args.headless:
+        screen.mainloop()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
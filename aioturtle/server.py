@@ -0,0 +1,227 @@
+"""
+_server_
+
+asyncio network server exposing the TurtlePrompt commands
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import sys
+import turtle
+
+from .aioturtle import TurtleCommands, keep_responsive
+
+_REPLY_OK = b'ok\n'
+
+
+class PromptSession:
+    """
+    _PromptSession_
+
+    State of a single client connection. Command lines read from
+    the client are put on a bounded queue and executed in order by
+    a worker task, so that a client sending faster than its
+    commands are executed stops being read until the queue drains.
+    The worker waits for each reply to be taken up by the transport
+    before executing the next command, so a client that does not
+    read its replies stops being served as well.
+    """
+    def __init__(self, server, reader, writer, session_id):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.id = session_id
+        self.commands = 0
+        self.errors = 0
+        self.closing = False
+        self.queue = asyncio.Queue(
+            maxsize=server.max_queue, loop=server.loop
+        )
+
+    async def run(self):
+        """
+        Read command lines until the client disconnects. A line may
+        hold several commands separated by semicolons, each of which
+        gets its own reply.
+        """
+        worker = asyncio.ensure_future(self._work(), loop=self.server.loop)
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                for command in line.decode('utf-8', 'replace').split(';'):
+                    await self.queue.put(command)
+            await self.queue.put(None)
+            await worker
+        finally:
+            worker.cancel()
+            self.writer.close()
+
+    async def _work(self):
+        """
+        Execute queued commands in order until the reader is done.
+        Once the session is closing, by quit or by a lost connection,
+        the remaining commands are discarded.
+        """
+        while True:
+            command = await self.queue.get()
+            if command is None:
+                return
+            if self.closing:
+                continue
+            try:
+                self._reply(command)
+                await self.writer.drain()
+            except ConnectionError as e:
+                logging.debug('Session {0}: {1}'.format(self.id, e))
+                self.close()
+
+    def _reply(self, command):
+        """
+        Execute command and write its reply: zero or more output
+        lines starting with "= " followed by a line "ok", or a line
+        "! " with the error.
+        """
+        if command.split()[:1] == ['quit']:
+            self.writer.write(_REPLY_OK)
+            self.close()
+            return
+        self.commands += 1
+        try:
+            output = self.server.commands.execute(command)
+        except Exception as e:
+            self.errors += 1
+            self.writer.write('! {0}\n'.format(e).encode('utf-8'))
+            return
+        if output is not None:
+            self.writer.write(''.join(
+                '= {0}\n'.format(line) for line in output.splitlines()
+            ).encode('utf-8'))
+        self.writer.write(_REPLY_OK)
+
+    def close(self):
+        """
+        Close the connection once the replies written so far are
+        sent, which ends the session.
+        """
+        self.closing = True
+        self.writer.close()
+
+
+class PromptServer:
+    """
+    _PromptServer_
+
+    Serves the TurtlePrompt command grammar to any number of
+    clients over TCP or a Unix socket, all of them driving the
+    turtles of one shared screen. Each connection is handled by a
+    PromptSession with a queue of at most max_queue commands.
+
+    The protocol is line based. Every command line sent gets a
+    reply ending in a line "ok" or "! error", so clients may send
+    many commands at once and match up the replies afterwards.
+    """
+    def __init__(self, screen=None, loop=None, max_queue=64):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        if screen is None:
+            if turtle.Turtle._screen is None:
+                turtle.Turtle._screen = turtle.Screen()
+            screen = turtle.Turtle._screen
+        self.loop = loop
+        self.screen = screen
+        self.max_queue = max_queue
+        self.commands = TurtleCommands(screen, loop=loop)
+        self.sessions = {}
+        self.servers = []
+        self.refresher = None
+        self._ids = itertools.count(1)
+        self._handlers = set()
+
+    async def start(self, host='127.0.0.1', port=0):
+        """
+        Listen on a TCP port, returning the asyncio server. A port
+        of 0 picks any free port.
+        """
+        server = await asyncio.start_server(
+            self._connected, host, port, loop=self.loop
+        )
+        self._started(server)
+        return server
+
+    async def start_unix(self, path):
+        """
+        Listen on a Unix socket at path, returning the asyncio server.
+        """
+        server = await asyncio.start_unix_server(
+            self._connected, path, loop=self.loop
+        )
+        self._started(server)
+        return server
+
+    def _started(self, server):
+        self.servers.append(server)
+        if self.refresher is None:
+            self.refresher = asyncio.ensure_future(
+                keep_responsive(self.screen, loop=self.loop), loop=self.loop
+            )
+
+    async def close(self):
+        """
+        Stop listening, close every session and wait for the
+        servers and sessions to finish.
+        """
+        for server in self.servers:
+            server.close()
+        for server in self.servers:
+            await server.wait_closed()
+        self.servers = []
+        for session in self.sessions.values():
+            session.close()
+        if self._handlers:
+            await asyncio.wait(self._handlers, loop=self.loop)
+        if self.refresher is not None:
+            self.refresher.cancel()
+            self.refresher = None
+
+    async def _connected(self, reader, writer):
+        session = PromptSession(self, reader, writer, next(self._ids))
+        handler = asyncio.Task.current_task(loop=self.loop)
+        self.sessions[session.id] = session
+        self._handlers.add(handler)
+        logging.debug('Session {0} connected'.format(session.id))
+        try:
+            await session.run()
+        except ConnectionError as e:
+            logging.debug('Session {0}: {1}'.format(session.id, e))
+        finally:
+            del self.sessions[session.id]
+            self._handlers.discard(handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='aioturtle prompt server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7878)
+    parser.add_argument('--unix', help='listen on this Unix socket path')
+    parser.add_argument('--max-queue', type=int, default=64)
+    args = parser.parse_args(argv)
+
+    loop = asyncio.get_event_loop()
+    server = PromptServer(loop=loop, max_queue=args.max_queue)
+    if args.unix:
+        loop.run_until_complete(server.start_unix(args.unix))
+    else:
+        loop.run_until_complete(server.start(args.host, args.port))
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(server.close())
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,266 @@
+"""
+_spatial_
+
+grid index of turtle positions for neighbor and collision queries
+"""
+import asyncio
+import heapq
+import math
+
+from .aioturtle import TurtleObserver
+
+
+class SpatialIndex(TurtleObserver):
+    """
+    _SpatialIndex_
+
+    Spatial hash of the turtles on a screen, bucketing each turtle
+    by the square grid cell of side cell_size holding its position.
+    Creating a SpatialIndex attaches it to the screen and to every
+    turtle on it, and turtles created on the screen afterwards are
+    attached as they are created. The index observes each step and
+    move of its turtles, so it stays current at the cost of a
+    dictionary lookup per step, and queries only look at the cells
+    near the point of interest rather than at every turtle.
+
+    If collision_radius is given, turtles coming within that
+    distance of each other are reported once per contact, to the
+    callbacks added with on_collision and to the coroutines
+    awaiting collision.
+    """
+    def __init__(self, screen, cell_size=50.0, collision_radius=None,
+                 loop=None):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self.loop = loop
+        self.screen = screen
+        self.cell_size = float(cell_size)
+        self.collision_radius = collision_radius
+        self.collisions = 0
+        self._cells = {}
+        self._keys = {}
+        self._contacts = {}
+        self._callbacks = []
+        self._waiters = []
+        screen.spatial_index = self
+        self.attach_screen(screen)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, turt):
+        return turt in self._keys
+
+    def attach(self, turt):
+        """
+        Start indexing turt at its current position.
+        """
+        if turt in self._keys:
+            return
+        self._keys[turt] = None
+        super().attach(turt)
+        self.update(turt)
+
+    def detach(self, turt):
+        """
+        Stop indexing turt, ending all its contacts.
+        """
+        if turt not in self._keys:
+            return
+        key = self._keys.pop(turt)
+        self._discard(turt, key)
+        for other in self._contacts.pop(turt, ()):
+            self._contacts[other].discard(turt)
+        if self in turt.observers:
+            turt.remove_observer(self)
+
+    def close(self):
+        """
+        Detach from every turtle and from the screen, cancelling
+        any pending collision waits.
+        """
+        for turt in list(self._keys):
+            self.detach(turt)
+        for _, future in self._waiters:
+            future.cancel()
+        self._waiters = []
+        if getattr(self.screen, 'spatial_index', None) is self:
+            del self.screen.spatial_index
+
+    def _key(self, x, y):
+        size = self.cell_size
+        return int(math.floor(x / size)), int(math.floor(y / size))
+
+    def _discard(self, turt, key):
+        if key is None:
+            return
+        cell = self._cells[key]
+        cell.discard(turt)
+        if not cell:
+            del self._cells[key]
+
+    def update(self, turt):
+        """
+        Move turt to the cell of its current position, checking for
+        new contacts if collisions are being tracked.
+        """
+        key = self._key(*turt._position)
+        old = self._keys[turt]
+        if key != old:
+            self._discard(turt, old)
+            self._cells.setdefault(key, set()).add(turt)
+            self._keys[turt] = key
+        if self.collision_radius is not None:
+            self._check_contacts(turt)
+
+    def on_step(self, turt):
+        self.update(turt)
+
+    def on_move(self, turt, points):
+        self.update(turt)
+
+    def _point(self, target):
+        """
+        Return the position of target, a turtle or a point, and
+        the turtle to leave out of the results if any.
+        """
+        position = getattr(target, '_position', None)
+        if position is None:
+            return tuple(target), None
+        return position, target
+
+    def _candidates(self, x, y, rings):
+        """
+        Yield the turtles in the cells at most rings cells away
+        from the cell of x, y, in both directions.
+        """
+        cx, cy = self._key(x, y)
+        cells = self._cells
+        for i in range(cx - rings, cx + rings + 1):
+            for j in range(cy - rings, cy + rings + 1):
+                cell = cells.get((i, j))
+                if cell:
+                    yield from cell
+
+    def _ring(self, x, y, ring):
+        """
+        Yield the turtles in the cells exactly ring cells away
+        from the cell of x, y.
+        """
+        if ring == 0:
+            yield from self._candidates(x, y, 0)
+            return
+        cx, cy = self._key(x, y)
+        cells = self._cells
+        for i in range(cx - ring, cx + ring + 1):
+            for j in (cy - ring, cy + ring):
+                yield from cells.get((i, j), ())
+        for j in range(cy - ring + 1, cy + ring):
+            for i in (cx - ring, cx + ring):
+                yield from cells.get((i, j), ())
+
+    def neighbors(self, target, radius):
+        """
+        Return the turtles within radius of target, a turtle or a
+        point, nearest first. A turtle is not its own neighbor.
+        """
+        (x, y), exclude = self._point(target)
+        rings = int(math.ceil(radius / self.cell_size))
+        limit = radius * radius
+        found = []
+        for turt in self._candidates(x, y, rings):
+            if turt is exclude:
+                continue
+            px, py = turt._position
+            dsq = (px - x) ** 2 + (py - y) ** 2
+            if dsq <= limit:
+                found.append((dsq, id(turt), turt))
+        found.sort()
+        return [turt for _, _, turt in found]
+
+    def nearest(self, target, k=1):
+        """
+        Return the k turtles nearest to target, a turtle or a
+        point, nearest first, searching rings of cells outward
+        until no closer turtle can remain.
+        """
+        (x, y), exclude = self._point(target)
+        total = len(self._keys) - (exclude in self._keys)
+        k = min(k, total)
+        if k <= 0:
+            return []
+        found = []
+        seen = 0
+        ring = 0
+        while True:
+            for turt in self._ring(x, y, ring):
+                if turt is exclude:
+                    continue
+                seen += 1
+                px, py = turt._position
+                dsq = (px - x) ** 2 + (py - y) ** 2
+                found.append((dsq, id(turt), turt))
+            # no turtle outside the rings searched so far is nearer
+            # than ring whole cells to the point
+            if len(found) >= k:
+                best = heapq.nsmallest(k, found)
+                reach = ring * self.cell_size
+                if seen == total or best[-1][0] <= reach * reach:
+                    return [turt for _, _, turt in best]
+            ring += 1
+
+    def on_collision(self, callback):
+        """
+        Call callback with the two turtles whenever a turtle moves
+        to within the collision radius of another.
+        """
+        self._callbacks.append(callback)
+
+    def remove_collision_callback(self, callback):
+        self._callbacks.remove(callback)
+
+    def collision(self, turt=None):
+        """
+        Return a future resolved with the next pair of colliding
+        turtles, or with the next pair involving turt if given.
+        """
+        future = self.loop.create_future()
+        self._waiters.append((turt, future))
+        return future
+
+    def contacts(self, turt):
+        """
+        Return the set of turtles currently in contact with turt.
+        """
+        return set(self._contacts.get(turt, ()))
+
+    def _check_contacts(self, turt):
+        """
+        Update the contacts of turt after it moved, reporting each
+        turtle it newly touches.
+        """
+        current = set(self.neighbors(turt, self.collision_radius))
+        old = self._contacts.get(turt, set())
+        for other in old - current:
+            self._contacts[other].discard(turt)
+        for other in current:
+            self._contacts.setdefault(other, set()).add(turt)
+        self._contacts[turt] = current
+        for other in current - old:
+            self._collide(turt, other)
+
+    def _collide(self, turt, other):
+        self.collisions += 1
+        for callback in list(self._callbacks):
+            callback(turt, other)
+        if not self._waiters:
+            return
+        waiting = []
+        for watched, future in self._waiters:
+            if future.done():
+                continue
+            if watched is None or watched is turt or watched is other:
+                future.set_result((turt, other))
+            else:
+                waiting.append((watched, future))
+        self._waiters = waiting
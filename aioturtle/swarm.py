@@ -0,0 +1,521 @@
+"""
+_swarm_
+
+vectorized movement of many turtles at once using numpy
+"""
+import asyncio
+import base64
+
+from .aioturtle import add_turtle_fcn_aliases
+from .raster import Rasterizer, color_rgb, png_bytes
+from .tkloop import tk_app
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TurtleSwarm:
+    """
+    _TurtleSwarm_
+
+    A flock of turtles whose positions, orientations, speeds and
+    pen state are stored in numpy arrays rather than in one
+    AsyncTurtle object each. The movement coroutines mirror those
+    of AsyncTurtle and apply to the whole swarm, or to the subset
+    selected by an optional mask given either as a boolean array
+    or as an array of indices. Distances, angles, radii and
+    targets may be scalars or arrays with one entry per selected
+    turtle.
+
+    The step calculations of AioBaseTurtle are carried out for all
+    selected turtles at once, and an animated move takes as many
+    frames as the slowest turtle needs, each frame being a single
+    sleep and a handful of array operations no matter how large
+    the swarm is. Turtles that need fewer steps simply stop early.
+
+    Headings are in standard mode degrees, counterclockwise from
+    east. The last max_segments line segments drawn while the pen
+    was down are kept in the segments array. On a screen, the lines
+    and the turtles of the whole swarm are drawn as a single image
+    item, redrawn once per frame.
+    """
+    def __init__(self, count, screen=None, loop=None, speed=3, delay=10,
+                 max_segments=1 << 20):
+        if np is None:
+            raise ImportError('TurtleSwarm requires numpy')
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self.loop = loop
+        self.lock = asyncio.Lock(loop=self.loop)
+        self.screen = screen
+        self.delay = delay
+        self.count = count
+        self.positions = np.zeros((count, 2))
+        self.orients = np.zeros((count, 2))
+        self.orients[:, 0] = 1.0
+        self.speeds = np.full(count, float(speed))
+        self.drawing = np.ones(count, dtype=bool)
+        self.pensizes = np.ones(count)
+        self.colors = np.zeros((count, 3), dtype=np.uint8)
+        self.max_segments = max_segments
+        self._segments = []
+        self._kept = 0
+        self._layer = None if screen is None else _SwarmLayer(screen)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def animated(self):
+        """
+        True if moves should be animated, False if the screen is
+        not being traced.
+        """
+        return self.screen is None or self.screen._tracing == 1
+
+    @property
+    def step_time(self):
+        """
+        The time in seconds between animated frames, following the
+        screen delay if the swarm is on a screen.
+        """
+        if self.screen is not None:
+            return self.screen._delayvalue * 0.001
+        return self.delay * 0.001
+
+    @property
+    def segments(self):
+        """
+        Array of the last max_segments line segments drawn, one row
+        of (x0, y0, x1, y1) per segment.
+        """
+        if not self._segments:
+            return np.zeros((0, 4))
+        if len(self._segments) > 1:
+            self._segments = [
+                np.concatenate(self._segments)[-self.max_segments:]
+            ]
+            self._kept = len(self._segments[0])
+        return self._segments[0][-self.max_segments:]
+
+    def _keep(self, segments):
+        """
+        Add segments to the segments array, dropping the oldest
+        once it holds twice max_segments.
+        """
+        self._segments.append(segments)
+        self._kept += len(segments)
+        if self._kept > 2 * self.max_segments:
+            self.segments
+
+    def _select(self, mask):
+        """
+        Convert a mask into an array of turtle indices.
+        """
+        if mask is None:
+            return np.arange(self.count)
+        mask = np.asarray(mask)
+        if mask.dtype == bool:
+            return np.flatnonzero(mask)
+        return mask.astype(int)
+
+    def pos(self):
+        return self.positions.copy()
+
+    def heading(self):
+        """
+        Return an array of the turtle headings in degrees.
+        """
+        angles = np.degrees(
+            np.arctan2(self.orients[:, 1], self.orients[:, 0])
+        )
+        return np.round(angles, 10) % 360.0
+
+    def speed(self, speed, mask=None):
+        self.speeds[self._select(mask)] = speed
+
+    def penup(self, mask=None):
+        self.drawing[self._select(mask)] = False
+
+    def pendown(self, mask=None):
+        self.drawing[self._select(mask)] = True
+
+    def isdown(self):
+        return self.drawing.copy()
+
+    def pensize(self, width, mask=None):
+        self.pensizes[self._select(mask)] = width
+
+    def pencolor(self, color, mask=None):
+        """
+        Set the pen color of the selected turtles to color, a Tk
+        color name, a hex string or an (r, g, b) tuple of 0-255
+        values, or to the rows of an (n, 3) array of 0-255 values,
+        one per selected turtle.
+        """
+        if isinstance(color, (str, tuple)):
+            color = color_rgb(color, self.screen)
+        self.colors[self._select(mask)] = color
+
+    def _calc_move(self, idx, endpoints):
+        """
+        Vectorized AioBaseTurtle._calc_move for the turtles idx,
+        returning arrays of step counts and step deltas.
+        """
+        speeds = self.speeds[idx]
+        speeds = np.where(speeds > 0, speeds, 1e9)
+        diff = endpoints - self.positions[idx]
+        if self.screen is not None:
+            scale = np.array([self.screen.xscale, self.screen.yscale])
+        else:
+            scale = 1.0
+        dist = np.hypot(*(diff * scale).T)
+        steps = np.maximum(1, (dist / speeds).astype(int))
+        delta = diff / steps[:, None]
+        return steps, delta
+
+    def _calc_rotation(self, idx, angles):
+        """
+        Vectorized AioBaseTurtle._calc_rotation for the turtles idx,
+        returning arrays of final orientations, step counts and
+        step angles.
+        """
+        speeds = self.speeds[idx]
+        speeds = np.where(speeds > 0, speeds, 1e9)
+        new_orients = _rotated(self.orients[idx], angles)
+        steps = 1 + (np.abs(angles) / (3.0 * speeds)).astype(int)
+        delta = angles / steps
+        return new_orients, steps, delta
+
+    def _calc_circle(self, radius, extent=None, steps=None):
+        """
+        Vectorized AioBaseTurtle._calc_circle, returning arrays of
+        step counts, step lengths and step rotations.
+        """
+        radius = np.asarray(radius, dtype=float)
+        if extent is None:
+            extent = 360.0
+        extent = np.asarray(extent, dtype=float)
+        if steps is None:
+            frac = np.abs(extent) / 360.0
+            steps = 1 + (
+                np.minimum(11 + np.abs(radius) / 6.0, 59.0) * frac
+            ).astype(int)
+        steps = np.asarray(steps)
+        rot_step = extent / steps
+        step_len = 2.0 * radius * np.sin(np.radians(rot_step) * 0.5)
+        flip = radius < 0
+        step_len = np.where(flip, -step_len, step_len)
+        rot_step = np.where(flip, -rot_step, rot_step)
+        return steps, step_len, rot_step
+
+    def _update_graphics(self):
+        """
+        Redraw the swarm and refresh the screen once for the whole
+        swarm.
+        """
+        if self.screen is None:
+            return
+        self._layer.render(self.positions, self.colors)
+        if self.screen._tracing:
+            self.screen._update()
+
+    def _finalize_move(self, idx, starts, ends):
+        """
+        Complete a move of the turtles idx, recording and drawing
+        the segments of those with the pen down.
+        """
+        self.positions[idx] = ends
+        drawing = self.drawing[idx]
+        if drawing.any():
+            segments = np.hstack((starts[drawing], ends[drawing]))
+            self._keep(segments)
+            if self.screen is not None:
+                drawn = idx[drawing]
+                self._layer.add(
+                    segments, self.pensizes[drawn], self.colors[drawn]
+                )
+        if self._layer is not None:
+            self._layer.moved = True
+        self._update_graphics()
+
+    async def _goto(self, idx, ends):
+        """
+        Move the turtles idx to ends in small steps (if animated).
+        """
+        starts = self.positions[idx].copy()
+        ends = np.broadcast_to(ends, starts.shape)
+        if self.animated and idx.size:
+            steps, delta = self._calc_move(idx, ends)
+            for n in range(1, int(steps.max())):
+                await asyncio.sleep(self.step_time, loop=self.loop)
+                moving = steps > n
+                self.positions[idx[moving]] = (
+                    starts[moving] + delta[moving] * n
+                )
+                if self._layer is not None:
+                    self._layer.moved = True
+                self._update_graphics()
+        self._finalize_move(idx, starts, ends)
+
+    async def _rotate(self, idx, angles):
+        """
+        Turn the turtles idx counterclockwise by angles (degrees),
+        in small steps if animated.
+        """
+        angles = np.broadcast_to(
+            np.asarray(angles, dtype=float), idx.shape
+        )
+        new_orients, steps, delta = self._calc_rotation(idx, angles)
+        if self.animated and idx.size:
+            starts = self.orients[idx].copy()
+            for n in range(1, int(steps.max()) + 1):
+                turning = steps >= n
+                self.orients[idx[turning]] = _rotated(
+                    starts[turning], delta[turning] * n
+                )
+                await asyncio.sleep(self.step_time, loop=self.loop)
+                self._update_graphics()
+        self.orients[idx] = new_orients
+        self._update_graphics()
+
+    async def goto(self, x, y=None, mask=None):
+        """
+        Move the selected turtles to the point (x, y), or to the
+        points in the array x of shape (n, 2).
+        """
+        idx = self._select(mask)
+        if y is None:
+            ends = np.asarray(x, dtype=float)
+        else:
+            ends = np.stack(np.broadcast_arrays(
+                np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+            ), axis=-1)
+        with (await self.lock):
+            await self._goto(idx, ends)
+
+    async def forward(self, distance, mask=None):
+        idx = self._select(mask)
+        distance = np.asarray(distance, dtype=float)
+        with (await self.lock):
+            ends = (
+                self.positions[idx] + self.orients[idx] * distance[..., None]
+            )
+            await self._goto(idx, ends)
+
+    async def back(self, distance, mask=None):
+        await self.forward(-np.asarray(distance, dtype=float), mask=mask)
+
+    async def left(self, angle, mask=None):
+        idx = self._select(mask)
+        with (await self.lock):
+            await self._rotate(idx, angle)
+
+    async def right(self, angle, mask=None):
+        await self.left(-np.asarray(angle, dtype=float), mask=mask)
+
+    async def setheading(self, to_angle, mask=None):
+        idx = self._select(mask)
+        with (await self.lock):
+            angles = np.asarray(to_angle, dtype=float) - self.heading()[idx]
+            angles = (angles + 180.0) % 360.0 - 180.0
+            await self._rotate(idx, angles)
+
+    async def circle(self, radius, extent=None, steps=None, mask=None):
+        """
+        Draw circles of the given radius with all selected turtles,
+        as in AsyncTurtle.circle. Turtles whose circles take fewer
+        steps wait for the others to finish.
+        """
+        idx = self._select(mask)
+        with (await self.lock):
+            steps, step_len, rot_step = self._calc_circle(
+                radius, extent, steps
+            )
+            steps = np.broadcast_to(steps, idx.shape)
+            step_len = np.broadcast_to(step_len, idx.shape)
+            rot_step = np.broadcast_to(rot_step, idx.shape)
+
+            await self._rotate(idx, rot_step * 0.5)
+            for n in range(int(steps.max()) if idx.size else 0):
+                active = steps > n
+                sub = idx[active]
+                ends = (
+                    self.positions[sub]
+                    + self.orients[sub] * step_len[active][:, None]
+                )
+                await self._goto(sub, ends)
+                await self._rotate(sub, rot_step[active])
+            await self._rotate(idx, -rot_step * 0.5)
+
+    pu = up = penup
+    pd = down = pendown
+
+add_turtle_fcn_aliases(TurtleSwarm)
+
+
+def _rotated(orients, angles):
+    """
+    Rotate an array of orientation vectors counterclockwise by
+    angles in degrees, as turtle.Vec2D.rotate does for one vector.
+    """
+    rad = np.radians(angles)
+    c, s = np.cos(rad), np.sin(rad)
+    x, y = orients[:, 0], orients[:, 1]
+    return np.stack((x * c - y * s, y * c + x * s), axis=-1)
+
+
+# pixel offsets of the square marking each turtle
+_MARKER = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+
+class _SwarmLayer:
+    """
+    The drawing of a swarm on a screen: its lines are rasterized
+    into an image the size of the canvas, with a transparent
+    background, and each frame shows that image with a square
+    drawn at every turtle position as one canvas image item.
+
+    Each frame only copies the region of the image that changed,
+    the bounding box of the new lines and of the turtle squares
+    before and after, so the work per frame is a few array
+    operations over that region and one canvas call however many
+    turtles there are. On a HeadlessScreen the item holds the
+    pixel array of the frame. On a Tk screen the changed region is
+    passed to a PhotoImage as PNG data, which costs in the order
+    of 10 ms per million pixels changed, a whole 1000 by 800
+    canvas when the turtles are spread over it.
+    """
+    def __init__(self, screen):
+        self.screen = screen
+        width, height = screen.screensize()
+        self.raster = Rasterizer(width, height, bg=color_rgb(
+            screen.bgcolor(), screen
+        ))
+        self.raster.pixels[:, :, 3] = 0
+        self.frame = self.raster.pixels.copy()
+        self.moved = True
+        self.region = (0, 0, 0, 0)
+        self._marked = None
+        self._pending = []
+        self._item = None
+        self._photo = None
+        if tk_app(screen) is not None:
+            import tkinter
+            self._photo = tkinter.PhotoImage(
+                master=screen.cv, width=width, height=height
+            )
+
+    def add(self, segments, widths, colors):
+        """
+        Queue segments, an (n, 4) array in turtle coordinates, to be
+        drawn with the pen sizes widths and the rows of colors at
+        the next render.
+        """
+        self._pending.append((segments, widths, colors))
+        self.moved = True
+
+    def _draw_pending(self, scale):
+        """
+        Rasterize the queued segments, one pass per pen color, and
+        return the pixel bounding box of what was drawn, or None.
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return None
+        segments = np.concatenate([item[0] for item in pending])
+        widths = np.concatenate([item[1] for item in pending])
+        colors = np.concatenate([item[2] for item in pending])
+        segments = segments * np.tile(scale, 2)
+        keys, which = np.unique(
+            colors.astype(np.intp) @ (1 << 16, 1 << 8, 1),
+            return_inverse=True
+        )
+        for key, color in enumerate(keys):
+            chosen = which == key
+            self.raster.draw_segments(
+                segments[chosen], width=widths[chosen],
+                color=(color >> 16, (color >> 8) & 255, color & 255)
+            )
+        reach = widths.max() * 0.5 + 1.0
+        xs = segments[:, 0::2] + self.raster.width * 0.5
+        ys = self.raster.height * 0.5 - segments[:, 1::2]
+        return (
+            xs.min() - reach, ys.min() - reach,
+            xs.max() + reach, ys.max() + reach
+        )
+
+    def _show(self):
+        """
+        Put the changed region of the frame on the canvas, creating
+        the image item if the screen has none, as after it was
+        cleared.
+        """
+        screen = self.screen
+        image = self.frame
+        x0, y0, x1, y1 = self.region
+        if self._photo is not None:
+            image = self._photo
+            if x1 > x0 and y1 > y0:
+                import tkinter
+                data = base64.b64encode(
+                    png_bytes(self.frame[y0:y1, x0:x1], 1)
+                )
+                changed = tkinter.PhotoImage(
+                    master=screen.cv, data=data.decode('ascii'),
+                    format='png'
+                )
+                image.tk.call(
+                    image.name, 'copy', changed.name, '-to', x0, y0,
+                    '-compositingrule', 'set'
+                )
+        if self._item is None or not screen.cv.type(self._item):
+            self._item = screen._createimage(image)
+        screen._drawimage(self._item, (0, 0), image)
+
+    def render(self, positions, colors):
+        """
+        Draw the queued lines and the turtles at positions, an (n, 2)
+        array, in the rows of colors, if anything moved since the
+        last frame.
+        """
+        if not self.moved:
+            return
+        self.moved = False
+        screen = self.screen
+        scale = np.array([screen.xscale, screen.yscale])
+        frame = self.frame
+        height, width = frame.shape[:2]
+        centers = np.floor(
+            positions * scale * (1, -1) + (width * 0.5, height * 0.5)
+        ).astype(np.intp)
+        marks = (centers[:, None, :] + _MARKER).reshape(-1, 2)
+        inside = (
+            (marks[:, 0] >= 0) & (marks[:, 0] < width)
+            & (marks[:, 1] >= 0) & (marks[:, 1] < height)
+        )
+        marks = marks[inside]
+        boxes = [self._draw_pending(scale), self._marked]
+        self._marked = None
+        if len(marks):
+            self._marked = tuple(marks.min(axis=0)) + tuple(
+                marks.max(axis=0) + 1
+            )
+            boxes.append(self._marked)
+        boxes = np.array([box for box in boxes if box is not None])
+        if not len(boxes):
+            self.region = (0, 0, 0, 0)
+            return
+        x0, y0 = np.clip(np.floor(boxes[:, :2].min(axis=0)), 0, None)
+        x1, y1 = np.ceil(boxes[:, 2:].max(axis=0))
+        x0, x1 = int(x0), int(min(x1, width))
+        y0, y1 = int(y0), int(min(y1, height))
+        self.region = (x0, y0, x1, y1)
+        frame[y0:y1, x0:x1] = self.raster.pixels[y0:y1, x0:x1]
+        rgba = np.empty((len(marks), 4), dtype=np.uint8)
+        rgba[:, :3] = np.repeat(colors, len(_MARKER), axis=0)[inside]
+        rgba[:, 3] = 255
+        frame[marks[:, 1], marks[:, 0]] = rgba
+        self._show()
@@ -0,0 +1,163 @@
+"""
+_threads_
+
+marshalling of canvas calls from BlockingTurtles running in threads
+"""
+import asyncio
+import collections
+import concurrent.futures
+import threading
+
+# canvas methods which return nothing when called with these
+# numbers of positional arguments or with keyword arguments, and
+# so can be queued without the calling thread waiting for them
+_DEFERRED_ARGS = {
+    'coords': 2,
+    'tag_raise': 1,
+    'tag_lower': 1,
+    'delete': 1,
+    'move': 3,
+    'update': 0,
+}
+_DEFERRED_KWARGS = ('itemconfigure', 'itemconfig', 'config', 'configure')
+
+
+def _deferrable(name, args, kwargs):
+    """
+    True if the canvas method name called with args and kwargs
+    returns nothing.
+    """
+    if name in _DEFERRED_KWARGS:
+        return bool(kwargs)
+    least = _DEFERRED_ARGS.get(name)
+    return least is not None and len(args) >= least
+
+
+class _MarshalledCanvas:
+    """
+    Proxy for a canvas passing every method call through a
+    CanvasMarshaller.
+    """
+    def __init__(self, marshaller, canvas):
+        self._marshaller = marshaller
+        self._canvas = canvas
+
+    def __getattr__(self, name):
+        attr = getattr(self._canvas, name)
+        if not callable(attr):
+            return attr
+        call = self._marshaller.call
+
+        def marshalled(*args, **kwargs):
+            return call(name, attr, args, kwargs)
+
+        return marshalled
+
+
+class CanvasMarshaller:
+    """
+    _CanvasMarshaller_
+
+    Lets BlockingTurtles on a screen be driven from worker threads,
+    for example by a ThreadPoolExecutor or loop.run_in_executor,
+    while tk is only ever called from the thread which creates the
+    marshaller and runs the event loop.
+
+    Creating a CanvasMarshaller attaches it to the screen and
+    replaces the canvas of the screen with a proxy. Canvas calls
+    made on the owning thread go straight through. Calls from any
+    other thread are appended to a deque, which is safe to share
+    between threads without a lock, and the event loop is woken
+    with call_soon_threadsafe to drain the whole batch at once.
+    Calls which only update the canvas, such as moving a line or
+    refreshing the display, are queued without the worker waiting,
+    so that a step of a BlockingTurtle costs a few appends. Calls
+    returning a value, such as creating an item, wait for the owning
+    thread to run them. Display refreshes queued in a batch are
+    coalesced into one at its end.
+
+    The owning thread must keep its event loop running while
+    worker threads are drawing, for instance by awaiting their
+    futures, or any worker waiting for a result will block.
+    """
+    def __init__(self, screen, loop=None):
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self.loop = loop
+        self.screen = screen
+        self.thread = threading.get_ident()
+        self.batches = 0
+        self.calls = 0
+        self._queue = collections.deque()
+        self._scheduled = False
+        self._canvas = screen.cv
+        screen.cv = _MarshalledCanvas(self, self._canvas)
+        screen.canvas_marshaller = self
+
+    def call(self, name, function, args, kwargs):
+        """
+        Call the canvas method function named name with args and
+        kwargs on the owning thread, returning its result if the
+        caller needs one.
+        """
+        if threading.get_ident() == self.thread:
+            if self._queue:
+                self.drain()
+            return function(*args, **kwargs)
+        if _deferrable(name, args, kwargs):
+            self._queue.append((name, function, args, kwargs, None))
+            self._wake()
+            return None
+        future = concurrent.futures.Future()
+        self._queue.append((name, function, args, kwargs, future))
+        self._wake()
+        return future.result()
+
+    def _wake(self):
+        if not self._scheduled:
+            self._scheduled = True
+            self.loop.call_soon_threadsafe(self.drain)
+
+    def drain(self):
+        """
+        Run every queued canvas call on the owning thread, then
+        refresh the display once if any call asked for it. The
+        first exception raised by a call nobody waits for is raised
+        once the batch is done.
+        """
+        self._scheduled = False
+        queue = self._queue
+        if not queue:
+            return
+        refresh = False
+        error = None
+        while queue:
+            name, function, args, kwargs, future = queue.popleft()
+            self.calls += 1
+            if name == 'update':
+                refresh = True
+                continue
+            try:
+                result = function(*args, **kwargs)
+            except Exception as exc:
+                if future is not None:
+                    future.set_exception(exc)
+                elif error is None:
+                    error = exc
+            else:
+                if future is not None:
+                    future.set_result(result)
+        if refresh:
+            self._canvas.update()
+        self.batches += 1
+        if error is not None:
+            raise error
+
+    def close(self):
+        """
+        Drain any queued calls and give the screen back its canvas.
+        """
+        self.drain()
+        if getattr(self.screen, 'canvas_marshaller', None) is self:
+            self.screen.cv = self._canvas
+            del self.screen.canvas_marshaller
@@ -0,0 +1,59 @@
+"""
+_tkloop_
+
+servicing of the Tk event queue from the asyncio event loop
+"""
+import asyncio
+import time
+
+from .metrics import runtime_stats
+
+
+def tk_app(screen):
+    """
+    Return the Tcl interpreter behind the canvas of screen, or
+    None if the screen is not drawn by Tk.
+    """
+    return getattr(screen.cv, 'tk', None)
+
+
+async def pump_tk_events(screen, loop=None, min_delay=0.001,
+                         max_delay=0.02, budget=0.01):
+    """
+    Coroutine servicing the Tk events of screen from the event
+    loop, so that input, redraws and window events are handled
+    while the loop is otherwise waiting.
+
+    Each pass handles the pending events without blocking, for at
+    most budget seconds. The delay before the next pass drops to
+    min_delay whenever there were events and doubles up to
+    max_delay while Tk is idle, so events are seen within a few
+    milliseconds of a burst and an idle prompt costs a few dozen
+    cheap wakeups a second. Tk keeps the connection to the display
+    to itself, so there is no file descriptor for the loop to wait
+    on instead.
+    """
+    import _tkinter
+    if loop is None:
+        loop = asyncio.get_event_loop()
+    app = tk_app(screen)
+    pending = _tkinter.ALL_EVENTS | _tkinter.DONT_WAIT
+    delay = min_delay
+    try:
+        while True:
+            begin = loop.time()
+            await asyncio.sleep(delay, loop=loop)
+            if runtime_stats.enabled:
+                runtime_stats.loop_lag.add(loop.time() - begin - delay)
+            handled = 0
+            deadline = time.perf_counter() + budget
+            while app.dooneevent(pending):
+                handled += 1
+                if time.perf_counter() >= deadline:
+                    break
+            if handled:
+                delay = min_delay
+            else:
+                delay = min(delay * 2, max_delay)
+    except asyncio.CancelledError:
+        return
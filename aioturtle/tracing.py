@@ -0,0 +1,171 @@
+"""
+_tracing_
+
+ring buffered timeline of turtle commands exported as Chrome traces
+"""
+import collections
+import cProfile
+import json
+import os
+import time
+
+
+class _TracedHold:
+    """
+    Context manager of a held turtle lock, recording the command
+    run while holding it when the lock is released.
+    """
+    __slots__ = ('_log', '_manager', '_name', '_track', '_begin')
+
+    def __init__(self, log, manager, name, track, begin):
+        self._log = log
+        self._manager = manager
+        self._name = name
+        self._track = track
+        self._begin = begin
+
+    def __enter__(self):
+        return self._manager.__enter__()
+
+    def __exit__(self, *exc_info):
+        try:
+            return self._manager.__exit__(*exc_info)
+        finally:
+            self._log.complete(
+                self._name, 'command', self._begin, time.perf_counter(),
+                self._track
+            )
+
+
+class TraceLog:
+    """
+    _TraceLog_
+
+    Process wide timeline of what the turtles spend their time on,
+    recorded only between start and stop. While recording, the
+    turtle classes, FrameClock and RefreshBatcher add a span for:
+
+    -   each command of an AsyncTurtle, while it holds its lock
+    -   each wait for the lock of an AsyncTurtle
+    -   each graphics update, one per animation step of a turtle
+    -   each FrameClock tick and RefreshBatcher flush
+
+    Spans are kept in a ring buffer of the last capacity spans, so
+    recording for a long time costs bounded memory, and exported as
+    Chrome Trace Event JSON with a track for each turtle, to be
+    opened in chrome://tracing or Perfetto.
+
+    If started with profile, a cProfile profiler runs while
+    recording as well.
+    """
+    def __init__(self, capacity=100000):
+        self.enabled = False
+        self.capacity = capacity
+        self.recorded = 0
+        self.profiler = None
+        self._spans = collections.deque(maxlen=capacity)
+        self._origin = time.perf_counter()
+
+    def __len__(self):
+        return len(self._spans)
+
+    @property
+    def dropped(self):
+        """
+        The number of spans pushed out of the ring buffer.
+        """
+        return self.recorded - len(self._spans)
+
+    def start(self, capacity=None, profile=False):
+        """
+        Clear the buffer and start recording.
+        """
+        if capacity is not None:
+            self.capacity = capacity
+        self._spans = collections.deque(maxlen=self.capacity)
+        self.recorded = 0
+        self._origin = time.perf_counter()
+        self.profiler = None
+        if profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.enabled = True
+
+    def stop(self):
+        """
+        Stop recording, keeping the buffer for export.
+        """
+        self.enabled = False
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    def track(self, turt):
+        """
+        Name of the track of the timeline for turt.
+        """
+        name = getattr(turt, 'name', None)
+        if name is None:
+            return 'turtle {0:x}'.format(id(turt))
+        return str(name)
+
+    def complete(self, name, category, begin, end, track):
+        """
+        Record a span from begin to end, perf_counter times, on the
+        named track.
+        """
+        self._spans.append((name, category, begin, end - begin, track))
+        self.recorded += 1
+
+    def hold(self, manager, name, track, begin):
+        """
+        Wrap the context manager of a lock acquired at begin so
+        that releasing it records the span of command name.
+        """
+        return _TracedHold(self, manager, name, track, begin)
+
+    def events(self):
+        """
+        Return the buffered spans as a list of Chrome Trace Event
+        dictionaries, with thread name metadata for each track.
+        """
+        pid = os.getpid()
+        tids = {}
+        events = []
+        for name, category, begin, duration, track in self._spans:
+            tid = tids.get(track)
+            if tid is None:
+                tid = tids[track] = len(tids) + 1
+                events.append({
+                    'name': 'thread_name', 'ph': 'M', 'pid': pid,
+                    'tid': tid, 'args': {'name': track},
+                })
+            events.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': (begin - self._origin) * 1e6,
+                'dur': duration * 1e6,
+                'pid': pid,
+                'tid': tid,
+            })
+        return events
+
+    def export(self, path):
+        """
+        Write the buffered spans to path as Chrome Trace Event JSON,
+        and the profile if any to path with .prof appended, returning
+        the number of spans written.
+        """
+        events = self.events()
+        with open(path, 'w') as fh:
+            json.dump({
+                'traceEvents': events,
+                'displayTimeUnit': 'ms',
+                'otherData': {'dropped': self.dropped},
+            }, fh)
+        if self.profiler is not None:
+            self.profiler.dump_stats(path + '.prof')
+        return len(self._spans)
+
+
+trace_log = TraceLog()
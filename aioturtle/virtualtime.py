@@ -0,0 +1,91 @@
+"""
+_virtualtime_
+
+asyncio event loop running on a simulated clock
+"""
+import asyncio
+import selectors
+import time
+
+
+class _VirtualSelector:
+    """
+    Wraps a real selector so that instead of blocking until the
+    next timer is due it only polls for ready file objects, and
+    if there are none moves the clock of its loop forward to the
+    timer. While the loop has work running in an executor, it
+    blocks as a real selector would and moves the clock forward
+    by the time that passed.
+    """
+    def __init__(self, selector):
+        self._selector = selector
+        self.loop = None
+
+    def select(self, timeout=None):
+        if timeout is None or timeout <= 0:
+            return self._selector.select(timeout)
+        if self.loop.outside_work:
+            begin = time.monotonic()
+            events = self._selector.select(timeout)
+            self.loop.advance(min(time.monotonic() - begin, timeout))
+            return events
+        events = self._selector.select(0)
+        if not events:
+            self.loop.advance(timeout)
+        return events
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    """
+    _VirtualClockEventLoop_
+
+    Selector event loop whose time is simulated. Whenever the loop
+    would wait for its next timer, such as the end of an animation
+    step of an AsyncTurtle or a sleep in keep_refreshed, the clock
+    jumps straight to the timer instead. Callbacks and timers run in
+    exactly the order and at exactly the loop times they would on a
+    real clock, without the waiting, so that animated scenarios run
+    as fast as their drawing allows and deterministically.
+
+    Sockets and other file objects are still polled. Only the
+    asyncio clock is simulated: time.sleep, as used by
+    BlockingTurtle, still sleeps. Work outside the loop cannot be
+    fast forwarded, so while functions passed to run_in_executor
+    are running, such as BlockingTurtles drawing in threads or
+    paths compiled in worker processes, the clock follows real
+    time. Threads started by other means are not seen.
+    """
+    def __init__(self, start=0.0, selector=None):
+        if selector is None:
+            selector = selectors.DefaultSelector()
+        selector = _VirtualSelector(selector)
+        super().__init__(selector=selector)
+        selector.loop = self
+        self._virtual_time = start
+        self._outside = set()
+
+    @property
+    def outside_work(self):
+        """
+        The number of run_in_executor calls still running.
+        """
+        return len(self._outside)
+
+    def run_in_executor(self, executor, func, *args):
+        future = super().run_in_executor(executor, func, *args)
+        self._outside.add(future)
+        future.add_done_callback(self._outside.discard)
+        return future
+
+    def time(self):
+        return self._virtual_time
+
+    def advance(self, seconds):
+        """
+        Move the clock forward by seconds.
+        """
+        if seconds > 0:
+            self._virtual_time += seconds
@@ -0,0 +1,91 @@
+"""
+_bench_step_kernel_
+
+Microbenchmark of the per-step cost of animated moves and
+rotations, comparing the float step kernel of AioBaseTurtle
+against the original turtle.Vec2D arithmetic.
+
+Run with: python -m benchmarks.bench_step_kernel
+"""
+import timeit
+
+from aioturtle import BlockingTurtle, HeadlessScreen
+
+STEPS = 10000
+
+
+def make_turtle():
+    """
+    A pen-up turtle on an untraced headless screen, so that only
+    the step arithmetic is measured.
+    """
+    screen = HeadlessScreen()
+    screen.tracer(0)
+    pet = BlockingTurtle(screen=screen)
+    pet.up()
+    return pet
+
+
+def vec2d_move(pet, start, delta):
+    """
+    The original _move_step loop using Vec2D arithmetic.
+    """
+    for n in range(1, STEPS):
+        pet._position = start + delta * n
+        top = True if n == 1 else False
+        if pet._drawing:
+            pet.screen._drawline(
+                pet.drawingLineItem, (start, pet._position),
+                pet._pencolor, pet._pensize, top
+            )
+        pet._update_graphics()
+
+
+def kernel_move(pet, start, end):
+    """
+    The animated move of AioBaseTurtle._move_frames from start.
+    """
+    pet._position = start
+    for _ in pet._move_frames(end):
+        pass
+
+
+def vec2d_rotate(pet, delta):
+    """
+    The original _rotate loop using Vec2D.rotate.
+    """
+    for _ in range(STEPS):
+        pet._orient = pet._orient.rotate(delta)
+        pet._update_graphics()
+
+
+def kernel_rotate(pet, delta):
+    for _ in pet._rotate_frames(STEPS, delta):
+        pass
+
+
+def per_step(stmt, repeat=5):
+    """
+    Best time per step in microseconds over several runs.
+    """
+    return min(timeit.repeat(stmt, number=1, repeat=repeat)) / STEPS * 1e6
+
+
+def main():
+    pet = make_turtle()
+    start = pet._position
+    # one unit of distance per unit of speed is a step
+    end = start + (1.0 * pet._speed * STEPS, 0.0)
+    steps, delta = pet._calc_move(end)
+    results = [
+        ('move, Vec2D', per_step(lambda: vec2d_move(pet, start, delta))),
+        ('move, kernel', per_step(lambda: kernel_move(pet, start, end))),
+        ('rotate, Vec2D', per_step(lambda: vec2d_rotate(pet, 0.1))),
+        ('rotate, kernel', per_step(lambda: kernel_rotate(pet, 0.1))),
+    ]
+    for name, usec in results:
+        print('{0:<16} {1:8.3f} us/step'.format(name, usec))
+
+
+if __name__ == '__main__':
+    main()
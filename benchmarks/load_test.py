@@ -0,0 +1,109 @@
+"""
+_load_test_
+
+Load test client for the aioturtle PromptServer. Many clients
+connect at once, each creating a turtle and sending batches of
+commands, and the command throughput and the round trip time of
+each batch are reported.
+
+Run against a running server with:
+    python -m benchmarks.load_test --port 7878
+or against a headless server in the same process with:
+    python -m benchmarks.load_test --serve
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from aioturtle import HeadlessScreen, PromptServer
+from aioturtle.metrics import Histogram
+
+COMMANDS = ('{0} fd 5', '{0} lt 10', '{0} xcor', '{0} pensize 2')
+
+
+async def read_reply(reader):
+    """
+    Read one reply, returning True if it was an error.
+    """
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError('Server closed the connection')
+        if line == b'ok\n':
+            return False
+        if line.startswith(b'!'):
+            return True
+
+
+async def run_client(host, port, name, batches, batch_size, rtt, loop):
+    """
+    Create turtle name and send it batches of batch_size commands,
+    waiting for every reply of a batch before sending the next.
+    Return the number of error replies.
+    """
+    reader, writer = await asyncio.open_connection(host, port, loop=loop)
+    writer.write('new {0}\n'.format(name).encode())
+    errors = int(await read_reply(reader))
+    for idx in range(batches):
+        batch = ''.join(
+            COMMANDS[(idx * batch_size + pos) % len(COMMANDS)].format(name)
+            + '\n'
+            for pos in range(batch_size)
+        )
+        begin = loop.time()
+        writer.write(batch.encode())
+        for _ in range(batch_size):
+            errors += await read_reply(reader)
+        rtt.add(loop.time() - begin)
+    writer.write(b'quit\n')
+    await read_reply(reader)
+    writer.close()
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='PromptServer load test')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7878)
+    parser.add_argument(
+        '--serve', action='store_true',
+        help='run a headless server in this process on a free port'
+    )
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--batches', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    loop = asyncio.get_event_loop()
+    server, port = None, args.port
+    if args.serve:
+        screen = HeadlessScreen()
+        screen.delay(delay=0)
+        server = PromptServer(screen=screen, loop=loop)
+        listening = loop.run_until_complete(server.start(args.host, 0))
+        port = listening.sockets[0].getsockname()[1]
+
+    rtt = Histogram()
+    clients = [
+        run_client(
+            args.host, port, 'bot{0}'.format(idx), args.batches,
+            args.batch_size, rtt, loop
+        )
+        for idx in range(args.clients)
+    ]
+    begin = time.perf_counter()
+    errors = loop.run_until_complete(asyncio.gather(*clients, loop=loop))
+    elapsed = time.perf_counter() - begin
+    if server is not None:
+        loop.run_until_complete(server.close())
+
+    commands = args.clients * args.batches * args.batch_size
+    print('clients:     {0}'.format(args.clients))
+    print('commands:    {0} ({1} errors)'.format(commands, sum(errors)))
+    print('throughput:  {0:.0f} commands/s'.format(commands / elapsed))
+    print('batch rtt:   {0}'.format(rtt))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
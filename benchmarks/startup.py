@@ -0,0 +1,99 @@
+"""
+_startup_
+
+Startup time budget check. Measures, each in fresh interpreters,
+the time to import the aioturtle package and the time from starting
+python -m aioturtle prompt --headless to its first prompt, and
+exits with status 1 if the best of several runs is over budget.
+
+Run with:
+    python -m benchmarks.startup
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+PROMPT = b'aioturtle> '
+
+IMPORT_SCRIPT = (
+    'import time; begin = time.perf_counter(); import aioturtle; '
+    'print(time.perf_counter() - begin)'
+)
+
+
+def _env():
+    """
+    Environment for child interpreters, able to import the
+    package from this checkout.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    path = env.get('PYTHONPATH')
+    env['PYTHONPATH'] = root if not path else root + os.pathsep + path
+    return env
+
+
+def import_time():
+    """
+    Return the seconds taken by import aioturtle in a new interpreter.
+    """
+    output = subprocess.check_output(
+        [sys.executable, '-c', IMPORT_SCRIPT], env=_env()
+    )
+    return float(output)
+
+
+def prompt_time():
+    """
+    Return the seconds from starting a headless prompt to reading
+    its first prompt.
+    """
+    begin = time.perf_counter()
+    child = subprocess.Popen(
+        [sys.executable, '-m', 'aioturtle', 'prompt', '--headless'],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=_env()
+    )
+    seen = b''
+    while not seen.endswith(PROMPT):
+        data = child.stdout.read1(4096)
+        if not data:
+            raise RuntimeError('prompt exited before prompting')
+        seen += data
+    elapsed = time.perf_counter() - begin
+    child.communicate(b'quit\n')
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='startup time budgets')
+    parser.add_argument(
+        '--import-budget', type=float, default=0.05,
+        help='seconds allowed for import aioturtle'
+    )
+    parser.add_argument(
+        '--prompt-budget', type=float, default=0.25,
+        help='seconds allowed until the first headless prompt'
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = [
+        ('import aioturtle', import_time, args.import_budget),
+        ('first prompt', prompt_time, args.prompt_budget),
+    ]
+    over = False
+    for label, measure, budget in results:
+        best = min(measure() for _ in range(args.repeat))
+        status = 'ok' if best <= budget else 'OVER BUDGET'
+        over = over or best > budget
+        print('{0:<17} {1:8.1f} ms  budget {2:8.1f} ms  {3}'.format(
+            label, best * 1e3, budget * 1e3, status
+        ))
+    if over:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,223 @@
+"""
+_suite_
+
+Throughput and scaling benchmarks for aioturtle, run entirely
+against HeadlessScreen so no display is needed. Results are
+written as JSON records so that they can be compared between
+releases.
+
+Run with: python -m benchmarks.suite [--quick] [--output FILE]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import timeit
+
+import aioturtle
+from aioturtle import AsyncTurtle, BlockingTurtle, FrameClock, HeadlessScreen
+
+
+class CountingEventLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop counting every callback and timer scheduled on it,
+    as a measure of event loop wakeups.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.callbacks = 0
+        self.timers = 0
+
+    def call_soon(self, *args, **kwargs):
+        self.callbacks += 1
+        return super().call_soon(*args, **kwargs)
+
+    def call_at(self, *args, **kwargs):
+        self.timers += 1
+        return super().call_at(*args, **kwargs)
+
+
+def record(results, name, value, unit, **params):
+    results.append({
+        'name': name,
+        'value': value,
+        'unit': unit,
+        'params': params,
+    })
+    print('{0:<32} {1:>14.3f} {2:<10} {3}'.format(
+        name, value, unit, params or ''
+    ))
+
+
+def headless_screen():
+    screen = HeadlessScreen()
+    screen.delay(delay=0)
+    return screen
+
+
+def count_steps(screen):
+    """
+    Number of animated steps drawn on a headless screen so far,
+    each step refreshing the canvas exactly once.
+    """
+    return screen.cv.ops['update']
+
+
+def bench_calc(results, number):
+    """
+    Cost per call of the step calculations and of a single step.
+    """
+    screen = headless_screen()
+    screen.tracer(0)
+    pet = BlockingTurtle(screen=screen)
+    end = pet._position + (123.0, 45.0)
+    start, delta = pet._position, pet._calc_move(end)[1]
+    cases = [
+        ('calc_move', lambda: pet._calc_move(end)),
+        ('calc_rotation', lambda: pet._calc_rotation(77.0)),
+        ('calc_circle', lambda: pet._calc_circle(50, extent=270)),
+        ('move_step', lambda: pet._move_step(start, 7, delta)),
+    ]
+    for name, stmt in cases:
+        best = min(timeit.repeat(stmt, number=number, repeat=5))
+        record(results, name, best / number * 1e6, 'us/call')
+
+
+def bench_blocking(results, distance):
+    """
+    Animated steps per second of a single BlockingTurtle.
+    """
+    screen = headless_screen()
+    pet = BlockingTurtle(screen=screen)
+    before = count_steps(screen)
+    begin = time.perf_counter()
+    pet.forward(distance)
+    pet.circle(50)
+    elapsed = time.perf_counter() - begin
+    steps = count_steps(screen) - before
+    record(results, 'blocking_steps', steps / elapsed, 'steps/s')
+
+
+def run_async(count, program, clock=False):
+    """
+    Run program on count AsyncTurtles concurrently, returning the
+    elapsed time, steps drawn and the counting event loop.
+    """
+    loop = CountingEventLoop()
+    screen = headless_screen()
+    if clock:
+        FrameClock(screen, loop=loop)
+    pets = [AsyncTurtle(loop=loop, screen=screen) for _ in range(count)]
+    tasks = [program(pet) for pet in pets]
+    before = count_steps(screen)
+    loop.callbacks = loop.timers = 0
+    begin = time.perf_counter()
+    loop.run_until_complete(asyncio.wait(tasks, loop=loop))
+    elapsed = time.perf_counter() - begin
+    steps = count_steps(screen) - before
+    if clock:
+        screen.frame_clock.close()
+    loop.close()
+    return elapsed, steps, loop
+
+
+def bench_async_scaling(results, sizes, distance):
+    """
+    Steps per second and event loop wakeups per frame for growing
+    numbers of concurrent AsyncTurtles, with and without a
+    FrameClock.
+    """
+    programs = [
+        ('forward', lambda pet: pet.forward(distance)),
+        ('circle', lambda pet: pet.circle(20, extent=90)),
+    ]
+    # frames taken by a single turtle, identical for every turtle
+    frames = {
+        'forward': distance // 3 - 1,
+    }
+    for verb, program in programs:
+        for count in sizes:
+            for clock in (False, True):
+                elapsed, steps, loop = run_async(count, program, clock)
+                params = {'turtles': count, 'verb': verb, 'clock': clock}
+                record(
+                    results, 'async_steps', steps / elapsed, 'steps/s',
+                    **params
+                )
+                if verb in frames:
+                    wakeups = (loop.callbacks + loop.timers) / frames[verb]
+                    record(
+                        results, 'async_wakeups', wakeups, 'per frame',
+                        **params
+                    )
+
+
+def bench_program(results, length):
+    """
+    Operations per second of a long program of moves and turns
+    drawn without animation, awaited one method at a time and run
+    by AsyncTurtle.run_program.
+    """
+    ops = [('fd', 10), ('lt', 91)] * (length // 2)
+
+    async def per_call(pet):
+        for verb, arg in ops:
+            await getattr(pet, verb)(arg)
+
+    async def batched(pet):
+        await pet.run_program(ops)
+
+    for mode, program in (('per_call', per_call), ('run_program', batched)):
+        loop = asyncio.new_event_loop()
+        screen = headless_screen()
+        pet = AsyncTurtle(loop=loop, screen=screen)
+        pet.speed(0)
+        begin = time.perf_counter()
+        loop.run_until_complete(program(pet))
+        elapsed = time.perf_counter() - begin
+        loop.close()
+        record(results, 'program_ops', len(ops) / elapsed, 'ops/s', mode=mode)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='aioturtle benchmarks')
+    parser.add_argument(
+        '--quick', action='store_true',
+        help='small sizes for a fast smoke run'
+    )
+    parser.add_argument(
+        '--sizes', default='1,10,100,1000,10000',
+        help='comma separated numbers of concurrent turtles'
+    )
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        sizes, number, distance = [1, 10], 1000, 30
+    else:
+        sizes = [int(size) for size in args.sizes.split(',')]
+        number, distance = 20000, 300
+
+    results = []
+    bench_calc(results, number)
+    bench_blocking(results, distance)
+    bench_async_scaling(results, sizes, distance)
+    bench_program(results, number)
+
+    report = {
+        'aioturtle': aioturtle.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+    return report
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
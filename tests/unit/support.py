@@ -0,0 +1,42 @@
+"""
+_support_
+
+Shared fixtures for the unit tests.
+"""
+import asyncio
+import unittest
+
+from aioturtle import HeadlessScreen, VirtualClockEventLoop
+
+
+class HeadlessTestCase(unittest.TestCase):
+    """
+    Base class of tests running turtles on a headless screen with
+    a fresh event loop, which is not set as the current loop so
+    that code under test must be given it explicitly. The screen
+    delay is step_delay milliseconds.
+    """
+    step_delay = 0
+
+    def new_loop(self):
+        return asyncio.new_event_loop()
+
+    def setUp(self):
+        self.loop = self.new_loop()
+        asyncio.set_event_loop(None)
+        self.screen = HeadlessScreen()
+        self.screen.delay(delay=self.step_delay)
+
+    def tearDown(self):
+        self.loop.close()
+
+
+class VirtualClockTestCase(HeadlessTestCase):
+    """
+    HeadlessTestCase on a VirtualClockEventLoop with a 10 ms step
+    time, for tests of timing.
+    """
+    step_delay = 10
+
+    def new_loop(self):
+        return VirtualClockEventLoop()
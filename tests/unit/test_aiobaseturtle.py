@@ -33,6 +33,7 @@ class AioBaseTurtleTests(unittest.TestCase):
         self.mock_screen.xscale = 1.0
         self.mock_screen.yscale = 1.0
         self.mock_screen.mode.return_value = 'standard'
+        self.mock_screen.detail_controller = None
 
 
         self.update_patcher = mock.patch(
@@ -97,3 +98,16 @@ class AioBaseTurtleTests(unittest.TestCase):
             False
         )
         self.mock_update.assert_called_once_with()
+
+    def test_rotate_frames(self):
+        """
+        Test that the AioBaseTurtle._rotate_frames kernel matches
+        repeated Vec2D rotation exactly
+        """
+        t = AioBaseTurtle()
+        expected = t._orient
+        for _ in t._rotate_frames(7, 13.0):
+            expected = expected.rotate(13.0)
+            self.assertEqual(t._orient, expected)
+            self.assertIsInstance(t._orient, Vec2D)
+        self.assertEqual(self.mock_update.call_count, 7)
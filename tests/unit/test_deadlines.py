@@ -0,0 +1,107 @@
+"""
+_test_deadlines_
+
+Unit tests for deadline scheduled animation with frame skipping.
+"""
+import asyncio
+
+from aioturtle import AsyncTurtle, FrameClock, runtime_stats
+
+from .support import VirtualClockTestCase
+
+
+class DeadlineTests(VirtualClockTestCase):
+    """
+    Tests for animations keeping deadlines on a busy event loop
+    """
+    def setUp(self):
+        """
+        Simulated clock loop and headless screen with a 10 ms
+        step time
+        """
+        super().setUp()
+        runtime_stats.reset()
+
+    async def hog(self, until):
+        """
+        Hold the loop for 35 ms of every 10 ms step until the loop
+        time reaches until, as slow drawing or other work would.
+        """
+        while self.loop.time() < until:
+            await asyncio.sleep(0.01, loop=self.loop)
+            self.loop.advance(0.035)
+
+    def run_program(self, pet):
+        async def program():
+            await pet.fd(100)
+            await pet.lt(90)
+            return self.loop.time()
+
+        hog = asyncio.ensure_future(self.hog(1.5), loop=self.loop)
+        done = self.loop.run_until_complete(program())
+        self.loop.run_until_complete(hog)
+        return done
+
+    def test_turtle_deadlines(self):
+        """
+        Test that a turtle keeping deadlines skips steps on a busy
+        loop, finishing on time and where it should.
+        """
+        pet = AsyncTurtle(
+            name='pet', loop=self.loop, screen=self.screen, deadlines=True
+        )
+        pet.speed(1)
+        done = self.run_program(pet)
+        self.assertAlmostEqual(pet.pos()[0], 100.0)
+        self.assertAlmostEqual(pet.pos()[1], 0.0)
+        self.assertAlmostEqual(pet.heading(), 90.0)
+        # 99 move steps and 31 rotation steps of 10 ms, give or
+        # take the 45 ms the loop may be held past a deadline
+        self.assertLess(done, 1.3 + 2 * 0.045)
+        self.assertGreater(pet.skipped_frames, 0)
+        self.assertEqual(pet.steps + pet.skipped_frames, 99 + 31)
+        self.assertEqual(runtime_stats.skipped_frames, pet.skipped_frames)
+        self.assertIn('skipped', runtime_stats.report([pet]))
+
+    def test_fixed_steps_fall_behind(self):
+        """
+        Test that without deadlines every step is drawn and the
+        same program finishes late.
+        """
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        pet.speed(1)
+        done = self.run_program(pet)
+        self.assertAlmostEqual(pet.pos()[0], 100.0)
+        self.assertEqual(pet.skipped_frames, 0)
+        self.assertEqual(pet.steps, 99 + 31)
+        self.assertGreater(done, 2.0)
+
+    def test_clock_deadlines(self):
+        """
+        Test that a FrameClock keeping deadlines skips the steps
+        of all its turtles when its ticks run late.
+        """
+        clock = FrameClock(self.screen, loop=self.loop, deadlines=True)
+        pets = [
+            AsyncTurtle(loop=self.loop, screen=self.screen)
+            for _ in range(3)
+        ]
+        for pet in pets:
+            pet.speed(1)
+
+        async def program():
+            await asyncio.gather(
+                *[pet.fd(100) for pet in pets], loop=self.loop
+            )
+            return self.loop.time()
+
+        hog = asyncio.ensure_future(self.hog(1.5), loop=self.loop)
+        done = self.loop.run_until_complete(program())
+        self.loop.run_until_complete(hog)
+        clock.close()
+        for pet in pets:
+            self.assertAlmostEqual(pet.pos()[0], 100.0)
+            self.assertGreater(pet.skipped_frames, 0)
+            self.assertEqual(pet.steps + pet.skipped_frames, 99)
+        self.assertLess(done, 0.99 + 0.045)
+        self.assertLess(clock.ticks, 99)
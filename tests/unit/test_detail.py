@@ -0,0 +1,140 @@
+"""
+_test_detail_
+
+Unit tests for the adaptive level of detail controller.
+"""
+import asyncio
+
+from aioturtle import AsyncTurtle, DetailController, TurtleObserver
+
+from .support import VirtualClockTestCase
+
+
+class StepCounter(TurtleObserver):
+    """
+    Observer counting the animation steps of a turtle
+    """
+    def __init__(self):
+        self.steps = 0
+
+    def on_step(self, turt):
+        self.steps += 1
+
+
+class DetailControllerTests(VirtualClockTestCase):
+    """
+    Tests for the level of detail following the load of the loop
+    """
+    def setUp(self):
+        """
+        Simulated clock loop and headless screen with a 10 ms
+        step time
+        """
+        super().setUp()
+        self.controller = DetailController(self.screen, loop=self.loop)
+
+    def tearDown(self):
+        self.controller.close()
+        super().tearDown()
+
+    async def animate(self, until, cost, refresh=True):
+        """
+        Run an animation until the loop time reaches until, holding
+        the loop for cost seconds of every 10 ms, refreshing the
+        screen as slow drawing would unless refresh is false.
+        """
+        self.controller.start()
+        try:
+            while self.loop.time() < until:
+                await asyncio.sleep(0.01, loop=self.loop)
+                if refresh:
+                    self.controller.refreshed(cost)
+                self.loop.advance(cost)
+        finally:
+            self.controller.stop()
+
+    def test_idle_no_sampling(self):
+        """
+        Test that the controller only samples frames while turtles
+        animate, and for one frame after.
+        """
+        self.loop.run_until_complete(asyncio.sleep(1.0, loop=self.loop))
+        self.assertEqual(self.controller.frames, 0)
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        self.loop.run_until_complete(pet.fd(100))
+        frames = self.controller.frames
+        self.assertGreater(frames, 0)
+        self.loop.run_until_complete(asyncio.sleep(1.0, loop=self.loop))
+        self.assertLessEqual(self.controller.frames, frames + 1)
+        self.assertIsNone(self.controller._handle)
+        self.assertEqual(self.controller.scale, 1.0)
+
+    def test_refresh_time_measured(self):
+        """
+        Test that the time spent in _update_graphics is counted as
+        refresh time, and that a loop busy with anything else keeps
+        full detail.
+        """
+        refreshes = []
+        self.controller.refreshed = refreshes.append
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        self.loop.run_until_complete(pet.fd(100))
+        self.assertEqual(len(refreshes), pet.steps + 1)
+        del self.controller.refreshed
+        self.loop.run_until_complete(self.animate(2.0, 0.05, refresh=False))
+        self.assertGreater(self.controller.frames, 20)
+        self.assertEqual(self.controller.scale, 1.0)
+
+    def test_load_lowers_detail(self):
+        """
+        Test that slow refreshes raise the scale up to its maximum,
+        and that it decays back once the load is gone.
+        """
+        self.loop.run_until_complete(self.animate(2.0, 0.05))
+        self.assertGreater(self.controller.scale, 1.0)
+        self.assertLessEqual(
+            self.controller.scale, self.controller.max_scale
+        )
+        self.loop.run_until_complete(self.animate(7.0, 0.0))
+        self.assertEqual(self.controller.scale, 1.0)
+
+    def test_fewer_steps_same_result(self):
+        """
+        Test that at lowered detail a turtle draws fewer steps and
+        ends exactly where it would at full detail.
+        """
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        pet.speed(1)
+        counter = StepCounter()
+        pet.add_observer(counter)
+        # sampling at 0.01 fps leaves the scale alone during the test
+        self.controller.close()
+        self.controller = DetailController(
+            self.screen, fps=0.01, loop=self.loop
+        )
+        self.controller.scale = 4.0
+
+        async def program():
+            await pet.fd(100)
+            await pet.lt(90)
+            await pet.circle(50)
+
+        self.loop.run_until_complete(program())
+        # 99 move steps and 280 circle steps at full detail
+        self.assertLess(counter.steps, (99 + 280) / 3)
+        self.assertAlmostEqual(pet.pos()[0], 100.0)
+        self.assertAlmostEqual(pet.pos()[1], 0.0)
+        self.assertAlmostEqual(pet.heading(), 90.0)
+
+    def test_close_restores(self):
+        """
+        Test that closing detaches the controller from the screen
+        and turtles return to full detail.
+        """
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        self.controller.scale = 8.0
+        self.assertEqual(pet._detail_scale(), 8.0)
+        self.controller.close()
+        self.assertFalse(hasattr(self.screen, 'detail_controller'))
+        self.assertEqual(pet._detail_scale(), 1.0)
+
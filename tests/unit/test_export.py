@@ -0,0 +1,100 @@
+"""
+_test_export_
+
+Unit tests for the streaming SVG exporter.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+
+from aioturtle import BlockingTurtle, HeadlessScreen, SVGExporter
+
+_SVG = '{http://www.w3.org/2000/svg}'
+
+
+class SVGExporterTests(unittest.TestCase):
+    """
+    Tests for the SVGExporter class
+    """
+    def setUp(self):
+        """
+        Non-animated turtle on a headless screen and a temporary
+        output file
+        """
+        self.screen = HeadlessScreen()
+        self.screen.tracer(0)
+        self.pet = BlockingTurtle(screen=self.screen)
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'drawing.svg')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def elements(self):
+        group = ElementTree.parse(self.path).getroot().find(_SVG + 'g')
+        return [(elem.tag[len(_SVG):], elem) for elem in group]
+
+    def test_merged_paths(self):
+        """
+        Test that moves with the same pen are merged into one
+        polyline and a pen change starts another.
+        """
+        with SVGExporter(self.path) as exporter:
+            exporter.attach(self.pet)
+            for _ in range(4):
+                self.pet.fd(10)
+                self.pet.lt(90)
+            self.pet.circle(20)
+            self.pet.pencolor('red')
+            self.pet.fd(10)
+            self.pet.up()
+            self.pet.fd(10)
+        elements = self.elements()
+        self.assertEqual([tag for tag, _ in elements], ['polyline'] * 2)
+        first, second = elements[0][1], elements[1][1]
+        self.assertEqual(len(first.get('points').split()), 5 + 15)
+        self.assertEqual(second.get('points'), '0,0 10,0')
+        self.assertEqual(second.get('stroke'), 'red')
+
+    def test_max_points(self):
+        with SVGExporter(self.path, max_points=10) as exporter:
+            exporter.attach(self.pet)
+            for _ in range(30):
+                self.pet.fd(1)
+        self.assertEqual(len(self.elements()), 4)
+
+    def test_attach_screen_once(self):
+        """
+        Test that attaching a screen skips turtles already attached.
+        """
+        with SVGExporter(self.path) as exporter:
+            exporter.attach(self.pet)
+            exporter.attach_screen(self.screen)
+            self.assertEqual(self.pet.observers.count(exporter), 1)
+
+    def test_fill_stamp_and_text(self):
+        """
+        Test that a fill polygon is written below the lines drawn
+        while filling, followed by stamps and text.
+        """
+        with SVGExporter(self.path) as exporter:
+            exporter.attach_screen(self.screen)
+            self.pet.fillcolor('blue')
+            self.pet.begin_fill()
+            self.pet.fd(30)
+            self.pet.lt(90)
+            self.pet.fd(30)
+            self.pet.end_fill()
+            self.pet.stamp()
+            self.pet.write('a<b', font=('Courier', 12, 'bold'))
+        elements = self.elements()
+        self.assertEqual(
+            [tag for tag, _ in elements],
+            ['polygon', 'polyline', 'polygon', 'text']
+        )
+        self.assertEqual(elements[0][1].get('fill'), 'blue')
+        self.assertEqual(elements[0][1].get('points'), '0,0 30,0 30,-30')
+        self.assertEqual(elements[3][1].text, 'a<b')
+        self.assertEqual(elements[3][1].get('font-weight'), 'bold')
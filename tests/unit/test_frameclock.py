@@ -0,0 +1,86 @@
+"""
+_test_frameclock_
+
+Unit tests for the FrameClock shared animation scheduler.
+"""
+import asyncio
+
+from aioturtle import AsyncTurtle, FrameClock
+
+from .support import HeadlessTestCase
+
+
+class FrameClockTests(HeadlessTestCase):
+    """
+    Tests for AsyncTurtles animated by a FrameClock
+    """
+    def setUp(self):
+        """
+        Fresh event loop and headless screen with a clock attached
+        """
+        super().setUp()
+        self.clock = FrameClock(self.screen, loop=self.loop)
+
+    def tearDown(self):
+        self.clock.close()
+        super().tearDown()
+
+    def test_concurrent_moves_share_ticks(self):
+        """
+        Test that several turtles moving at once are all stepped
+        by the same ticks and end up in the correct positions.
+        """
+        pets = [
+            AsyncTurtle(loop=self.loop, screen=self.screen)
+            for _ in range(5)
+        ]
+        for pet in pets:
+            pet.speed(3)
+        tasks = [pet.fd(30) for pet in pets]
+        self.loop.run_until_complete(asyncio.wait(tasks, loop=self.loop))
+        for pet in pets:
+            self.assertAlmostEqual(pet.pos()[0], 30.0)
+            self.assertAlmostEqual(pet.pos()[1], 0.0)
+        # a 30 unit move at speed 3 takes 10 steps, the last being
+        # the finalized move, so 9 ticks regardless of turtle count
+        self.assertEqual(self.clock.ticks, 9)
+        self.assertEqual(self.clock.active, 0)
+
+    def test_sequential_move_and_rotation(self):
+        """
+        Test that a move followed by a rotation is stepped to
+        completion in order.
+        """
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        pet.speed(3)
+
+        async def program():
+            await pet.fd(30)
+            await pet.lt(90)
+            await pet.fd(30)
+
+        self.loop.run_until_complete(program())
+        self.assertAlmostEqual(pet.pos()[0], 30.0)
+        self.assertAlmostEqual(pet.pos()[1], 30.0)
+        self.assertAlmostEqual(pet.heading(), 90.0)
+        # 9 ticks per move and 11 for the 90 degree rotation
+        self.assertEqual(self.clock.ticks, 29)
+
+    def test_cancelled_move(self):
+        """
+        Test that cancelling a turtle mid-move removes its animation
+        from the clock without disturbing other turtles.
+        """
+        self.screen.delay(delay=1)
+        stopped = AsyncTurtle(loop=self.loop, screen=self.screen)
+        moving = AsyncTurtle(loop=self.loop, screen=self.screen)
+        stopped_task = asyncio.ensure_future(stopped.fd(300), loop=self.loop)
+        self.loop.run_until_complete(moving.fd(60))
+        stopped_task.cancel()
+        self.loop.run_until_complete(
+            asyncio.wait([stopped_task], loop=self.loop)
+        )
+        self.assertTrue(stopped_task.cancelled())
+        self.assertAlmostEqual(moving.pos()[0], 60.0)
+        self.assertLess(stopped.pos()[0], 300.0)
+        self.assertEqual(self.clock.active, 0)
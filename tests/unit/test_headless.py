@@ -0,0 +1,117 @@
+"""
+_test_headless_
+
+Unit tests for the HeadlessScreen backend.
+"""
+import asyncio
+
+from aioturtle import AsyncTurtle, BlockingTurtle, HeadlessScreen
+
+from .support import HeadlessTestCase
+
+
+class HeadlessScreenTests(HeadlessTestCase):
+    """
+    Tests for turtles drawing onto a HeadlessScreen
+    """
+    def test_zigzag(self):
+        """
+        Test that an AsyncTurtle on a headless screen ends up in the
+        correct position and records the zigzag line in memory.
+        """
+        turtle = AsyncTurtle(loop=self.loop, screen=self.screen)
+        tasks = [
+            asyncio.ensure_future(turtle.fd(10), loop=self.loop),
+            asyncio.ensure_future(turtle.lt(90), loop=self.loop),
+            asyncio.ensure_future(turtle.fd(10), loop=self.loop),
+            asyncio.ensure_future(turtle.rt(90), loop=self.loop),
+            asyncio.ensure_future(turtle.fd(10), loop=self.loop)
+        ]
+        self.loop.run_until_complete(asyncio.wait(tasks, loop=self.loop))
+        self.assertEqual(turtle.pos()[0], 20)
+        self.assertEqual(turtle.pos()[1], 10)
+        expected_coords = [
+            0.0, 0.0,
+            10.0, 0.0,
+            10.0, -10.0,
+            20.0, -10.0
+        ]
+        self.assertEqual(
+            self.screen.cv.coords(turtle.currentLineItem),
+            expected_coords
+        )
+        self.assertIn(turtle, self.screen.turtles())
+
+    def test_blocking_turtle(self):
+        """
+        Test that a BlockingTurtle draws a filled square and a stamp
+        on a headless screen.
+        """
+        turtle = BlockingTurtle(screen=self.screen)
+        turtle.color('red', 'blue')
+        turtle.begin_fill()
+        for _ in range(4):
+            turtle.fd(50)
+            turtle.lt(90)
+        turtle.end_fill()
+        turtle.stamp()
+        self.assertAlmostEqual(turtle.pos()[0], 0.0)
+        self.assertAlmostEqual(turtle.pos()[1], 0.0)
+
+        fills = [
+            item for item in self.screen.items
+            if item.type == 'polygon' and item.options.get('fill') == 'blue'
+        ]
+        # the fill polygon, the stamp and the turtle itself
+        self.assertEqual(len(fills), 3)
+        self.assertGreater(self.screen.cv.ops['update'], 0)
+
+    def test_separate_screens(self):
+        """
+        Test that turtles on different headless screens do not
+        share drawings.
+        """
+        other = HeadlessScreen()
+        first = BlockingTurtle(name='first', screen=self.screen)
+        second = BlockingTurtle(name='second', screen=other)
+        self.assertEqual(self.screen.turtles(), [first])
+        self.assertEqual(other.turtles(), [second])
+
+    def test_instant_circle_polyline(self):
+        """
+        Test that a non-animated circle reaches exactly the same
+        position and orientation as an animated one, drawing the
+        whole arc as a single line item.
+        """
+        animated = BlockingTurtle(screen=self.screen)
+        animated.speed(10)
+        animated.circle(80, extent=270, steps=100)
+
+        instant = BlockingTurtle(screen=self.screen)
+        instant.speed(0)
+        instant.circle(80, extent=270, steps=100)
+
+        self.assertEqual(instant._position, animated._position)
+        self.assertEqual(instant._orient, animated._orient)
+        lines = [
+            item for item in instant.items
+            if len(self.screen.cv.coords(item)) > 4
+        ]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(len(self.screen.cv.coords(lines[0])), 2 * 101)
+
+    def test_instant_circle_async(self):
+        """
+        Test that a non-animated AsyncTurtle circle matches an
+        animated one and fills the same path.
+        """
+        animated = AsyncTurtle(loop=self.loop, screen=self.screen)
+        animated.begin_fill()
+        instant = AsyncTurtle(loop=self.loop, screen=self.screen)
+        instant.speed(0)
+        instant.begin_fill()
+        self.loop.run_until_complete(animated.circle(-40, extent=200))
+        self.loop.run_until_complete(instant.circle(-40, extent=200))
+        self.assertEqual(instant._position, animated._position)
+        self.assertEqual(instant._orient, animated._orient)
+        self.assertEqual(instant._fillpath, animated._fillpath)
@@ -0,0 +1,88 @@
+"""
+_test_metrics_
+
+Unit tests for the runtime statistics.
+"""
+import asyncio
+import unittest
+
+from aioturtle import AsyncTurtle, runtime_stats
+from aioturtle.metrics import Histogram
+
+from .support import HeadlessTestCase
+
+
+class HistogramTests(unittest.TestCase):
+    """
+    Tests for the Histogram class
+    """
+    def test_summary(self):
+        """
+        Test counts, mean, max and bucketed percentiles.
+        """
+        hist = Histogram()
+        for _ in range(99):
+            hist.add(0.001)
+        hist.add(0.5)
+        self.assertEqual(hist.count, 100)
+        self.assertAlmostEqual(hist.mean, (0.099 + 0.5) / 100)
+        self.assertEqual(hist.max, 0.5)
+        # 1ms falls in the bucket bounded by 2**10 microseconds
+        self.assertAlmostEqual(hist.percentile(50), 1.024e-3)
+        self.assertAlmostEqual(hist.percentile(100), 0.5)
+
+    def test_negative_and_overflow(self):
+        """
+        Test that negative durations count as zero and that huge
+        ones land in the overflow bucket.
+        """
+        hist = Histogram()
+        hist.add(-1.0)
+        hist.add(100.0)
+        self.assertEqual(hist.counts[0], 1)
+        self.assertEqual(hist.counts[-1], 1)
+        self.assertEqual(hist.percentile(99), 100.0)
+
+
+class RuntimeStatsTests(HeadlessTestCase):
+    """
+    Tests for statistics collected from running turtles
+    """
+    def setUp(self):
+        super().setUp()
+        runtime_stats.reset()
+
+    def test_turtle_statistics(self):
+        """
+        Test that steps, lock waits, step lateness and graphics
+        updates are recorded for contending turtle coroutines.
+        """
+        pet = AsyncTurtle(name='pet', loop=self.loop, screen=self.screen)
+        pet.speed(3)
+        tasks = [pet.fd(30), pet.fd(30)]
+        self.loop.run_until_complete(asyncio.wait(tasks, loop=self.loop))
+        # 9 animated steps for each move
+        self.assertEqual(pet.steps, 18)
+        self.assertEqual(runtime_stats.lock_wait.count, 2)
+        self.assertGreater(pet.lock_wait, 0.0)
+        self.assertEqual(runtime_stats.timer_lateness.count, 18)
+        self.assertEqual(runtime_stats.update_graphics.count, 20)
+
+        report = runtime_stats.report(self.screen.turtles())
+        self.assertIn('pet', report)
+        stats = runtime_stats.as_dict(self.screen.turtles())
+        self.assertEqual(stats['turtles'][0]['steps'], 18)
+
+    def test_disabled(self):
+        """
+        Test that nothing but step counts is recorded when disabled.
+        """
+        runtime_stats.enabled = False
+        try:
+            pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+            self.loop.run_until_complete(pet.fd(30))
+        finally:
+            runtime_stats.enabled = True
+        self.assertGreater(pet.steps, 0)
+        self.assertEqual(runtime_stats.lock_wait.count, 0)
+        self.assertEqual(runtime_stats.update_graphics.count, 0)
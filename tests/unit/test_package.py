@@ -0,0 +1,57 @@
+"""
+_test_package_
+
+Unit tests for the lazily imported package namespace.
+"""
+import subprocess
+import sys
+import unittest
+
+import aioturtle
+
+
+class PackageTests(unittest.TestCase):
+    """
+    Tests for the public names of the aioturtle package
+    """
+    def test_public_names(self):
+        """
+        Test that every public name resolves and unknown names
+        raise AttributeError.
+        """
+        for name in aioturtle.__all__:
+            self.assertIsNotNone(getattr(aioturtle, name))
+            self.assertIn(name, dir(aioturtle))
+        from aioturtle import AsyncTurtle
+        self.assertIs(AsyncTurtle, aioturtle.aioturtle.AsyncTurtle)
+        with self.assertRaises(AttributeError):
+            aioturtle.NoSuchTurtle
+
+    def test_tk_free_import(self):
+        """
+        Test that the package, its geometry and path compiler can
+        be imported without importing turtle or tkinter.
+        """
+        loaded = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, aioturtle, aioturtle.geometry, aioturtle.paths; '
+            'print(sorted({"turtle", "tkinter"} & set(sys.modules)))'
+        ])
+        self.assertEqual(loaded.strip(), b'[]')
+
+    def test_tk_free_headless_modules(self):
+        """
+        Test that the modules which do not depend on turtle can be
+        imported without importing tkinter. The rest import it with
+        turtle.
+        """
+        loaded = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, aioturtle.tkloop, aioturtle.refresh, '
+            'aioturtle.frameclock, aioturtle.detail, aioturtle.threads, '
+            'aioturtle.registry, aioturtle.colors, aioturtle.metrics, '
+            'aioturtle.tracing, aioturtle.virtualtime; '
+            'print(sorted({"turtle", "tkinter", "_tkinter"} & '
+            'set(sys.modules)))'
+        ])
+        self.assertEqual(loaded.strip(), b'[]')
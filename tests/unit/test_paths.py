@@ -0,0 +1,123 @@
+"""
+_test_paths_
+
+Unit tests for compiled paths followed by AsyncTurtles.
+"""
+import concurrent.futures
+
+from aioturtle import AsyncTurtle, BlockingTurtle, LSystem, PathStream
+from aioturtle.paths import VERTEX_SIZE, compile_chunk, expand_lsystem
+
+from .support import HeadlessTestCase
+
+
+PROGRAM = [
+    ('fd', 37.3), ('lt', 33.3), ('circle', 41.7, 250), ('pu',),
+    ('bk', 12.1), ('pd',), ('rt', 71.9), ('circle', -20, None, 7),
+    ('push',), ('fd', 30), ('pop',), ('move', 5), ('fd', 1.1),
+]
+
+
+class PathTests(HeadlessTestCase):
+    """
+    Tests for PathStream and AsyncTurtle.follow_path
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def step_by_step(self):
+        """
+        Run PROGRAM with the turtle methods, returning the turtle.
+        """
+        pet = BlockingTurtle(screen=self.screen)
+        pet.speed(0)
+        stack = []
+        for op in PROGRAM:
+            verb, args = op[0], op[1:]
+            if verb == 'push':
+                stack.append((pet.position(), pet._orient, pet.isdown()))
+            elif verb == 'pop':
+                pet.up()
+                pos, orient, down = stack.pop()
+                pet.goto(pos)
+                pet._orient = orient
+                pet.pen(pendown=down)
+            elif verb == 'move':
+                down = pet.isdown()
+                pet.up()
+                pet.fd(*args)
+                pet.pen(pendown=down)
+            else:
+                getattr(pet, verb)(*args)
+        return pet
+
+    def follow(self, source, **kwargs):
+        pet = AsyncTurtle(screen=self.screen, loop=self.loop)
+        self.loop.run_until_complete(pet.follow_path(
+            source, executor=self.executor, **kwargs
+        ))
+        return pet
+
+    def assert_identical(self, pet, other):
+        self.assertEqual(tuple(pet._position), tuple(other._position))
+        self.assertEqual(tuple(pet._orient), tuple(other._orient))
+        self.assertEqual(pet.isdown(), other.isdown())
+
+    def test_expand_lsystem(self):
+        self.assertEqual(
+            expand_lsystem('F', {'F': 'F+F'}, 2), 'F+F+F+F'
+        )
+
+    def test_compile_chunk_vertices(self):
+        chunk, state = compile_chunk([('fd', 10), ('lt', 90)], (
+            0.0, 0.0, 1.0, 0.0, 1.0, []
+        ))
+        self.assertEqual(len(chunk), 2 * VERTEX_SIZE)
+        self.assertEqual(list(chunk[:VERTEX_SIZE]), [10.0, 0.0, 1.0, 0.0, 1.0])
+        self.assertEqual(state[:2], (10.0, 0.0))
+
+    def test_follow_path_identical(self):
+        """
+        Test that following the compiled program, in several chunks
+        and without animation, ends exactly where running it does.
+        """
+        self.screen.tracer(0)
+        expected = self.step_by_step()
+        pet = self.follow(PROGRAM, chunk_size=4)
+        self.assert_identical(pet, expected)
+
+    def test_follow_path_animated(self):
+        """
+        Test that an animated follow ends in the same place too.
+        """
+        expected = self.step_by_step()
+        pet = self.follow(PROGRAM)
+        self.assert_identical(pet, expected)
+        self.assertGreater(pet.steps, 0)
+
+    def test_lsystem(self):
+        """
+        Test that an L-system is expanded and followed, leaving the
+        stack balanced.
+        """
+        self.screen.tracer(0)
+        plant = LSystem('X', {'X': 'F+[[X]-X]-F[-FX]+X', 'F': 'FF'}, 25, 2, 3)
+        pet = AsyncTurtle(screen=self.screen, loop=self.loop)
+        stream = PathStream(
+            plant, pet, executor=self.executor, loop=self.loop,
+            chunk_size=50
+        )
+
+        async def count():
+            chunks = 0
+            async for chunk in stream:
+                chunks += 1
+            return chunks
+        self.assertGreater(self.loop.run_until_complete(count()), 1)
+        self.assertEqual(stream._state[5], [])
+        self.follow(plant)
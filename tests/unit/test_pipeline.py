@@ -0,0 +1,92 @@
+"""
+_test_pipeline_
+
+Unit tests for the CommandPipeline per-turtle command queue.
+"""
+import asyncio
+
+from aioturtle import AsyncTurtle, CommandPipeline
+
+from .support import HeadlessTestCase
+
+
+class CommandPipelineTests(HeadlessTestCase):
+    """
+    Tests for the CommandPipeline class
+    """
+    def setUp(self):
+        """
+        Fresh event loop and a pipelined turtle on a headless
+        screen with no delay
+        """
+        super().setUp()
+        self.pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        self.pipe = CommandPipeline(self.pet)
+
+    def test_merged_commands(self):
+        """
+        Test that adjacent moves and rotations are merged and that
+        every submitted command's future is resolved.
+        """
+        futures = [
+            self.pipe.fd(10),
+            self.pipe.forward(20),
+            self.pipe.lt(5),
+            self.pipe.right(-40),
+            self.pipe.left(45),
+            self.pipe.bk(5),
+        ]
+        self.loop.run_until_complete(self.pipe.drain())
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(self.pipe.submitted, 6)
+        self.assertEqual(self.pipe.executed, 3)
+        self.assertAlmostEqual(self.pet.xcor(), 30.0)
+        self.assertAlmostEqual(self.pet.ycor(), -5.0)
+        self.assertAlmostEqual(self.pet.heading(), 90.0)
+
+    def test_opposite_moves_not_merged(self):
+        """
+        Test that a move back over a drawn line is not merged away.
+        """
+        self.pipe.fd(50)
+        self.pipe.back(50)
+        self.loop.run_until_complete(self.pipe.drain())
+        self.assertEqual(self.pipe.executed, 2)
+        self.assertEqual(
+            self.screen.cv.coords(self.pet.currentLineItem),
+            [0.0, 0.0, 50.0, 0.0, 0.0, 0.0]
+        )
+
+    def test_synchronous_commands_in_order(self):
+        """
+        Test that queued synchronous methods run between the moves
+        they were submitted between.
+        """
+        self.pipe.fd(10)
+        self.pipe.submit('penup')
+        self.pipe.fd(10)
+        isdown = self.pipe.submit('isdown')
+        self.loop.run_until_complete(self.pipe.drain())
+        self.assertFalse(isdown.result())
+        self.assertEqual(self.pipe.executed, 4)
+        self.assertAlmostEqual(self.pet.xcor(), 20.0)
+
+    def test_pipeline_shares_turtle_lock(self):
+        """
+        Test that pipelined commands and direct coroutine calls on
+        the same turtle are serialized and both complete.
+        """
+        direct = asyncio.ensure_future(self.pet.circle(20), loop=self.loop)
+        moved = self.pipe.goto(0, 100)
+        self.loop.run_until_complete(asyncio.wait(
+            [direct, moved], loop=self.loop
+        ))
+        self.assertAlmostEqual(self.pet.ycor(), 100.0)
+
+    def test_coroutine_submit_rejected(self):
+        """
+        Test that coroutines other than the pipelined moves cannot be
+        submitted, as they would wait on the held lock.
+        """
+        with self.assertRaises(ValueError):
+            self.pipe.submit('_goto', (0, 0))
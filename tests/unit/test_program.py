@@ -0,0 +1,122 @@
+"""
+_test_program_
+
+Unit tests for running batched turtle programs.
+"""
+import array
+import asyncio
+
+from aioturtle import (
+    AsyncTurtle, BlockingTurtle, HeadlessScreen, runtime_stats
+)
+from aioturtle.aioturtle import PROGRAM_OPCODES
+
+from .support import HeadlessTestCase
+
+
+PROGRAM = [
+    ('fd', 100), ('left', 72.5), ('pencolor', 'red'), ('bk', 30.25),
+    ('pu',), ('rt', 13), ('goto', (10, -20)), ('pd',), ('seth', 200),
+    ('circle', 25, 90), ('forward', 12.5), ('goto', 3.5, 7),
+]
+
+
+class ProgramTests(HeadlessTestCase):
+    """
+    Tests for AsyncTurtle.run_program and BlockingTurtle.run_program
+    """
+    def setUp(self):
+        """
+        Fresh event loop and headless screen with no delay
+        """
+        super().setUp()
+        runtime_stats.reset()
+
+    def reference(self, ops, speed):
+        """
+        Run ops one call at a time on a fresh BlockingTurtle.
+        """
+        pet = BlockingTurtle(screen=HeadlessScreen())
+        pet.screen.delay(delay=0)
+        pet.speed(speed)
+        for op in ops:
+            getattr(pet, op[0])(*op[1:])
+        return pet
+
+    def assertSameState(self, pet, expected):
+        self.assertEqual(pet.pos(), expected.pos())
+        self.assertEqual(tuple(pet._orient), tuple(expected._orient))
+        self.assertEqual(pet.isdown(), expected.isdown())
+        self.assertEqual(pet.pencolor(), expected.pencolor())
+
+    def test_instant_program(self):
+        """
+        Test that a program run without animation ends exactly as
+        calling each method would, with one lock acquisition.
+        """
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        pet.speed(0)
+        before = self.screen.cv.ops['update']
+        self.loop.run_until_complete(pet.run_program(PROGRAM))
+        self.assertSameState(pet, self.reference(PROGRAM, 0))
+        self.assertEqual(runtime_stats.lock_wait.count, 1)
+        self.assertLess(self.screen.cv.ops['update'] - before, len(PROGRAM))
+
+    def test_animated_program(self):
+        """
+        Test that an animated program ends as calling each method
+        would.
+        """
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        pet.speed(5)
+        self.loop.run_until_complete(pet.run_program(PROGRAM))
+        self.assertSameState(pet, self.reference(PROGRAM, 5))
+        self.assertEqual(runtime_stats.lock_wait.count, 1)
+
+    def test_blocking_program(self):
+        """
+        Test BlockingTurtle.run_program with an opcode array.
+        """
+        codes = {verb: code for code, verb in enumerate(PROGRAM_OPCODES)}
+        ops = [('forward', 50), ('left', 30), ('penup', 0),
+               ('back', 20), ('pendown', 0), ('setheading', 45)]
+        program = array.array('d')
+        for verb, arg in ops:
+            program.extend((codes[verb], arg))
+        pet = BlockingTurtle(screen=self.screen)
+        pet.speed(0)
+        pet.run_program(program)
+        reference = [op[:1] if op[0].startswith('pen') else op for op in ops]
+        self.assertSameState(pet, self.reference(reference, 0))
+
+    def test_yield_points(self):
+        """
+        Test that other tasks run between yield points.
+        """
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        pet.speed(0)
+        seen = []
+
+        async def watch():
+            while len(seen) < 3:
+                seen.append(pet.xcor())
+                await asyncio.sleep(0, loop=self.loop)
+
+        self.loop.run_until_complete(asyncio.gather(
+            pet.run_program([('fd', 10)] * 30, yield_every=10),
+            watch(), loop=self.loop
+        ))
+        self.assertEqual(seen, [100.0, 200.0, 300.0])
+
+    def test_unknown_operation(self):
+        """
+        Test that an unknown or private operation is rejected
+        before anything runs.
+        """
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        for bad in ('jump', '_goto', 'circle_'):
+            with self.assertRaises(ValueError):
+                self.loop.run_until_complete(
+                    pet.run_program([('fd', 10), (bad, 1)])
+                )
+        self.assertEqual(pet.pos(), (0, 0))
@@ -0,0 +1,120 @@
+"""
+_test_raster_
+
+Unit tests for the numpy Rasterizer.
+"""
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import zlib
+
+from aioturtle import BlockingTurtle, HeadlessScreen, Rasterizer
+from aioturtle.raster import color_rgb, np
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class RasterizerTests(unittest.TestCase):
+    """
+    Tests for the Rasterizer class
+    """
+    def setUp(self):
+        """
+        Non-animated turtle on a headless screen, drawn by a
+        rasterizer of the same size
+        """
+        self.screen = HeadlessScreen(width=100, height=80)
+        self.screen.tracer(0)
+        self.pet = BlockingTurtle(screen=self.screen)
+        self.raster = Rasterizer(width=100, height=80)
+        self.raster.attach(self.pet)
+
+    def test_color_rgb(self):
+        self.assertEqual(color_rgb('#f80'), (255, 136, 0))
+        self.assertEqual(color_rgb('#102030'), (16, 32, 48))
+        self.assertEqual(color_rgb('Red'), (255, 0, 0))
+        self.assertEqual(color_rgb('dark blue'), (0, 0, 139))
+        self.assertEqual(color_rgb('LightGoldenrod3'), (205, 190, 112))
+        self.assertEqual(color_rgb('#fff000fff'), (255, 0, 255))
+        with self.assertRaises(ValueError):
+            color_rgb('no such color')
+        with self.assertRaises(ValueError):
+            color_rgb('#ggg')
+
+    def test_unknown_color_drawn_black(self):
+        """
+        Test that a move in a color no table knows completes, its
+        line drawn black.
+        """
+        self.pet.pencolor('no such color')
+        self.pet.pensize(3)
+        self.pet.fd(30)
+        pixels = np.asarray(self.raster.buffer)
+        self.assertEqual(tuple(pixels[40, 65]), (0, 0, 0, 255))
+        self.assertAlmostEqual(self.pet.xcor(), 30.0)
+
+    def test_line(self):
+        """
+        Test that a horizontal line covers the pixels along it and
+        leaves the background elsewhere.
+        """
+        self.pet.pencolor('red')
+        self.pet.pensize(3)
+        self.pet.fd(30)
+        pixels = np.asarray(self.raster.buffer)
+        self.assertEqual(self.raster.segments, 1)
+        # canvas center is between pixels 49 and 50, 39 and 40
+        self.assertEqual(tuple(pixels[40, 65]), (255, 0, 0, 255))
+        self.assertEqual(tuple(pixels[39, 65]), (255, 0, 0, 255))
+        self.assertEqual(tuple(pixels[20, 65]), (255, 255, 255, 255))
+        self.assertEqual(tuple(pixels[40, 40]), (255, 255, 255, 255))
+        # the pen edges are antialiased
+        self.assertTrue(0 < pixels[41, 65, 1] < 255)
+
+    def test_pen_up_not_drawn(self):
+        self.pet.up()
+        self.pet.fd(30)
+        self.raster.flush()
+        self.assertEqual(self.raster.segments, 0)
+        self.assertTrue((self.raster.pixels == 255).all())
+
+    def test_draw_segments(self):
+        """
+        Test that a large batch of segments is drawn in one call.
+        """
+        angles = np.linspace(0, 2 * np.pi, 10000)
+        segments = np.zeros((len(angles), 4))
+        segments[:, 2] = 30 * np.cos(angles)
+        segments[:, 3] = 30 * np.sin(angles)
+        self.raster.draw_segments(segments, color='blue')
+        self.assertEqual(self.raster.segments, 10000)
+        self.assertEqual(
+            tuple(self.raster.pixels[40, 60]), (0, 0, 255, 255)
+        )
+
+    def test_write_png(self):
+        """
+        Test that the PNG file holds the image.
+        """
+        self.pet.pensize(5)
+        self.pet.circle(20)
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'image.png')
+            self.raster.write_png(path)
+            with open(path, 'rb') as fh:
+                data = fh.read()
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual(data[:8], b'\x89PNG\r\n\x1a\n')
+        width, height = struct.unpack('>II', data[16:24])
+        self.assertEqual((width, height), (100, 80))
+        length, = struct.unpack('>I', data[33:37])
+        rows = np.frombuffer(
+            zlib.decompress(data[41:41 + length]), dtype=np.uint8
+        ).reshape(80, -1)
+        self.assertTrue((rows[:, 0] == 0).all())
+        self.assertTrue(
+            (rows[:, 1:].reshape(80, 100, 4) == self.raster.pixels).all()
+        )
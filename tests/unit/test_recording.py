@@ -0,0 +1,148 @@
+"""
+_test_recording_
+
+Unit tests for binary session recording and replay.
+"""
+import os
+import shutil
+import tempfile
+
+from aioturtle import AsyncTurtle, HeadlessScreen, Recorder, Replay
+
+from .support import HeadlessTestCase
+
+
+class RecordingTests(HeadlessTestCase):
+    """
+    Tests for the Recorder and Replay classes
+    """
+    def setUp(self):
+        """
+        Fresh event loop, headless screen with no delay and a
+        temporary log file
+        """
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'session.rec')
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.tmpdir)
+
+    def record_session(self):
+        """
+        Record a turtle drawing a filled square and a circle,
+        returning the turtle.
+        """
+        pet = AsyncTurtle(name='steve', loop=self.loop, screen=self.screen)
+        pet.up()
+        self.loop.run_until_complete(pet.goto(-20, 10))
+        with Recorder(self.path) as recorder:
+            recorder.attach(pet)
+            pet.down()
+            pet.color('red', 'blue')
+            pet.begin_fill()
+            for _ in range(4):
+                self.loop.run_until_complete(pet.fd(30))
+                self.loop.run_until_complete(pet.lt(90))
+            pet.end_fill()
+            pet.pensize(3)
+            self.loop.run_until_complete(pet.circle(15, extent=180))
+        return pet
+
+    def assert_same_turtle(self, pet, replayed):
+        self.assertEqual(replayed.name, pet.name)
+        self.assertAlmostEqual(replayed.xcor(), pet.xcor())
+        self.assertAlmostEqual(replayed.ycor(), pet.ycor())
+        self.assertAlmostEqual(replayed.heading(), pet.heading())
+        self.assertEqual(replayed.pen(), pet.pen())
+
+    def test_fixed_width_records(self):
+        """
+        Test that the log is a whole number of 32 byte records.
+        """
+        self.record_session()
+        self.assertEqual(os.path.getsize(self.path) % 32, 0)
+
+    def test_render(self):
+        """
+        Test that rendering a log without animation reproduces the
+        turtle state and the fill.
+        """
+        pet = self.record_session()
+        screen = HeadlessScreen()
+        with Replay(self.path) as replay:
+            turtles = replay.render(screen)
+        self.assertEqual(len(turtles), 1)
+        self.assert_same_turtle(pet, turtles[0])
+        fills = [
+            item for item in screen.items
+            if item.type == 'polygon' and item.options.get('fill') == 'blue'
+        ]
+        self.assertTrue(fills)
+
+    def test_render_onto_recorded_screen(self):
+        """
+        Test that a log renders onto the screen it was recorded on,
+        the replayed turtle being unnamed while the original lives
+        and named after the screen is cleared.
+        """
+        pet = self.record_session()
+        with Replay(self.path) as replay:
+            turtles = replay.render(self.screen)
+        self.assertIsNone(turtles[0].name)
+        self.assertAlmostEqual(turtles[0].xcor(), pet.xcor())
+        self.screen.clear()
+        with Replay(self.path) as replay:
+            turtles = replay.render(self.screen)
+        self.assert_same_turtle(pet, turtles[0])
+
+    def drawing(self, screen):
+        """
+        The types, coordinates and options of the items on screen
+        """
+        return [
+            (item.type, list(item.coords), item.options)
+            for item in screen.items
+        ]
+
+    def test_render_twice(self):
+        """
+        Test that a Replay renders the same drawing and turtles each
+        time, and plays them after a render.
+        """
+        pet = self.record_session()
+        screens = [HeadlessScreen(), HeadlessScreen(), HeadlessScreen()]
+        with Replay(self.path) as replay:
+            first = replay.render(screens[0])
+            strings = list(replay.strings)
+            second = replay.render(screens[1])
+            screens[2].delay(delay=0)
+            third = self.loop.run_until_complete(
+                replay.play(screens[2], time_scale=100.0, loop=self.loop)
+            )
+        self.assertEqual(self.drawing(screens[0]), self.drawing(screens[1]))
+        for turtles in (first, second, third):
+            self.assertEqual(len(turtles), 1)
+            self.assert_same_turtle(pet, turtles[0])
+        self.assertEqual(replay.strings, strings)
+
+    def test_play(self):
+        """
+        Test that an animated replay at high speed reaches the same
+        turtle state.
+        """
+        pet = self.record_session()
+        screen = HeadlessScreen()
+        screen.delay(delay=0)
+        with Replay(self.path) as replay:
+            turtles = self.loop.run_until_complete(
+                replay.play(screen, time_scale=100.0, loop=self.loop)
+            )
+        self.assert_same_turtle(pet, turtles[0])
+
+    def test_not_a_recording(self):
+        with open(self.path, 'wb') as fh:
+            fh.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            Replay(self.path)
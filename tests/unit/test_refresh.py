@@ -0,0 +1,79 @@
+"""
+_test_refresh_
+
+Unit tests for the RefreshBatcher coalesced refresh mode.
+"""
+import asyncio
+
+from aioturtle import AsyncTurtle, FrameClock, RefreshBatcher
+
+from .support import HeadlessTestCase
+
+
+class RefreshBatcherTests(HeadlessTestCase):
+    """
+    Tests for screens refreshed through a RefreshBatcher
+    """
+    def setUp(self):
+        """
+        Fresh event loop and headless screen with no delay
+        """
+        super().setUp()
+        self.pets = [
+            AsyncTurtle(loop=self.loop, screen=self.screen)
+            for _ in range(6)
+        ]
+
+    def run_moves(self):
+        """
+        Move all turtles forward concurrently and return the number
+        of canvas refreshes performed.
+        """
+        before = self.screen.cv.ops['update']
+        tasks = [pet.fd(30) for pet in self.pets]
+        self.loop.run_until_complete(asyncio.wait(tasks, loop=self.loop))
+        for pet in self.pets:
+            self.assertAlmostEqual(pet.pos()[0], 30.0)
+        return self.screen.cv.ops['update'] - before
+
+    def test_unbatched_refreshes(self):
+        """
+        Test that without batching every step of every turtle
+        refreshes the canvas.
+        """
+        # 9 animated steps and the finalized move for each turtle
+        self.assertEqual(self.run_moves(), 6 * 10)
+
+    def test_batched_refreshes(self):
+        """
+        Test that batched turtles sleeping independently share
+        refreshes.
+        """
+        batcher = RefreshBatcher(self.screen, loop=self.loop)
+        refreshes = self.run_moves()
+        self.assertLessEqual(refreshes, 10)
+        self.assertEqual(batcher.frames, refreshes)
+        batcher.close()
+
+    def test_batched_refreshes_with_clock(self):
+        """
+        Test that a FrameClock flushes the batcher once per tick.
+        """
+        batcher = RefreshBatcher(self.screen, loop=self.loop)
+        clock = FrameClock(self.screen, loop=self.loop)
+        # one flush per tick and one for the finalized moves
+        self.assertEqual(self.run_moves(), clock.ticks + 1)
+        clock.close()
+        batcher.close()
+
+    def test_batched_tracer(self):
+        """
+        Test that a tracer update marks every turtle for redrawing.
+        """
+        batcher = RefreshBatcher(self.screen, loop=self.loop)
+        self.screen.tracer(3)
+        self.screen._updatecounter = 2
+        self.pets[0]._update_graphics()
+        self.assertEqual(list(batcher._dirty), self.pets)
+        batcher.flush()
+        self.assertEqual(list(batcher._dirty), [])
@@ -0,0 +1,98 @@
+"""
+_test_registry_
+
+Unit tests for the named turtle registry and bulk prompt commands.
+"""
+
+from aioturtle import BlockingTurtle
+from aioturtle.aioturtle import TurtleCommands
+from aioturtle.registry import registry_for
+
+from .support import HeadlessTestCase
+
+
+class TurtleRegistryTests(HeadlessTestCase):
+    """
+    Tests for the TurtleRegistry and its use by TurtleCommands
+    """
+    def setUp(self):
+        """
+        Fresh event loop and headless screen with no delay, and
+        prompt commands for the screen
+        """
+        super().setUp()
+        self.commands = TurtleCommands(self.screen, loop=self.loop)
+        self.registry = registry_for(self.screen)
+
+    def test_lookup_and_removal(self):
+        """
+        Test that named turtles are indexed, unique and removed.
+        """
+        steve = BlockingTurtle(name='steve', screen=self.screen)
+        BlockingTurtle(screen=self.screen)
+        self.assertIs(self.commands.get_turtle('steve'), steve)
+        self.assertEqual(len(self.registry), 1)
+        with self.assertRaises(ValueError):
+            BlockingTurtle(name='steve', screen=self.screen)
+        self.assertEqual(len(self.screen.turtles()), 2)
+        steve.tag('flock')
+        steve.remove()
+        self.assertEqual(len(self.screen.turtles()), 1)
+        self.assertNotIn('steve', self.registry)
+        self.assertEqual(self.registry.group('flock'), [])
+        with self.assertRaises(Exception):
+            self.commands.get_turtle('steve')
+
+    def test_screen_clear(self):
+        """
+        Test that turtles dropped by clearing the screen are dropped
+        from the registry, so their names may be used again.
+        """
+        self.commands.execute('new steve')
+        self.commands.execute('steve tag flock')
+        self.screen.clear()
+        with self.assertRaises(Exception):
+            self.commands.get_turtle('steve')
+        self.assertEqual(self.registry.group('flock'), [])
+        self.commands.execute('new steve')
+        self.assertIs(
+            self.commands.get_turtle('steve'), self.screen.turtles()[0]
+        )
+
+    def test_groups(self):
+        pets = [
+            BlockingTurtle(name='pet{0}'.format(idx), screen=self.screen)
+            for idx in range(4)
+        ]
+        pets[0].tag('even', 'all')
+        pets[2].tag('even')
+        pets[0].untag('all')
+        self.assertEqual(self.registry.group('even'), [pets[0], pets[2]])
+        self.assertEqual(self.registry.tags(pets[0]), {'even'})
+        self.assertEqual(self.registry.select('pet[13]'), [pets[1], pets[3]])
+        with self.assertRaises(KeyError):
+            self.registry.select('@all')
+
+    def test_bulk_commands(self):
+        """
+        Test that group and glob addressed commands fan out to every
+        turtle addressed, for both functions and coroutines.
+        """
+        for name in ['bot1', 'bot2', 'steve']:
+            self.commands.execute('new {0}'.format(name))
+        with self.assertRaises(ValueError):
+            self.commands.execute('new steve')
+        self.commands.execute('steve tag flock')
+        self.commands.execute('bot1 tag flock')
+        self.commands.execute('@flock up')
+        self.assertEqual(
+            self.commands.execute('bot* isdown'), '[False, True]'
+        )
+        future = self.commands.command_turtle(['@flock', 'fd', '10'])
+        self.loop.run_until_complete(future)
+        self.assertEqual(
+            [turt.xcor() for turt in self.screen.turtles()],
+            [10.0, 0.0, 10.0]
+        )
+        with self.assertRaises(Exception):
+            self.commands.execute('@nobody fd 10')
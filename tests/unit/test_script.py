@@ -0,0 +1,113 @@
+"""
+_test_script_
+
+Unit tests for compiled command scripts.
+"""
+
+from aioturtle import AsyncTurtle, Script, ScriptError
+from aioturtle.script import parse_arg
+
+from .support import HeadlessTestCase
+
+
+SCRIPT = """
+# two turtles drawing squares
+new steve; new bob
+steve pu; steve goto -50 0; steve pd
+bob color red
+steve fd 20
+steve lt 90.0
+steve fd 20
+bob circle 10
+steve xcor
+stats
+carl fd 10
+quit
+steve fd 1000
+"""
+
+
+class ScriptTests(HeadlessTestCase):
+    """
+    Tests for the Script class
+    """
+    def test_parse_arg(self):
+        self.assertEqual(parse_arg('10'), 10)
+        self.assertEqual(parse_arg('-2.5e1'), -25.0)
+        self.assertEqual(parse_arg('.5'), 0.5)
+        self.assertEqual(parse_arg('red'), 'red')
+        self.assertEqual(parse_arg('1e'), '1e')
+
+    def test_compile(self):
+        """
+        Test that commands are compiled into per-turtle programs
+        split into phases at screen commands, up to quit.
+        """
+        script = Script(SCRIPT)
+        self.assertEqual(script.names, ['steve', 'bob', 'carl'])
+        self.assertEqual(script.lines, [3, 3, 12])
+        self.assertEqual(len(script.phases), 2)
+        programs, screen_command = script.phases[0]
+        self.assertEqual(screen_command, 'stats')
+        self.assertEqual(len(programs[0]), 8)
+        self.assertEqual(programs[0][2].args, (-50, 0))
+        self.assertEqual(programs[0][5].args, (90.0,))
+        self.assertEqual(len(script), 12)
+
+    def test_compile_errors(self):
+        for source in ['new', 'steve', 'steve fly', 'steve _goto 1 1']:
+            with self.assertRaises(ScriptError):
+                Script('new steve\n' + source)
+
+    def test_use_before_new(self):
+        """
+        Test that a turtle used before it is created is rejected
+        at the line of its first use.
+        """
+        with self.assertRaises(ScriptError) as caught:
+            Script('new steve\nbob fd 10\nstats\nnew bob')
+        self.assertEqual(caught.exception.lineno, 2)
+
+    def test_run(self):
+        """
+        Test that a script runs with existing and new turtles and
+        reports results in order.
+        """
+        carl = AsyncTurtle(name='carl', screen=self.screen, loop=self.loop)
+        output = []
+        script = Script(SCRIPT)
+        self.loop.run_until_complete(script.run(
+            self.screen, loop=self.loop, concurrency=1, output=output.append
+        ))
+        steve, bob = self.screen.turtles()[1:]
+        self.assertEqual(output[0], -30.0)
+        self.assertTrue(output[1].startswith('lock wait'))
+        self.assertAlmostEqual(steve.ycor(), 20.0)
+        self.assertEqual(bob.pencolor(), 'red')
+        self.assertAlmostEqual(carl.xcor(), 10.0)
+
+    def test_run_error(self):
+        """
+        Test that a failing command is reported with its line.
+        """
+        script = Script('new steve\nsteve fd 10\nsteve fd ten')
+        with self.assertRaises(ScriptError) as caught:
+            self.loop.run_until_complete(
+                script.run(self.screen, loop=self.loop)
+            )
+        self.assertEqual(caught.exception.lineno, 3)
+
+    def test_run_unknown_turtle(self):
+        """
+        Test that a name neither created nor on the screen is
+        reported with the line of its first use before anything
+        runs.
+        """
+        script = Script('new steve\nsteve fd 10\n\ncarl fd 10')
+        with self.assertRaises(ScriptError) as caught:
+            self.loop.run_until_complete(
+                script.run(self.screen, loop=self.loop)
+            )
+        self.assertEqual(caught.exception.lineno, 4)
+        self.assertIn('unknown turtle carl', str(caught.exception))
+        self.assertEqual(self.screen.turtles(), [])
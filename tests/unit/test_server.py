@@ -0,0 +1,138 @@
+"""
+_test_server_
+
+Unit tests for the networked PromptServer.
+"""
+import asyncio
+
+from aioturtle import PromptServer
+from aioturtle.server import PromptSession
+
+from .support import HeadlessTestCase
+
+
+class StalledWriter:
+    """
+    Stream writer of a client that does not read, whose drain
+    waits until ready is set
+    """
+    def __init__(self, loop):
+        self.written = []
+        self.ready = asyncio.Event(loop=loop)
+
+    def write(self, data):
+        self.written.append(data)
+
+    async def drain(self):
+        await self.ready.wait()
+
+    def close(self):
+        pass
+
+
+class PromptServerTests(HeadlessTestCase):
+    """
+    Tests for the PromptServer class over TCP on localhost
+    """
+    def setUp(self):
+        """
+        Fresh event loop and a server for a headless screen with
+        no delay, listening on a free port
+        """
+        super().setUp()
+        self.server = PromptServer(
+            screen=self.screen, loop=self.loop, max_queue=2
+        )
+        server = self.loop.run_until_complete(self.server.start())
+        self.port = server.sockets[0].getsockname()[1]
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.server.close())
+        super().tearDown()
+
+    def converse(self, lines, replies):
+        """
+        Send all lines in one write and read back the given number
+        of replies, returning them as lists of lines.
+        """
+        async def client():
+            reader, writer = await asyncio.open_connection(
+                '127.0.0.1', self.port, loop=self.loop
+            )
+            writer.write(''.join(line + '\n' for line in lines).encode())
+            result = []
+            for _ in range(replies):
+                reply = []
+                while True:
+                    line = (await reader.readline()).decode().rstrip('\n')
+                    reply.append(line)
+                    if line == 'ok' or line.startswith('!'):
+                        break
+                result.append(reply)
+            writer.close()
+            return result
+        return self.loop.run_until_complete(client())
+
+    def test_pipelined_commands(self):
+        """
+        Test that commands sent together, including several on one
+        line, each get a reply in order.
+        """
+        replies = self.converse(
+            ['new steve; steve up', 'steve isdown', 'steve fly'], 4
+        )
+        self.assertEqual(replies[0], ['ok'])
+        self.assertEqual(replies[1], ['ok'])
+        self.assertEqual(replies[2], ['= False', 'ok'])
+        self.assertTrue(replies[3][0].startswith('! '))
+
+    def test_private_attributes_rejected(self):
+        """
+        Test that attributes starting with an underscore cannot be
+        run as commands, on one turtle or on several.
+        """
+        replies = self.converse([
+            'new steve', 'steve _goto (10, 10)', 'steve __class__',
+            'st* _update_graphics', 'steve pos'
+        ], 5)
+        for reply in replies[1:4]:
+            self.assertEqual(len(reply), 1)
+            self.assertTrue(reply[0].startswith('! Unknown command _'))
+        self.assertEqual(replies[4], ['= (0.00,0.00)', 'ok'])
+
+    def test_sessions_share_screen(self):
+        """
+        Test that turtles created in one session can be driven
+        from another, and that sessions end on quit.
+        """
+        self.converse(['new steve', 'quit'], 2)
+        self.converse(['steve penup'], 1)
+        self.assertFalse(self.screen.turtles()[0].isdown())
+        self.loop.run_until_complete(asyncio.sleep(0.1, loop=self.loop))
+        self.assertEqual(self.server.sessions, {})
+
+    def test_backpressure(self):
+        """
+        Test that a client sending many more commands than the
+        queue holds gets every reply.
+        """
+        lines = ['new steve'] + ['steve xcor'] * 200
+        replies = self.converse(lines, len(lines))
+        self.assertEqual(replies[-1], ['= 0.0', 'ok'])
+
+    def test_drain_after_every_reply(self):
+        """
+        Test that no further command is executed while the reply
+        to the previous one is waiting to drain.
+        """
+        writer = StalledWriter(self.loop)
+        session = PromptSession(self.server, None, writer, 0)
+        session.queue.put_nowait('new steve')
+        session.queue.put_nowait('steve xcor')
+        worker = asyncio.ensure_future(session._work(), loop=self.loop)
+        self.loop.run_until_complete(asyncio.sleep(0.01, loop=self.loop))
+        self.assertEqual(writer.written, [b'ok\n'])
+        writer.ready.set()
+        session.queue.put_nowait(None)
+        self.loop.run_until_complete(worker)
+        self.assertEqual(writer.written, [b'ok\n', b'= 0.0\n', b'ok\n'])
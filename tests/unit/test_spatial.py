@@ -0,0 +1,114 @@
+"""
+_test_spatial_
+
+Unit tests for the SpatialIndex of turtle positions.
+"""
+import random
+
+from aioturtle import AsyncTurtle, SpatialIndex, TurtleObserver
+
+from .support import HeadlessTestCase
+
+
+class SpatialIndexTests(HeadlessTestCase):
+    """
+    Tests for neighbor, nearest and collision queries
+    """
+    def setUp(self):
+        """
+        Fresh event loop and headless screen with no delay
+        """
+        super().setUp()
+        self.rng = random.Random(7)
+
+    def scatter(self, count):
+        """
+        Create count turtles at random positions, moved there
+        without animation.
+        """
+        rng = self.rng
+        pets = []
+        for _ in range(count):
+            pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+            pet.speed(0)
+            self.loop.run_until_complete(
+                pet.goto(rng.uniform(-300, 300), rng.uniform(-300, 300))
+            )
+            pets.append(pet)
+        return pets
+
+    def test_queries_match_brute_force(self):
+        """
+        Test that neighbors and nearest agree with distances to
+        every turtle, for turtles created before and after the
+        index.
+        """
+        pets = self.scatter(100)
+        index = SpatialIndex(self.screen, cell_size=40, loop=self.loop)
+        pets += self.scatter(100)
+        self.assertEqual(len(index), 200)
+        for pet in pets[::17]:
+            others = sorted(
+                (other for other in pets if other is not pet),
+                key=pet.distance
+            )
+            self.assertEqual(
+                index.neighbors(pet, 75),
+                [other for other in others if pet.distance(other) <= 75]
+            )
+            self.assertEqual(index.nearest(pet, 5), others[:5])
+        self.assertEqual(len(index.nearest((0, 0), 500)), 200)
+
+        pets[0].remove()
+        self.assertNotIn(pets[0], index)
+        index.close()
+        self.assertFalse(hasattr(self.screen, 'spatial_index'))
+
+    def test_index_follows_animation(self):
+        """
+        Test that the index is updated at every animation step.
+        """
+        index = SpatialIndex(self.screen, cell_size=10, loop=self.loop)
+        pet, post = [
+            AsyncTurtle(loop=self.loop, screen=self.screen)
+            for _ in range(2)
+        ]
+        pet.speed(1)
+        self.loop.run_until_complete(post.goto(50, 0))
+        seen = []
+
+        class Watch(TurtleObserver):
+            def on_step(self, turt):
+                seen.append(index.neighbors(post, 15) == [pet])
+
+        pet.add_observer(Watch())
+        self.loop.run_until_complete(pet.fd(100))
+        # within 15 of the post for 31 of the 99 animation steps
+        self.assertEqual(len(seen), 99)
+        self.assertEqual(seen.count(True), 31)
+
+    def test_collisions(self):
+        """
+        Test that each new contact is reported once to callbacks
+        and to a waiting coroutine.
+        """
+        index = SpatialIndex(
+            self.screen, cell_size=20, collision_radius=5, loop=self.loop
+        )
+        pet, post = [
+            AsyncTurtle(loop=self.loop, screen=self.screen)
+            for _ in range(2)
+        ]
+        pet.speed(2)
+        self.loop.run_until_complete(post.goto(50, 0))
+        hits = []
+        index.on_collision(lambda first, second: hits.append((first, second)))
+        waiting = index.collision(post)
+        self.loop.run_until_complete(pet.fd(100))
+        self.assertEqual(hits, [(pet, post)])
+        self.assertEqual(waiting.result(), (pet, post))
+        self.assertEqual(index.contacts(post), set())
+
+        self.loop.run_until_complete(pet.bk(50))
+        self.assertEqual(index.contacts(post), {pet})
+        self.assertEqual(len(hits), 2)
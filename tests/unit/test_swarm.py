@@ -0,0 +1,173 @@
+"""
+_test_swarm_
+
+Unit tests for the numpy backed TurtleSwarm.
+"""
+import unittest
+
+from aioturtle import AsyncTurtle, TurtleSwarm
+from aioturtle.swarm import np
+
+from .support import HeadlessTestCase
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TurtleSwarmTests(HeadlessTestCase):
+    """
+    Tests for the TurtleSwarm class
+    """
+    def setUp(self):
+        """
+        Fresh event loop and a swarm on a headless screen with
+        no delay
+        """
+        super().setUp()
+        self.swarm = TurtleSwarm(100, screen=self.screen, loop=self.loop)
+
+    def test_forward_with_mask(self):
+        """
+        Test that a masked move only moves the selected turtles
+        and records one segment per moved turtle.
+        """
+        mask = np.arange(100) % 2 == 0
+        self.loop.run_until_complete(self.swarm.fd(30, mask=mask))
+        pos = self.swarm.pos()
+        np.testing.assert_allclose(pos[mask], [[30.0, 0.0]] * 50)
+        np.testing.assert_allclose(pos[~mask], [[0.0, 0.0]] * 50)
+        self.assertEqual(self.swarm.segments.shape, (50, 4))
+
+    def test_rotation_and_heading(self):
+        """
+        Test left, right and setheading with per turtle angles.
+        """
+        angles = np.linspace(0, 180, 100)
+        self.loop.run_until_complete(self.swarm.left(angles))
+        np.testing.assert_allclose(self.swarm.heading(), angles, atol=1e-9)
+        self.loop.run_until_complete(self.swarm.setheading(270))
+        np.testing.assert_allclose(self.swarm.heading(), 270.0, atol=1e-9)
+        self.loop.run_until_complete(self.swarm.rt(90, mask=[0, 1]))
+        np.testing.assert_allclose(self.swarm.heading()[:3], [180, 180, 270])
+
+    def test_goto_points(self):
+        """
+        Test moving each turtle to its own point with the pen up.
+        """
+        self.swarm.penup()
+        targets = np.random.RandomState(0).uniform(-100, 100, (100, 2))
+        self.loop.run_until_complete(self.swarm.goto(targets))
+        np.testing.assert_allclose(self.swarm.pos(), targets)
+        self.assertEqual(self.swarm.segments.shape, (0, 4))
+
+    def test_circle_matches_async_turtle(self):
+        """
+        Test that a swarm circle ends where an AsyncTurtle circle
+        with the same parameters does.
+        """
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        self.loop.run_until_complete(pet.circle(50, extent=135))
+        self.loop.run_until_complete(self.swarm.circle(50, extent=135))
+        pos = self.swarm.pos()
+        np.testing.assert_allclose(pos[0], pet.pos())
+        np.testing.assert_allclose(self.swarm.heading()[0], pet.heading())
+
+    def test_circle_radius_per_turtle(self):
+        """
+        Test that full circles of different radii all return home.
+        """
+        radii = np.linspace(-100, 100, 100)
+        self.loop.run_until_complete(self.swarm.circle(radii))
+        np.testing.assert_allclose(self.swarm.pos(), 0.0, atol=1e-9)
+
+    def frames(self):
+        """
+        The pixel arrays of the image items on the screen
+        """
+        return [
+            item.options['image'] for item in self.screen.items
+            if isinstance(item.options.get('image'), np.ndarray)
+        ]
+
+    def test_screen_single_image_item(self):
+        """
+        Test that the whole swarm is drawn on the screen as one
+        image item showing its lines and its turtles.
+        """
+        self.loop.run_until_complete(self.swarm.left(
+            np.linspace(0, 360, 100, endpoint=False)
+        ))
+        self.loop.run_until_complete(self.swarm.fd(50))
+        self.loop.run_until_complete(self.swarm.circle(20))
+        types = [item.type for item in self.screen.items]
+        self.assertNotIn('line', types)
+        frames = self.frames()
+        self.assertEqual(len(frames), 1)
+        frame = frames[0]
+        self.assertEqual(frame.shape, (300, 400, 4))
+        # a turtle marker at the canvas position of turtle 0, and
+        # its line from the origin
+        np.testing.assert_array_equal(frame[150, 250], (0, 0, 0, 255))
+        self.assertGreater(frame[150, 225, 3], 0)
+        self.assertEqual(frame[10, 10, 3], 0)
+
+    def test_screen_clear_recreates_item(self):
+        """
+        Test that the swarm image item comes back after the screen
+        is cleared.
+        """
+        self.loop.run_until_complete(self.swarm.fd(10))
+        self.screen.clear()
+        self.loop.run_until_complete(self.swarm.fd(10))
+        self.assertEqual(len(self.frames()), 1)
+
+    def test_pencolor_per_turtle(self):
+        """
+        Test that a masked pencolor colors only the lines and
+        markers of the selected turtles.
+        """
+        heading = np.arange(100) % 4
+        self.swarm.pencolor('red', mask=heading == 0)
+        self.swarm.pencolor(np.tile((0, 0, 255), (25, 1)), mask=heading == 1)
+        np.testing.assert_array_equal(self.swarm.colors[:3], [
+            (255, 0, 0), (0, 0, 255), (0, 0, 0)
+        ])
+        self.swarm.pensize(3)
+        self.loop.run_until_complete(self.swarm.left(
+            np.arange(100) * 90.0
+        ))
+        self.loop.run_until_complete(self.swarm.fd(50))
+        frame = self.frames()[0]
+        np.testing.assert_array_equal(frame[150, 250], (255, 0, 0, 255))
+        np.testing.assert_array_equal(frame[100, 200], (0, 0, 255, 255))
+        np.testing.assert_array_equal(frame[150, 150], (0, 0, 0, 255))
+        self.assertEqual(tuple(frame[150, 225, :3]), (255, 0, 0))
+        self.assertEqual(tuple(frame[125, 200, :3]), (0, 0, 255))
+        with self.assertRaises(ValueError):
+            self.swarm.pencolor('no such color')
+
+    def test_segments_capped(self):
+        """
+        Test that only the last max_segments segments are kept.
+        """
+        swarm = TurtleSwarm(
+            10, screen=self.screen, loop=self.loop, max_segments=25
+        )
+        for step in range(8):
+            self.loop.run_until_complete(swarm.goto(np.full((10, 2), step)))
+        self.assertLessEqual(swarm._kept, 50)
+        segments = swarm.segments
+        self.assertEqual(segments.shape, (25, 4))
+        np.testing.assert_array_equal(segments[-1], (6, 6, 7, 7))
+
+    def test_frame_region(self):
+        """
+        Test that a frame only updates the region around the
+        turtles that moved.
+        """
+        swarm = TurtleSwarm(1, screen=self.screen, loop=self.loop)
+        self.loop.run_until_complete(swarm.fd(10))
+        self.loop.run_until_complete(swarm.fd(10))
+        x0, y0, x1, y1 = swarm._layer.region
+        self.assertLessEqual(x1 - x0, 16)
+        self.assertLessEqual(y1 - y0, 8)
+        self.assertLessEqual(x0, 210)
+        self.assertGreaterEqual(x1, 222)
@@ -0,0 +1,144 @@
+"""
+_test_threads_
+
+Unit tests for BlockingTurtles drawing from worker threads.
+"""
+import asyncio
+import concurrent.futures
+import threading
+
+from aioturtle import BlockingTurtle, CanvasMarshaller, RefreshBatcher
+from aioturtle.metrics import runtime_stats
+
+from .support import HeadlessTestCase
+
+
+class CanvasMarshallerTests(HeadlessTestCase):
+    """
+    Tests for canvas calls marshalled by a CanvasMarshaller
+    """
+    def setUp(self):
+        """
+        Fresh event loop and headless screen whose canvas records
+        the threads it is called from
+        """
+        super().setUp()
+        self.threads = set()
+        canvas = self.screen.cv
+        coords = canvas.coords
+
+        def recording_coords(*args):
+            self.threads.add(threading.get_ident())
+            return coords(*args)
+
+        canvas.coords = recording_coords
+        self.marshaller = CanvasMarshaller(self.screen, loop=self.loop)
+        self.executor = concurrent.futures.ThreadPoolExecutor(4)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.marshaller.close()
+        super().tearDown()
+
+    def test_turtles_in_threads(self):
+        """
+        Test that BlockingTurtles moving in worker threads draw
+        their lines, with every canvas call made on the main thread
+        and display refreshes coalesced.
+        """
+        pets = [BlockingTurtle(screen=self.screen) for _ in range(4)]
+
+        def draw(pet, angle):
+            pet.speed(3)
+            pet.lt(angle)
+            for _ in range(3):
+                pet.fd(30)
+                pet.lt(120)
+            return pet.pos()
+
+        self.threads.clear()
+        self.screen.cv.ops['update'] = 0
+        futures = [
+            self.loop.run_in_executor(self.executor, draw, pet, 90 * idx)
+            for idx, pet in enumerate(pets)
+        ]
+        results = self.loop.run_until_complete(
+            asyncio.gather(*futures, loop=self.loop)
+        )
+        for pos in results:
+            self.assertAlmostEqual(pos[0], 0.0)
+            self.assertAlmostEqual(pos[1], 0.0)
+        self.assertEqual(self.threads, {threading.get_ident()})
+        self.assertGreater(self.marshaller.batches, 0)
+        # every animated step of every turtle asks for a refresh
+        self.assertLess(self.screen.cv.ops['update'], 4 * (3 * 10 + 3 * 14))
+        for pet in pets:
+            line = self.screen.cv.items[pet.currentLineItem]
+            self.assertEqual(len(line.coords), 8)
+
+    def test_turtles_in_threads_batched(self):
+        """
+        Test that BlockingTurtles moving in worker threads on a
+        screen with a RefreshBatcher are redrawn by flushes on the
+        main thread, and that their statistics are all counted.
+        """
+        # in debug mode call_soon raises when called from a thread
+        # other than the one running the loop
+        self.loop.set_debug(True)
+        batcher = RefreshBatcher(self.screen, loop=self.loop)
+        pets = [BlockingTurtle(screen=self.screen) for _ in range(4)]
+        stats = runtime_stats.update_graphics
+        before = stats.count
+        flushed = set()
+        flush = batcher.flush
+
+        def recording_flush():
+            flushed.add(threading.get_ident())
+            flush()
+
+        batcher.flush = recording_flush
+
+        def draw(pet, angle):
+            pet.speed(3)
+            pet.lt(angle)
+            for _ in range(3):
+                pet.fd(30)
+                pet.lt(120)
+            return pet.steps
+
+        self.threads.clear()
+        futures = [
+            self.loop.run_in_executor(self.executor, draw, pet, 90 * idx)
+            for idx, pet in enumerate(pets)
+        ]
+        steps = self.loop.run_until_complete(
+            asyncio.gather(*futures, loop=self.loop)
+        )
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+        self.assertEqual(self.threads, {threading.get_ident()})
+        self.assertEqual(flushed, {threading.get_ident()})
+        self.assertGreater(batcher.frames, 0)
+        self.assertFalse(batcher._dirty)
+        self.assertFalse(batcher._marked)
+        self.assertGreaterEqual(stats.count - before, sum(steps))
+        self.assertEqual(sum(stats.counts), stats.count)
+        batcher.close()
+
+    def test_result_and_errors(self):
+        """
+        Test that calls returning a value wait for the main thread
+        and that errors are raised in the calling thread.
+        """
+        canvas = self.screen.cv
+
+        def worker():
+            item = canvas.create_line(0, 0, 1, 1)
+            canvas.coords(item, 2, 2, 3, 3)
+            coords = canvas.coords(item)
+            with self.assertRaises(KeyError):
+                canvas.coords(item + 100)
+            return coords
+
+        future = self.loop.run_in_executor(self.executor, worker)
+        result = self.loop.run_until_complete(future)
+        self.assertEqual(result, [2, 2, 3, 3])
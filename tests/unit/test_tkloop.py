@@ -0,0 +1,58 @@
+"""
+_test_tkloop_
+
+Unit tests for servicing Tk events from the event loop.
+"""
+import asyncio
+
+from aioturtle.tkloop import pump_tk_events
+
+from .support import VirtualClockTestCase
+
+
+class FakeTk:
+    """
+    Stand-in for a Tcl interpreter with a queue of pending events,
+    recording the loop time at which each event is handled.
+    """
+    def __init__(self, loop):
+        self.loop = loop
+        self.pending = []
+        self.handled = []
+        self.calls = 0
+
+    def dooneevent(self, flags):
+        self.calls += 1
+        if not self.pending:
+            return 0
+        self.handled.append((self.pending.pop(0), self.loop.time()))
+        return 1
+
+
+class PumpTests(VirtualClockTestCase):
+    """
+    Tests for the pump_tk_events coroutine
+    """
+    def setUp(self):
+        super().setUp()
+        self.app = self.screen.cv.tk = FakeTk(self.loop)
+
+    def test_idle_backoff_and_latency(self):
+        """
+        Test that an idle pump wakes at most every 20 ms, and that
+        events arriving while idle are all handled within that.
+        """
+        pump = asyncio.ensure_future(
+            pump_tk_events(self.screen, loop=self.loop), loop=self.loop
+        )
+        self.loop.run_until_complete(asyncio.sleep(1.0, loop=self.loop))
+        idle_calls = self.app.calls
+        self.assertLess(idle_calls, 60)
+
+        self.loop.call_later(0.0123, self.app.pending.extend, 'abc')
+        self.loop.run_until_complete(asyncio.sleep(0.1, loop=self.loop))
+        pump.cancel()
+        self.loop.run_until_complete(pump)
+        self.assertEqual([event for event, _ in self.app.handled], list('abc'))
+        for _, when in self.app.handled:
+            self.assertLess(when - 1.0123, 0.0201)
@@ -0,0 +1,98 @@
+"""
+_test_tracing_
+
+Unit tests for the trace log and its Chrome trace export.
+"""
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+
+from aioturtle import AsyncTurtle, trace_log
+from aioturtle.aioturtle import TurtleCommands
+
+from .support import HeadlessTestCase
+
+
+class TraceLogTests(HeadlessTestCase):
+    """
+    Tests for tracing AsyncTurtle commands
+    """
+    def setUp(self):
+        """
+        Fresh event loop, headless screen and temporary directory
+        """
+        super().setUp()
+        self.commands = TurtleCommands(self.screen, loop=self.loop)
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        trace_log.stop()
+        shutil.rmtree(self.tmpdir)
+        super().tearDown()
+
+    def test_prompt_trace(self):
+        """
+        Test that trace start and stop record commands, lock waits
+        and updates of contending turtles on a track per turtle.
+        """
+        path = os.path.join(self.tmpdir, 'trace.json')
+        self.assertEqual(self.commands.execute('trace start'),
+                         'Tracing started.')
+        self.commands.execute('new pet')
+        pet = self.commands.get_turtle('pet')
+        pet.speed(3)
+        self.loop.run_until_complete(asyncio.gather(
+            pet.fd(30), pet.lt(30), loop=self.loop
+        ))
+        output = self.commands.execute('trace stop {0}'.format(path))
+        self.assertTrue(output.startswith('Wrote '))
+        self.assertFalse(trace_log.enabled)
+
+        with open(path) as fh:
+            events = json.load(fh)['traceEvents']
+        tracks = {
+            event['tid']: event['args']['name']
+            for event in events if event['ph'] == 'M'
+        }
+        self.assertEqual(list(tracks.values()), ['pet'])
+        spans = [event for event in events if event['ph'] == 'X']
+        names = [event['name'] for event in spans]
+        self.assertEqual(names.count('forward'), 1)
+        self.assertEqual(names.count('left'), 1)
+        self.assertEqual(names.count('lock wait'), 2)
+        # 9 steps and the finalized move, 4 steps and the final turn
+        self.assertEqual(names.count('update'), 15)
+        forward = spans[names.index('forward')]
+        left = spans[names.index('left')]
+        self.assertGreaterEqual(left['ts'], forward['ts'] + forward['dur'])
+
+    def test_ring_buffer_and_profile(self):
+        """
+        Test that only the last capacity spans are kept, and that
+        a profile is written alongside the trace.
+        """
+        path = os.path.join(self.tmpdir, 'trace.json')
+        self.commands.execute('trace start 5 profile')
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        self.loop.run_until_complete(pet.fd(100))
+        self.commands.execute('trace stop {0}'.format(path))
+        self.assertEqual(len(trace_log), 5)
+        self.assertGreater(trace_log.dropped, 0)
+        with open(path) as fh:
+            trace = json.load(fh)
+        self.assertEqual(trace['otherData']['dropped'], trace_log.dropped)
+        self.assertTrue(os.path.exists(path + '.prof'))
+
+    def test_disabled(self):
+        """
+        Test that nothing is recorded unless tracing.
+        """
+        trace_log.start()
+        trace_log.stop()
+        pet = AsyncTurtle(loop=self.loop, screen=self.screen)
+        self.loop.run_until_complete(pet.fd(30))
+        self.assertEqual(len(trace_log), 0)
+        with self.assertRaises(Exception):
+            self.commands.execute('trace stop')
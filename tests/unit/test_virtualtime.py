@@ -0,0 +1,118 @@
+"""
+_test_virtualtime_
+
+Unit tests for the simulated clock event loop.
+"""
+import asyncio
+import time
+import unittest
+
+from aioturtle import (
+    AsyncTurtle, FrameClock, HeadlessScreen, TurtleObserver,
+    VirtualClockEventLoop
+)
+
+
+class StepLog(TurtleObserver):
+    """
+    Records the loop time and turtle of every animation step.
+    """
+    def __init__(self, loop):
+        self.loop = loop
+        self.steps = []
+
+    def on_step(self, turt):
+        self.steps.append((self.loop.time(), turt.name))
+
+
+class VirtualClockTests(unittest.TestCase):
+    """
+    Tests for the VirtualClockEventLoop class
+    """
+    def run_scenario(self, clock=False):
+        """
+        Run three turtles of different speeds concurrently with a
+        50 ms step time, returning the step log, the loop time
+        taken and the wall time taken.
+        """
+        loop = VirtualClockEventLoop()
+        screen = HeadlessScreen()
+        screen.delay(delay=50)
+        if clock:
+            FrameClock(screen, loop=loop)
+        log = StepLog(loop)
+        pets = []
+        for speed in (1, 2, 3):
+            pet = AsyncTurtle(
+                name='pet{0}'.format(speed), screen=screen, loop=loop
+            )
+            pet.speed(speed)
+            pet.add_observer(log)
+            pets.append(pet)
+        tasks = [pet.fd(60) for pet in pets]
+        tasks += [pet.circle(30) for pet in pets]
+        begin = time.perf_counter()
+        loop.run_until_complete(asyncio.gather(*tasks, loop=loop))
+        elapsed = time.perf_counter() - begin
+        if clock:
+            screen.frame_clock.close()
+        loop_time = loop.time()
+        loop.close()
+        return log.steps, loop_time, elapsed
+
+    def test_fast_forward(self):
+        """
+        Test that the loop time passes as with real sleeps, but the
+        wall time does not.
+        """
+        steps, loop_time, elapsed = self.run_scenario()
+        # the slowest turtle takes 59 steps forward plus its circle
+        self.assertGreater(loop_time, 59 * 0.05)
+        self.assertLess(elapsed, loop_time / 10)
+
+    def test_deterministic(self):
+        """
+        Test that concurrent turtles interleave identically on every
+        run, with or without a FrameClock.
+        """
+        for clock in (False, True):
+            first = self.run_scenario(clock)[0]
+            second = self.run_scenario(clock)[0]
+            self.assertEqual(first, second)
+            names = [name for _, name in first]
+            self.assertEqual(names[:3], ['pet1', 'pet2', 'pet3'])
+
+    def test_sleep(self):
+        loop = VirtualClockEventLoop(start=100.0)
+        loop.run_until_complete(asyncio.sleep(3600, loop=loop))
+        self.assertGreaterEqual(loop.time(), 3700.0)
+        loop.close()
+
+    def test_executor_real_time(self):
+        """
+        Test that the clock follows real time while a function runs
+        in an executor, rather than racing ahead of it.
+        """
+        loop = VirtualClockEventLoop()
+        ticks = []
+
+        async def ticker():
+            while True:
+                await asyncio.sleep(0.5, loop=loop)
+                ticks.append(loop.time())
+
+        task = asyncio.ensure_future(ticker(), loop=loop)
+        begin = time.process_time()
+        loop.run_until_complete(
+            loop.run_in_executor(None, time.sleep, 0.2)
+        )
+        self.assertLess(time.process_time() - begin, 0.1)
+        self.assertGreaterEqual(loop.time(), 0.2)
+        self.assertLess(loop.time(), 0.5)
+        self.assertEqual(ticks, [])
+        self.assertEqual(loop.outside_work, 0)
+        loop.run_until_complete(asyncio.sleep(1.0, loop=loop))
+        self.assertEqual(len(ticks), 2)
+        task.cancel()
+        loop.run_until_complete(asyncio.sleep(0, loop=loop))
+        loop.close()